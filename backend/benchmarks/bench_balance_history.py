@@ -0,0 +1,116 @@
+"""
+Balance computation for one group holding --splits expense splits.
+
+Times the SQL GROUP BY replay in backend.crud.balances (what rebuild_balances runs per group)
+against reading the materialized ledger (what the settlement endpoints run), on a throwaway
+SQLite database. Both are checked against the totals accumulated while seeding.
+
+    python -m backend.benchmarks.bench_balance_history [--splits 1000000] [--members 50]
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from collections import defaultdict
+from sqlalchemy import create_engine, insert, text
+from sqlalchemy.orm import Session
+from backend.db import Base
+from backend.models.user import User
+from backend.models.group import Group, GroupMember, Expense, ExpenseSplit, Settlement
+from backend.crud.balances import (
+    SETTLEMENT_APPLIED_STATUSES,
+    compute_balances_from_history,
+    get_group_balances,
+    rebuild_group_balances,
+)
+
+SPLITS_PER_EXPENSE = 4
+GROUP_ID = 1
+
+
+def seed(engine, split_count: int, member_count: int) -> dict[int, int]:
+    """Writes the group's history and returns the balances it should replay to."""
+    rng = random.Random(13)
+    user_ids = list(range(1, member_count + 1))
+    expected: dict[int, int] = defaultdict(int)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [
+            {"id": i, "username": f"user{i}", "password_hash": "x", "email": f"user{i}@example.com"}
+            for i in user_ids
+        ])
+        conn.execute(insert(Group), [{"id": GROUP_ID, "name": "Big", "owner_id": 1, "currency": "GBP"}])
+        conn.execute(insert(GroupMember), [{"group_id": GROUP_ID, "user_id": u} for u in user_ids])
+
+        expense_count = split_count // SPLITS_PER_EXPENSE
+        for start in range(0, expense_count, 50_000):
+            expenses, splits = [], []
+            for expense_id in range(start + 1, min(start + 50_000, expense_count) + 1):
+                share = rng.randint(25, 5000)
+                payer = rng.choice(user_ids)
+                expenses.append({"id": expense_id, "group_id": GROUP_ID, "description": "e",
+                                 "amount": share * SPLITS_PER_EXPENSE, "paid_by_id": payer, "split_mode": "equal"})
+                expected[payer] += share * SPLITS_PER_EXPENSE
+                for u in rng.sample(user_ids, SPLITS_PER_EXPENSE):
+                    splits.append({"expense_id": expense_id, "user_id": u, "amount": share})
+                    expected[u] -= share
+            conn.execute(insert(Expense), expenses)
+            conn.execute(insert(ExpenseSplit), splits)
+
+        settlements = [
+            {"group_id": GROUP_ID, "payer_id": rng.choice(user_ids), "receiver_id": rng.choice(user_ids),
+             "amount": rng.randint(100, 10000), "status": rng.choice(["pending", "payer_confirmed", "complete"])}
+            for _ in range(200)
+        ]
+        conn.execute(insert(Settlement), settlements)
+        for record in settlements:
+            if record["status"] in SETTLEMENT_APPLIED_STATUSES:
+                expected[record["payer_id"]] += record["amount"]
+                expected[record["receiver_id"]] -= record["amount"]
+        conn.execute(text("ANALYZE"))
+    return {user_id: expected[user_id] for user_id in user_ids}
+
+
+def time_it(fn, engine, repeat: int) -> list[float]:
+    samples = []
+    for _ in range(repeat):
+        with Session(engine) as db:
+            started = time.perf_counter()
+            fn(db)
+            samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--splits", type=int, default=1_000_000)
+    parser.add_argument("--members", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(engine)
+        started = time.perf_counter()
+        expected = seed(engine, args.splits, args.members)
+        print(f"seeded {args.splits} splits / {args.members} members in {time.perf_counter() - started:.1f}s")
+
+        with Session(engine) as db:
+            replayed = compute_balances_from_history(db, GROUP_ID)
+            assert {user_id: replayed.get(user_id, 0) for user_id in expected} == expected
+            rebuild_group_balances(db, GROUP_ID)
+            ledger = get_group_balances(db, GROUP_ID)
+            assert {user_id: ledger.get(user_id, 0) for user_id in expected} == expected
+
+        for label, fn in (
+            ("sql group by", lambda db: compute_balances_from_history(db, GROUP_ID)),
+            ("ledger read", lambda db: get_group_balances(db, GROUP_ID)),
+        ):
+            samples = time_it(fn, engine, args.repeat)
+            print(f"  {label:<13} median {statistics.median(samples):8.1f} ms   min {min(samples):8.1f} ms")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Requests/sec for unchanged group reads, with and without If-None-Match.
+
+Starts uvicorn on a seeded SQLite database and drives GET /api/groups/{id}/expenses?all=true,
+/settlements and /subscriptions from --clients threads: first as plain GETs that re-run the
+queries and serialization, then revalidating with the ETag each endpoint returned (304s).
+
+    python -m backend.benchmarks.bench_conditional_get [--clients 16] [--duration 10] [--expenses 200]
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import threading
+import time
+import httpx
+from backend.benchmarks.bench_login_storm import free_port, percentile, start_server
+from backend.benchmarks.bench_read_throughput import APP_DIR, seed
+
+
+def drive(base_url: str, cookies: dict, paths: list[str], etags: dict | None, clients: int, duration: float) -> dict:
+    latencies: list[float] = []
+    unexpected = 0
+    expected_status = 304 if etags else 200
+    lock = threading.Lock()
+    stop_at = time.time() + duration
+
+    def worker(offset: int):
+        nonlocal unexpected
+        with httpx.Client(base_url=base_url, cookies=cookies, timeout=60) as client:
+            i = offset
+            while time.time() < stop_at:
+                path = paths[i % len(paths)]
+                headers = {"If-None-Match": etags[path]} if etags else {}
+                started = time.perf_counter()
+                ok = client.get(path, headers=headers).status_code == expected_status
+                elapsed = (time.perf_counter() - started) * 1000
+                with lock:
+                    latencies.append(elapsed)
+                    unexpected += not ok
+                i += 1
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return {
+        "rps": len(latencies) / duration,
+        "p50_ms": statistics.median(latencies),
+        "p99_ms": percentile(latencies, 99),
+        "unexpected": unexpected,
+    }
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--expenses", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        port = free_port()
+        proc = start_server(APP_DIR, port, os.path.join(tmp, "bench.db"))
+        try:
+            base_url = f"http://127.0.0.1:{port}"
+            seeded = seed(base_url, args.expenses)
+            group_id = seeded["group_id"]
+            paths = [
+                f"/api/groups/{group_id}/expenses?all=true",
+                f"/api/groups/{group_id}/settlements",
+                f"/api/groups/{group_id}/subscriptions",
+            ]
+            with httpx.Client(base_url=base_url, cookies=seeded["cookies"], timeout=60) as client:
+                etags = {path: client.get(path).headers["etag"] for path in paths}
+            for label, tags in (("full GET", None), ("If-None-Match", etags)):
+                result = drive(base_url, seeded["cookies"], paths, tags, args.clients, args.duration)
+                print(f"{label:<14} {result['rps']:7.1f} req/s  p50 {result['p50_ms']:6.1f} ms  "
+                      f"p99 {result['p99_ms']:7.1f} ms  unexpected {result['unexpected']}")
+        finally:
+            proc.terminate()
+            proc.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Page-load latency for a group: the per-tab request waterfall against GET /dashboard.
+
+Starts uvicorn on a seeded SQLite database with the read-model cache off, then loads the group
+page --loads times the way the frontend used to (group, expenses?all=true, categories,
+settlements and subscriptions fired together; the page is ready when the last one lands) and
+the way it does now (one /dashboard?all=true). Run once per DB_ASYNC setting.
+
+    python -m backend.benchmarks.bench_dashboard [--loads 200] [--expenses 200]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+import httpx
+from backend.benchmarks.bench_login_storm import free_port, percentile, start_server
+from backend.benchmarks.bench_read_throughput import APP_DIR, seed
+
+
+async def page_loads(base_url: str, cookies: dict, paths: list[str], loads: int) -> list[float]:
+    samples = []
+    async with httpx.AsyncClient(base_url=base_url, cookies=cookies, timeout=60) as client:
+        for _ in range(loads):
+            started = time.perf_counter()
+            responses = await asyncio.gather(*(client.get(path) for path in paths))
+            samples.append((time.perf_counter() - started) * 1000)
+            for res in responses:
+                res.raise_for_status()
+    return samples
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--loads", type=int, default=200)
+    parser.add_argument("--expenses", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    for db_async in ("off", "on"):
+        with tempfile.TemporaryDirectory() as tmp:
+            port = free_port()
+            proc = start_server(
+                APP_DIR, port, os.path.join(tmp, "bench.db"),
+                extra_env={"DB_ASYNC": db_async, "READ_MODEL_CACHE_MAX_BYTES": "0"},
+            )
+            try:
+                base_url = f"http://127.0.0.1:{port}"
+                seeded = seed(base_url, args.expenses)
+                group = f"/api/groups/{seeded['group_id']}"
+                modes = [
+                    ("waterfall", [group, f"{group}/expenses?all=true", f"{group}/categories",
+                                   f"{group}/settlements", f"{group}/subscriptions"]),
+                    ("dashboard", [f"{group}/dashboard?all=true"]),
+                ]
+                for label, paths in modes:
+                    asyncio.run(page_loads(base_url, seeded["cookies"], paths, 5))  # warm up
+                    samples = asyncio.run(page_loads(base_url, seeded["cookies"], paths, args.loads))
+                    print(f"DB_ASYNC={db_async:<3} {label:<10} {len(paths)} req/page  "
+                          f"p50 {statistics.median(samples):6.1f} ms  p99 {percentile(samples, 99):6.1f} ms")
+            finally:
+                proc.terminate()
+                proc.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Wall time of POST /api/groups/{id}/expenses/import for --rows generated CSV rows.
+
+Starts uvicorn on a throwaway SQLite database and streams the CSV body from a generator,
+so neither side holds the whole file in memory.
+
+    python -m backend.benchmarks.bench_expense_import [--rows 100000]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+import httpx
+from backend.benchmarks.bench_login_storm import free_port, register, start_server
+
+APP_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+MEMBERS = ["bench_owner", "bench_a", "bench_b", "bench_c"]
+
+
+def csv_rows(count: int, chunk_rows: int = 1000):
+    rng = random.Random(7)
+    yield b"description,amount,paid_by,split_mode,splits\n"
+    lines = []
+    for i in range(count):
+        cents = rng.randint(4, 50000) // 4 * 4
+        share = cents // 4 / 100
+        splits = ";".join(f"{name}:{share:.2f}" for name in MEMBERS)
+        lines.append(f"Row {i},{cents / 100:.2f},{rng.choice(MEMBERS)},equal,{splits}\n")
+        if len(lines) == chunk_rows:
+            yield "".join(lines).encode("utf-8")
+            lines = []
+    if lines:
+        yield "".join(lines).encode("utf-8")
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args(argv)
+
+    port = free_port()
+    with tempfile.TemporaryDirectory() as tmp:
+        proc = start_server(APP_DIR, port, os.path.join(tmp, "bench.db"))
+        try:
+            base_url = f"http://127.0.0.1:{port}"
+            for name in MEMBERS[1:]:
+                with httpx.Client(base_url=base_url, timeout=60) as member:
+                    register(member, name)
+            with httpx.Client(base_url=base_url, timeout=600) as client:
+                register(client, MEMBERS[0])
+                group_id = client.post("/api/groups", json={"name": "Bench", "members": MEMBERS[1:]}).json()["id"]
+                started = time.perf_counter()
+                resp = client.post(
+                    f"/api/groups/{group_id}/expenses/import",
+                    content=csv_rows(args.rows),
+                    headers={"content-type": "text/csv"},
+                )
+                elapsed = time.perf_counter() - started
+                resp.raise_for_status()
+                report = resp.json()
+        finally:
+            proc.terminate()
+            proc.wait()
+
+    print(f"imported {report['imported']} rows ({report['failed']} failed) in {elapsed:.1f}s "
+          f"= {report['imported'] / elapsed:,.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main()
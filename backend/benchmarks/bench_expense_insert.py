@@ -0,0 +1,72 @@
+"""
+Regression check: POST /api/groups/{id}/expenses latency must not grow with group history.
+
+Grows one group through --sizes expenses on a throwaway SQLite database (bulk-inserted between
+steps), times --samples creates at each size and exits 1 if the median at the largest size is
+more than --max-ratio times the median at the smallest.
+
+    python -m backend.benchmarks.bench_expense_insert [--sizes 10,1000,10000,100000]
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+PASSWORD = "benchmark-password"
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="10,1000,10000,100000")
+    parser.add_argument("--samples", type=int, default=30)
+    parser.add_argument("--max-ratio", type=float, default=3.0)
+    args = parser.parse_args(argv)
+    sizes = [int(size) for size in args.sizes.split(",")]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # backend.db reads DATABASE_URL at import time
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        from fastapi.testclient import TestClient
+        from backend.main import app
+        from backend.db import SessionLocal, engine
+        from backend.crud.expenses import bulk_create_expenses
+
+        medians = {}
+        with TestClient(app) as client:
+            for name in ("bench_member", "bench_owner"):  # the client stays signed in as the last one
+                client.post("/api/auth/register", json={"username": name, "email": f"{name}@example.com",
+                                                        "password": PASSWORD, "confirm_password": PASSWORD})
+            group = client.post("/api/groups", json={"name": "Bench", "members": ["bench_member"]}).json()
+            ids = {member["username"]: member["id"] for member in group["members"]}
+            payload = {"description": "Coffee", "amount": 4, "paid_by": "bench_owner", "split_mode": "custom",
+                       "splits": [{"username": "bench_owner", "amount": 2}, {"username": "bench_member", "amount": 2}]}
+            row = {"description": "Seed", "amount_cents": 400, "paid_by_id": ids["bench_owner"], "category_id": None,
+                   "splits": [{"user_id": ids["bench_owner"], "amount_cents": 200},
+                              {"user_id": ids["bench_member"], "amount_cents": 200}]}
+
+            existing = 0
+            for size in sizes:
+                with SessionLocal() as db:
+                    while existing < size:
+                        batch = min(5000, size - existing)
+                        existing += bulk_create_expenses(db, group_id=group["id"], items=[row] * batch)
+                samples = []
+                for _ in range(args.samples):
+                    started = time.perf_counter()
+                    client.post(f"/api/groups/{group['id']}/expenses", json=payload).raise_for_status()
+                    samples.append((time.perf_counter() - started) * 1000)
+                existing += args.samples
+                medians[size] = statistics.median(samples)
+                print(f"  {size:>7} expenses  create median {medians[size]:6.2f} ms  max {max(samples):6.2f} ms")
+        engine.dispose()
+
+    ratio = medians[sizes[-1]] / medians[sizes[0]]
+    print(f"latency ratio {sizes[-1]} vs {sizes[0]}: {ratio:.2f} (limit {args.max_ratio})")
+    if ratio > args.max_ratio:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Latency of GET /api/groups while a storm of concurrent logins is running.
+
+Starts uvicorn on a throwaway SQLite database, registers a reader and a storm user, then
+hammers /api/auth/login from --storm threads while a single reader measures /api/groups.
+
+    python -m backend.benchmarks.bench_login_storm
+    python -m backend.benchmarks.bench_login_storm --app-dir /path/to/older/checkout
+
+Run it against two checkouts (e.g. a `git worktree` of the previous revision) to compare.
+"""
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+import httpx
+
+PASSWORD = "benchmark-password"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(app_dir: str, port: int, db_path: str, extra_env: dict | None = None) -> subprocess.Popen:
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{db_path}", **(extra_env or {}))
+    subprocess.run([sys.executable, "-m", "backend.migrate"], cwd=app_dir, env=env, check=True, capture_output=True)
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.main:app", "--app-dir", app_dir,
+         "--port", str(port), "--log-level", "warning"],
+        cwd=app_dir,
+        env=env,
+    )
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/api/health", timeout=1)
+            return proc
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    proc.kill()
+    raise RuntimeError("server did not start")
+
+
+def register(client: httpx.Client, username: str):
+    client.post(
+        "/api/auth/register",
+        json={"username": username, "email": f"{username}@example.com",
+              "password": PASSWORD, "confirm_password": PASSWORD},
+    ).raise_for_status()
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def run(base_url: str, storm: int, duration: float) -> dict:
+    reader = httpx.Client(base_url=base_url, timeout=60)
+    register(reader, "bench_reader")
+    with httpx.Client(base_url=base_url, timeout=60) as setup:
+        register(setup, "bench_storm")
+    reader.post("/api/groups", json={"name": "Bench"}).raise_for_status()
+
+    stop = threading.Event()
+    outcomes: Counter = Counter()
+    outcomes_lock = threading.Lock()
+
+    def storm_worker():
+        with httpx.Client(base_url=base_url, timeout=60) as client:
+            while not stop.is_set():
+                try:
+                    code = client.post("/api/auth/login", json={"username": "bench_storm", "password": PASSWORD}).status_code
+                except httpx.HTTPError:
+                    code = "error"
+                with outcomes_lock:
+                    outcomes[code] += 1
+
+    threads = [threading.Thread(target=storm_worker, daemon=True) for _ in range(storm)]
+    for thread in threads:
+        thread.start()
+    time.sleep(1.0)  # let the storm saturate the server
+
+    latencies = []
+    end = time.time() + duration
+    while time.time() < end:
+        started = time.perf_counter()
+        reader.get("/api/groups").raise_for_status()
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    stop.set()
+    for thread in threads:
+        thread.join()
+    reader.close()
+
+    return {
+        "requests": len(latencies),
+        "p50_ms": statistics.median(latencies),
+        "p99_ms": percentile(latencies, 99),
+        "max_ms": max(latencies),
+        "logins": dict(outcomes),
+    }
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--app-dir", default=os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+    parser.add_argument("--storm", type=int, default=64, help="concurrent login clients")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds of /api/groups sampling")
+    args = parser.parse_args(argv)
+
+    port = free_port()
+    with tempfile.TemporaryDirectory() as tmp:
+        proc = start_server(args.app_dir, port, os.path.join(tmp, "bench.db"))
+        try:
+            result = run(f"http://127.0.0.1:{port}", args.storm, args.duration)
+        finally:
+            proc.terminate()
+            proc.wait()
+
+    print(f"/api/groups during {args.storm}-client login storm ({args.app_dir})")
+    print(f"  requests {result['requests']}  p50 {result['p50_ms']:.1f} ms  "
+          f"p99 {result['p99_ms']:.1f} ms  max {result['max_ms']:.1f} ms")
+    print(f"  login responses: {result['logins']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Throughput of the hot read endpoints with the sync (threadpool) and async DB session paths.
+
+Starts uvicorn twice on the same seeded SQLite database, once with DB_ASYNC=off and once with
+DB_ASYNC=on, and drives GET /api/groups/{id}/expenses and /settlements from --clients threads.
+
+    python -m backend.benchmarks.bench_read_throughput [--clients 64] [--duration 10]
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import threading
+import time
+import httpx
+from backend.benchmarks.bench_login_storm import free_port, percentile, register, start_server
+
+APP_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+
+def seed(base_url: str, expenses: int) -> dict:
+    client = httpx.Client(base_url=base_url, timeout=60)
+    register(client, "bench_reader")
+    group_id = client.post("/api/groups", json={"name": "Bench"}).json()["id"]
+    for i in range(expenses):
+        client.post(
+            f"/api/groups/{group_id}/expenses",
+            json={"description": f"e{i}", "amount": 10, "paid_by": "bench_reader",
+                  "splits": [{"username": "bench_reader", "amount": 10}], "split_mode": "equal"},
+        ).raise_for_status()
+    cookies = dict(client.cookies)
+    client.close()
+    return {"group_id": group_id, "cookies": cookies}
+
+
+def drive(base_url: str, seeded: dict, clients: int, duration: float) -> dict:
+    paths = [f"/api/groups/{seeded['group_id']}/expenses", f"/api/groups/{seeded['group_id']}/settlements"]
+    latencies: list[float] = []
+    errors = 0
+    lock = threading.Lock()
+    stop_at = time.time() + duration
+
+    def worker(offset: int):
+        nonlocal errors
+        with httpx.Client(base_url=base_url, cookies=seeded["cookies"], timeout=60) as client:
+            i = offset
+            while time.time() < stop_at:
+                started = time.perf_counter()
+                ok = client.get(paths[i % len(paths)]).status_code == 200
+                elapsed = (time.perf_counter() - started) * 1000
+                with lock:
+                    latencies.append(elapsed)
+                    errors += not ok
+                i += 1
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return {
+        "rps": len(latencies) / duration,
+        "p50_ms": statistics.median(latencies),
+        "p99_ms": percentile(latencies, 99),
+        "errors": errors,
+    }
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--expenses", type=int, default=50)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        seeded = None
+        for mode in ("off", "on"):
+            port = free_port()
+            proc = start_server(APP_DIR, port, db_path, {"DB_ASYNC": mode})
+            try:
+                base_url = f"http://127.0.0.1:{port}"
+                seeded = seeded or seed(base_url, args.expenses)
+                result = drive(base_url, seeded, args.clients, args.duration)
+            finally:
+                proc.terminate()
+                proc.wait()
+            print(f"DB_ASYNC={mode:<3}  {result['rps']:7.1f} req/s  p50 {result['p50_ms']:6.1f} ms  "
+                  f"p99 {result['p99_ms']:7.1f} ms  errors {result['errors']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Serializing the full expense list of one group holding --expenses expenses.
+
+Compares the old response_model path (ORM objects -> ExpenseResponse models -> re-validation ->
+jsonable output -> json.dumps), Pydantic's dump_json over the same models, and the row path the
+list endpoints use now (plain row tuples -> dicts -> orjson), on a throwaway SQLite database.
+
+    python -m backend.benchmarks.bench_serialization [--expenses 10000] [--splits 4]
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+from typing import List
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+from backend.db import Base
+from backend.models.user import User
+from backend.models.group import Group, GroupMember, Expense, ExpenseSplit
+from backend.crud.expenses import list_expense_rows_for_group, list_expenses_for_group
+from backend.fast_json import dumps, orjson
+from backend.main import ExpenseResponse, expense_dicts_from_rows, serialize_expense
+
+GROUP_ID = 1
+EXPENSE_LIST = TypeAdapter(List[ExpenseResponse])
+
+
+def seed(engine, expense_count: int, splits_per_expense: int, member_count: int = 20):
+    rng = random.Random(7)
+    user_ids = list(range(1, member_count + 1))
+    with engine.begin() as conn:
+        conn.execute(insert(User), [
+            {"id": i, "username": f"user{i}", "password_hash": "x", "email": f"user{i}@example.com"}
+            for i in user_ids
+        ])
+        conn.execute(insert(Group), [{"id": GROUP_ID, "name": "Big", "owner_id": 1, "currency": "GBP"}])
+        conn.execute(insert(GroupMember), [{"group_id": GROUP_ID, "user_id": u} for u in user_ids])
+        expenses, splits = [], []
+        for expense_id in range(1, expense_count + 1):
+            share = rng.randint(25, 5000)
+            expenses.append({"id": expense_id, "group_id": GROUP_ID, "description": f"Expense {expense_id}",
+                             "amount": share * splits_per_expense, "paid_by_id": rng.choice(user_ids),
+                             "split_mode": "equal"})
+            splits.extend({"expense_id": expense_id, "user_id": u, "amount": share}
+                          for u in rng.sample(user_ids, splits_per_expense))
+        conn.execute(insert(Expense), expenses)
+        conn.execute(insert(ExpenseSplit), splits)
+
+
+def response_model_path(db: Session) -> bytes:
+    models = [serialize_expense(e) for e in list_expenses_for_group(db, GROUP_ID)]
+    # what FastAPI does with a returned model list: validate against response_model, then encode
+    validated = EXPENSE_LIST.validate_python(models)
+    return json.dumps(EXPENSE_LIST.dump_python(validated, mode="json"), separators=(",", ":")).encode()
+
+
+def dump_json_path(db: Session) -> bytes:
+    return EXPENSE_LIST.dump_json([serialize_expense(e) for e in list_expenses_for_group(db, GROUP_ID)])
+
+
+def row_path(db: Session) -> bytes:
+    return dumps(expense_dicts_from_rows(*list_expense_rows_for_group(db, GROUP_ID)))
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--expenses", type=int, default=10_000)
+    parser.add_argument("--splits", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    paths = [
+        ("response_model", response_model_path),
+        ("pydantic dump_json", dump_json_path),
+        ("rows + " + ("orjson" if orjson is not None else "json"), row_path),
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(engine)
+        seed(engine, args.expenses, args.splits)
+        print(f"{args.expenses} expenses x {args.splits} splits")
+
+        with Session(engine) as db:
+            sizes = {label: len(json.loads(fn(db))) for label, fn in paths}
+            assert set(sizes.values()) == {args.expenses}, sizes
+
+        for label, fn in paths:
+            samples = []
+            for _ in range(args.repeat):
+                with Session(engine) as db:
+                    started = time.perf_counter()
+                    fn(db)
+                    samples.append(time.perf_counter() - started)
+            median = statistics.median(samples)
+            print(f"  {label:<20} median {median * 1000:8.1f} ms   {args.expenses / median:10.0f} items/s")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Transfer count and runtime of each settlement strategy across group sizes.
+
+Balances come from --trials random histories per size: expenses of round amounts paid by one
+member and split equally across a random subset, which leaves the kind of clustered balances
+real groups have.
+
+    python -m backend.benchmarks.bench_settlement_strategies [--sizes 5,10,15,20,30,50,100]
+"""
+import argparse
+import random
+import statistics
+import time
+from backend.settlement_strategies import SETTLEMENT_STRATEGIES
+
+
+def random_balances(rng: random.Random, size: int) -> dict[int, int]:
+    balances = {user_id: 0 for user_id in range(1, size + 1)}
+    for _ in range(size * 2):
+        sharers = rng.sample(sorted(balances), rng.randint(2, min(size, 4)))
+        amount = rng.choice([10, 20, 30, 40, 60]) * 100
+        payer = rng.choice(sharers)
+        balances[payer] += amount
+        for user_id in sharers:
+            balances[user_id] -= amount // len(sharers)
+        balances[payer] -= amount - amount // len(sharers) * len(sharers)
+    return balances
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="5,10,15,20,30,50,100")
+    parser.add_argument("--trials", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(42)
+    print(f"{'members':>7}  " + "  ".join(f"{name:>24}" for name in SETTLEMENT_STRATEGIES))
+    for size in (int(size) for size in args.sizes.split(",")):
+        cases = [random_balances(rng, size) for _ in range(args.trials)]
+        cells = []
+        for solver in SETTLEMENT_STRATEGIES.values():
+            counts, timings = [], []
+            for balances in cases:
+                started = time.perf_counter()
+                counts.append(len(solver(balances)))
+                timings.append((time.perf_counter() - started) * 1000)
+            cells.append(f"{statistics.mean(counts):6.2f} xfers {statistics.median(timings):7.2f} ms")
+        print(f"{size:>7}  " + "  ".join(f"{cell:>24}" for cell in cells))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Spending-summary queries for one user in --groups groups holding --expenses expenses in total.
+
+Compares the previous three-query approach (member groups, paid sums, owed sums) with the
+single aggregated statement in backend.crud.spending, on a throwaway SQLite database.
+
+    python -m backend.benchmarks.bench_spending_summary [--groups 200] [--expenses 100000]
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from sqlalchemy import create_engine, func, insert, text
+from sqlalchemy.orm import Session
+from backend.db import Base
+from backend.models.user import User
+from backend.models.group import Group, GroupMember, Expense, ExpenseSplit
+from backend.crud.spending import spending_summary_rows
+
+MEMBERS_PER_GROUP = 5
+
+
+def seed(engine, group_count: int, expense_count: int) -> int:
+    rng = random.Random(7)
+    other_users = group_count * (MEMBERS_PER_GROUP - 1)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [
+            {"id": i, "username": f"user{i}", "password_hash": "x", "email": f"user{i}@example.com"}
+            for i in range(1, other_users + 2)
+        ])
+        conn.execute(insert(Group), [
+            {"id": g, "name": f"Group {g}", "owner_id": 1, "currency": rng.choice(["GBP", "EUR", "USD"])}
+            for g in range(1, group_count + 1)
+        ])
+        members = {}
+        rows = []
+        for g in range(1, group_count + 1):
+            first = 2 + (g - 1) * (MEMBERS_PER_GROUP - 1)
+            members[g] = [1] + list(range(first, first + MEMBERS_PER_GROUP - 1))
+            rows.extend({"group_id": g, "user_id": u} for u in members[g])
+        conn.execute(insert(GroupMember), rows)
+
+        expenses, splits = [], []
+        for expense_id in range(1, expense_count + 1):
+            g = rng.randint(1, group_count)
+            amount = rng.randint(100, 20000)
+            expenses.append({"id": expense_id, "group_id": g, "description": "e", "amount": amount,
+                             "paid_by_id": rng.choice(members[g]), "split_mode": "equal"})
+            share = amount // MEMBERS_PER_GROUP
+            for u in members[g]:
+                splits.append({"expense_id": expense_id, "user_id": u, "amount": share})
+        conn.execute(insert(Expense), expenses)
+        conn.execute(insert(ExpenseSplit), splits)
+        conn.execute(text("ANALYZE"))
+    return 1
+
+
+def legacy_summary(db: Session, user_id: int):
+    member_groups = (
+        db.query(Group.id, Group.name, Group.currency)
+        .join(GroupMember, GroupMember.group_id == Group.id)
+        .filter(GroupMember.user_id == user_id)
+        .all()
+    )
+    group_ids = [g.id for g in member_groups]
+    paid = (
+        db.query(Expense.group_id, func.coalesce(func.sum(Expense.amount), 0))
+        .filter(Expense.group_id.in_(group_ids), Expense.paid_by_id == user_id)
+        .group_by(Expense.group_id)
+        .all()
+    )
+    owed = (
+        db.query(Expense.group_id, func.coalesce(func.sum(ExpenseSplit.amount), 0))
+        .join(Expense, Expense.id == ExpenseSplit.expense_id)
+        .filter(Expense.group_id.in_(group_ids), ExpenseSplit.user_id == user_id)
+        .group_by(Expense.group_id)
+        .all()
+    )
+    totals: dict[str, list[int]] = {}
+    paid_map, owed_map = dict(paid), dict(owed)
+    for g in member_groups:
+        bucket = totals.setdefault(g.currency, [0, 0])
+        bucket[0] += paid_map.get(g.id, 0)
+        bucket[1] += owed_map.get(g.id, 0)
+    return totals
+
+
+def aggregated_summary(db: Session, user_id: int):
+    _, currency_rows = spending_summary_rows(db, user_id)
+    return {row.currency: [int(row.paid_cents), int(row.owed_cents)] for row in currency_rows}
+
+
+def time_it(fn, engine, user_id: int, repeat: int) -> list[float]:
+    samples = []
+    for _ in range(repeat):
+        with Session(engine) as db:
+            started = time.perf_counter()
+            fn(db, user_id)
+            samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--groups", type=int, default=200)
+    parser.add_argument("--expenses", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(engine)
+        started = time.perf_counter()
+        user_id = seed(engine, args.groups, args.expenses)
+        print(f"seeded {args.groups} groups / {args.expenses} expenses in {time.perf_counter() - started:.1f}s")
+
+        with Session(engine) as db:
+            assert legacy_summary(db, user_id) == aggregated_summary(db, user_id)
+
+        for label, fn in (("three queries", legacy_summary), ("single aggregate", aggregated_summary)):
+            samples = time_it(fn, engine, user_id, args.repeat)
+            print(f"  {label:<17} median {statistics.median(samples):7.1f} ms   min {min(samples):7.1f} ms")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
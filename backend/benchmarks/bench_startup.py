@@ -0,0 +1,98 @@
+"""
+Time-to-first-request of a fresh backend process, with and without migrating on the way up.
+
+--runs times each, timing spawn -> first 200 from /api/health:
+  - uvicorn on a database already migrated at deploy time (what the container boots);
+  - `python -m backend.migrate && uvicorn`, the boot command that migrates first, on a database
+    already at head (every reboot) and on a fresh one (first boot);
+  - uvicorn with DB_MIGRATE_ON_STARTUP=on, which runs Alembic in-process.
+--with-rephraser also starts the rephraser alongside each backend, niced as in supervisord.conf.
+
+    python -m backend.benchmarks.bench_startup [--runs 5] [--with-rephraser]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import httpx
+from backend.benchmarks.bench_login_storm import free_port
+from backend.benchmarks.bench_read_throughput import APP_DIR
+
+
+def migrate(env: dict):
+    subprocess.run([sys.executable, "-m", "backend.migrate"], cwd=APP_DIR, env=env, check=True, capture_output=True)
+
+
+def start_rephraser() -> subprocess.Popen:
+    return subprocess.Popen(
+        ["nice", "-n", "10", sys.executable, "-m", "uvicorn", "rephraser.app:app",
+         "--port", str(free_port()), "--log-level", "warning"],
+        cwd=APP_DIR,
+    )
+
+
+def time_to_first_request(env: dict, with_rephraser: bool = False, migrate_first: bool = False) -> float:
+    port = free_port()
+    # one client, built before the clock starts: a new client per poll loads an SSL context each
+    # time, and on a single CPU that work competes with the server it is waiting for
+    client = httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=1)
+    started = time.perf_counter()
+    rephraser = start_rephraser() if with_rephraser else None
+    if migrate_first:
+        migrate(env)
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.main:app", "--app-dir", APP_DIR,
+         "--port", str(port), "--log-level", "warning"],
+        cwd=APP_DIR,
+        env=env,
+    )
+    try:
+        deadline = time.time() + 30
+        while time.time() < deadline:
+            if proc.poll() is not None:
+                raise RuntimeError(f"server exited with {proc.returncode}")
+            try:
+                if client.get("/api/health").status_code == 200:
+                    return (time.perf_counter() - started) * 1000
+            except httpx.HTTPError:
+                pass
+            time.sleep(0.01)
+        raise RuntimeError("server did not start")
+    finally:
+        client.close()
+        for running in (proc, rephraser):
+            if running is not None:
+                running.terminate()
+                running.wait()
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--with-rephraser", action="store_true", help="start the rephraser alongside, as in the container")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database_env = lambda name: dict(os.environ, DATABASE_URL=f"sqlite:///{os.path.join(tmp, name)}")
+        env = database_env("bench.db")
+        migrate(env)
+        fresh = iter(range(args.runs))
+        cases = (
+            ("revision check (migrated at deploy)", lambda: time_to_first_request(env, args.with_rephraser)),
+            ("migrate && serve, at head", lambda: time_to_first_request(env, args.with_rephraser, migrate_first=True)),
+            ("migrate && serve, fresh database", lambda: time_to_first_request(
+                database_env(f"fresh-{next(fresh)}.db"), args.with_rephraser, migrate_first=True)),
+            ("DB_MIGRATE_ON_STARTUP=on", lambda: time_to_first_request(
+                dict(env, DB_MIGRATE_ON_STARTUP="on"), args.with_rephraser)),
+        )
+        for label, run in cases:
+            samples = [run() for _ in range(args.runs)]
+            print(f"time to first request, {label}: p50 {statistics.median(samples):.0f} ms  "
+                  f"min {min(samples):.0f} ms  max {max(samples):.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
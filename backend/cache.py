@@ -0,0 +1,225 @@
+import json
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+class MemoryCache:
+    """
+    Thread-safe in-process cache with a per-entry TTL and LRU eviction once max_entries is reached.
+    max_entries=0 disables storage (every lookup misses).
+    """
+
+    backend = "memory"
+
+    def __init__(self, *, max_entries: int = 10000, ttl_secs: float = 60.0, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.ttl_secs = ttl_secs
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[float, object]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (self._clock() + self.ttl_secs, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "backend": self.backend,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+class RedisCache:
+    """
+    Cache shared between workers through any Redis-protocol client exposing get/set(ex=)/delete.
+    Values must be JSON-serializable. Eviction is left to the server's maxmemory policy.
+    """
+
+    backend = "redis"
+
+    def __init__(self, client, *, prefix: str, ttl_secs: float = 60.0):
+        self.client = client
+        self.prefix = prefix
+        self.ttl_secs = ttl_secs
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}:{key}"
+
+    def get(self, key: str):
+        raw = self.client.get(self._key(key))
+        if raw is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(raw)
+
+    def set(self, key: str, value):
+        self.client.set(self._key(key), json.dumps(value), ex=max(1, math.ceil(self.ttl_secs)))
+
+    def delete(self, key: str):
+        self.client.delete(self._key(key))
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "backend": self.backend,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+class ReadModelCache:
+    """
+    Serialized JSON response bodies keyed by (group id, resource, group version), LRU-evicted once
+    their total size passes max_bytes (0 disables). The version in the key means an entry never
+    outlives the data it was built from, even when another worker made the change;
+    invalidate_group() frees a changed group's entries early.
+    """
+
+    def __init__(self, *, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[tuple[int, str, int], bytes] = OrderedDict()
+        self._by_group: dict[int, set[tuple[int, str, int]]] = {}
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, group_id: int, resource: str, version: int | None) -> bytes | None:
+        if version is None:
+            return None
+        key = (group_id, resource, version)
+        with self._lock:
+            body = self._entries.get(key)
+            if body is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return body
+
+    def set(self, group_id: int, resource: str, version: int | None, body: bytes):
+        if version is None or len(body) > self.max_bytes:
+            return
+        key = (group_id, resource, version)
+        with self._lock:
+            self._discard(key)
+            self._entries[key] = body
+            self._by_group.setdefault(group_id, set()).add(key)
+            self.bytes += len(body)
+            while self.bytes > self.max_bytes:
+                self._discard(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _discard(self, key: tuple[int, str, int]):
+        body = self._entries.pop(key, None)
+        if body is None:
+            return
+        self.bytes -= len(body)
+        keys = self._by_group.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_group[key[0]]
+
+    def invalidate_group(self, group_id: int):
+        with self._lock:
+            for key in list(self._by_group.get(group_id, ())):
+                self._discard(key)
+            self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._by_group.clear()
+            self.bytes = 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "groups": len(self._by_group),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+def redis_client_from_env():
+    import redis  # optional dependency, only needed for the shared backend
+
+    return redis.Redis.from_url(os.getenv("REDIS_URL", "redis://127.0.0.1:6379/0"))
+
+
+def cache_from_env(name: str, *, default_ttl_secs: float, default_max_entries: int):
+    """
+    Builds a cache configured by {name}_BACKEND (memory|redis|off), {name}_TTL_SECS and
+    {name}_MAX_ENTRIES. The redis backend connects to REDIS_URL.
+    """
+    backend = os.getenv(f"{name}_BACKEND", "memory").lower()
+    ttl_secs = float(os.getenv(f"{name}_TTL_SECS", str(default_ttl_secs)))
+    if backend == "redis":
+        return RedisCache(redis_client_from_env(), prefix=name.lower(), ttl_secs=ttl_secs)
+    max_entries = 0 if backend == "off" else int(os.getenv(f"{name}_MAX_ENTRIES", str(default_max_entries)))
+    return MemoryCache(max_entries=max_entries, ttl_secs=ttl_secs)
+
+
+# username -> {"id", "username", "email"} snapshot used by get_current_user
+user_cache = cache_from_env("USER_CACHE", default_ttl_secs=60.0, default_max_entries=10000)
+# hash of the rephraser request (facts + max_sentences) -> {"summary", "mode"}
+rephrase_cache = cache_from_env("REPHRASE_CACHE", default_ttl_secs=3600.0, default_max_entries=5000)
+# (group id, resource, version) -> JSON body served by the group read endpoints; per worker
+read_model_cache = ReadModelCache(max_bytes=int(os.getenv("READ_MODEL_CACHE_MAX_BYTES", str(64 * 1024 * 1024))))
@@ -0,0 +1,151 @@
+from collections import defaultdict
+from typing import Iterable
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from backend.models.group import Expense, ExpenseSplit, GroupMemberBalance, Settlement
+
+SETTLEMENT_APPLIED_STATUSES = {"payer_confirmed", "complete"}
+
+
+def expense_balance_deltas(paid_by_id: int, amount_cents: int, splits: Iterable[dict]) -> dict[int, int]:
+    deltas: dict[int, int] = defaultdict(int)
+    deltas[paid_by_id] += amount_cents
+    for split in splits:
+        deltas[split["user_id"]] -= split["amount_cents"]
+    return deltas
+
+
+def settlement_balance_deltas(payer_id: int, receiver_id: int, amount_cents: int) -> dict[int, int]:
+    deltas: dict[int, int] = defaultdict(int)
+    deltas[payer_id] += amount_cents
+    deltas[receiver_id] -= amount_cents
+    return deltas
+
+
+def _balance_upsert(dialect_name: str, rows: list[dict]):
+    table = GroupMemberBalance.__table__
+    if dialect_name == "mysql":
+        stmt = mysql.insert(table).values(rows)
+        return stmt.on_duplicate_key_update(balance=table.c.balance + stmt.inserted.balance)
+    if dialect_name == "sqlite":
+        stmt = sqlite.insert(table).values(rows)
+    elif dialect_name == "postgresql":
+        stmt = postgresql.insert(table).values(rows)
+    else:
+        raise NotImplementedError(f"no atomic balance upsert for the {dialect_name} dialect")
+    return stmt.on_conflict_do_update(
+        index_elements=[table.c.group_id, table.c.user_id],
+        set_={"balance": table.c.balance + stmt.excluded.balance},
+    )
+
+
+def apply_balance_deltas(db: Session, group_id: int, deltas: dict[int, int]):
+    """
+    Adds deltas (cents per user) to the group's ledger rows. Does not commit, so the
+    caller's write and the ledger update land in the same transaction.
+
+    One upsert adds each delta in the database (balance = balance + delta), so concurrent
+    writers to the same group neither lose updates nor collide inserting a missing row.
+    """
+    # sorted so concurrent writers lock the rows in the same order
+    rows = [
+        {"group_id": group_id, "user_id": user_id, "balance": delta}
+        for user_id, delta in sorted(deltas.items()) if delta
+    ]
+    if not rows:
+        return
+    db.execute(_balance_upsert(db.get_bind().dialect.name, rows))
+
+
+def get_group_balances(db: Session, group_id: int) -> dict[int, int]:
+    rows = (
+        db.query(GroupMemberBalance.user_id, GroupMemberBalance.balance)
+        .filter(GroupMemberBalance.group_id == group_id)
+        .all()
+    )
+    return {row.user_id: row.balance for row in rows}
+
+
+async def get_group_balances_async(db: AsyncSession, group_id: int) -> dict[int, int]:
+    rows = await db.execute(
+        select(GroupMemberBalance.user_id, GroupMemberBalance.balance)
+        .where(GroupMemberBalance.group_id == group_id)
+    )
+    return {row.user_id: row.balance for row in rows}
+
+
+def compute_balances_from_history(db: Session, group_id: int) -> dict[int, int]:
+    """Recomputes balances from every expense, split and applied settlement of the group."""
+    balances: dict[int, int] = defaultdict(int)
+
+    paid_rows = (
+        db.query(Expense.paid_by_id, func.sum(Expense.amount))
+        .filter(Expense.group_id == group_id)
+        .group_by(Expense.paid_by_id)
+        .all()
+    )
+    for user_id, total in paid_rows:
+        balances[user_id] += int(total or 0)
+
+    owed_rows = (
+        db.query(ExpenseSplit.user_id, func.sum(ExpenseSplit.amount))
+        .join(Expense, Expense.id == ExpenseSplit.expense_id)
+        .filter(Expense.group_id == group_id)
+        .group_by(ExpenseSplit.user_id)
+        .all()
+    )
+    for user_id, total in owed_rows:
+        balances[user_id] -= int(total or 0)
+
+    applied = Settlement.status.in_(SETTLEMENT_APPLIED_STATUSES)
+    payer_rows = (
+        db.query(Settlement.payer_id, func.sum(Settlement.amount))
+        .filter(Settlement.group_id == group_id, applied)
+        .group_by(Settlement.payer_id)
+        .all()
+    )
+    for user_id, total in payer_rows:
+        balances[user_id] += int(total or 0)
+
+    receiver_rows = (
+        db.query(Settlement.receiver_id, func.sum(Settlement.amount))
+        .filter(Settlement.group_id == group_id, applied)
+        .group_by(Settlement.receiver_id)
+        .all()
+    )
+    for user_id, total in receiver_rows:
+        balances[user_id] -= int(total or 0)
+
+    return dict(balances)
+
+
+def find_balance_drift(db: Session, group_id: int) -> dict[int, tuple[int, int]]:
+    """Returns {user_id: (stored, expected)} for every ledger row that disagrees with history."""
+    stored = get_group_balances(db, group_id)
+    expected = compute_balances_from_history(db, group_id)
+    drift = {}
+    for user_id in set(stored) | set(expected):
+        stored_value = stored.get(user_id, 0)
+        expected_value = expected.get(user_id, 0)
+        if stored_value != expected_value:
+            drift[user_id] = (stored_value, expected_value)
+    return drift
+
+
+def rebuild_group_balances(db: Session, group_id: int) -> dict[int, int]:
+    expected = compute_balances_from_history(db, group_id)
+    # Core statements: ORM-loaded ledger rows in the session would clash with freshly added ones
+    db.execute(delete(GroupMemberBalance.__table__).where(GroupMemberBalance.group_id == group_id))
+    if expected:
+        db.execute(
+            insert(GroupMemberBalance.__table__),
+            [{"group_id": group_id, "user_id": user_id, "balance": balance} for user_id, balance in expected.items()],
+        )
+    db.commit()
+    return expected
+
+
+def delete_group_balances(db: Session, group_id: int):
+    db.query(GroupMemberBalance).filter(GroupMemberBalance.group_id == group_id).delete()
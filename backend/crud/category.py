@@ -1,4 +1,6 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
 from backend.models.group import GroupCategory, CategorySplit
 from backend.models.user import User
 
@@ -26,4 +28,17 @@ def create_category(
 def list_categories(db:Session, group_id:int):
     return(db.query(GroupCategory).filter(GroupCategory.group_id==group_id).all())
 
+def _categories_with_splits_stmt(group_id:int):
+    return (
+        select(GroupCategory)
+        .options(selectinload(GroupCategory.splits).selectinload(CategorySplit.user))
+        .where(GroupCategory.group_id==group_id)
+    )
+
+def list_categories_with_splits(db:Session, group_id:int):
+    return list(db.scalars(_categories_with_splits_stmt(group_id)).all())
+
+async def list_categories_with_splits_async(db:AsyncSession, group_id:int):
+    return list((await db.scalars(_categories_with_splits_stmt(group_id))).all())
+
 
@@ -1,6 +1,12 @@
+from collections import defaultdict
+from datetime import datetime, timezone
 from typing import List
+from sqlalchemy import String, and_, insert, literal, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, selectinload
 from backend.models.group import Expense, ExpenseSplit
+from backend.models.user import User
+from backend.crud.balances import apply_balance_deltas, expense_balance_deltas
 
 
 def create_expense(
@@ -26,11 +32,61 @@ def create_expense(
             )
         )
 
+    apply_balance_deltas(db, group_id, expense_balance_deltas(paid_by_id, amount_cents, splits))
     db.commit()
     db.refresh(expense)
     return expense
 
 
+def bulk_create_expenses(db: Session, *, group_id: int, items: List[dict]) -> int:
+    """
+    Inserts already-validated expenses ({description, amount_cents, paid_by_id, category_id, splits})
+    with executemany in a single transaction and applies their combined ledger deltas once.
+    """
+    if not items:
+        return 0
+    rows = [
+        {
+            "group_id": group_id,
+            "description": item["description"],
+            "amount": item["amount_cents"],
+            "paid_by_id": item["paid_by_id"],
+            "category_id": item["category_id"],
+        }
+        for item in items
+    ]
+    if db.get_bind().dialect.insert_executemany_returning_sort_by_parameter_order:
+        expense_ids = db.scalars(insert(Expense).returning(Expense.id, sort_by_parameter_order=True), rows).all()
+    else:
+        # e.g. MySQL: no RETURNING, let the unit of work assign ids row by row
+        expenses = [Expense(**row) for row in rows]
+        db.add_all(expenses)
+        db.flush()
+        expense_ids = [expense.id for expense in expenses]
+
+    split_rows = []
+    deltas: dict[int, int] = defaultdict(int)
+    for expense_id, item in zip(expense_ids, items):
+        for split in item["splits"]:
+            split_rows.append({"expense_id": expense_id, "user_id": split["user_id"], "amount": split["amount_cents"]})
+        for user_id, delta in expense_balance_deltas(item["paid_by_id"], item["amount_cents"], item["splits"]).items():
+            deltas[user_id] += delta
+    if split_rows:
+        db.execute(insert(ExpenseSplit), split_rows)
+    apply_balance_deltas(db, group_id, deltas)
+    db.commit()
+    return len(expense_ids)
+
+
+def _stored_expense_deltas(db: Session, expense: Expense) -> dict[int, int]:
+    rows = db.query(ExpenseSplit.user_id, ExpenseSplit.amount).filter(ExpenseSplit.expense_id == expense.id).all()
+    return expense_balance_deltas(
+        expense.paid_by_id,
+        expense.amount,
+        [{"user_id": row.user_id, "amount_cents": row.amount} for row in rows],
+    )
+
+
 def list_expenses_for_group(db: Session, group_id: int) -> List[Expense]:
     return (
         db.query(Expense)
@@ -44,6 +100,135 @@ def list_expenses_for_group(db: Session, group_id: int) -> List[Expense]:
     )
 
 
+def _expense_rows_stmts(group_id: int):
+    expenses = (
+        select(Expense.id, Expense.description, Expense.amount, User.username, Expense.created_at, Expense.category_id)
+        .outerjoin(User, User.id == Expense.paid_by_id)
+        .where(Expense.group_id == group_id)
+        .order_by(Expense.created_at.desc(), Expense.id.desc())
+    )
+    splits = (
+        select(ExpenseSplit.expense_id, User.username, ExpenseSplit.amount)
+        .join(Expense, Expense.id == ExpenseSplit.expense_id)
+        .outerjoin(User, User.id == ExpenseSplit.user_id)
+        .where(Expense.group_id == group_id)
+        .order_by(ExpenseSplit.expense_id, ExpenseSplit.id)
+    )
+    return expenses, splits
+
+
+def list_expense_rows_for_group(db: Session, group_id: int) -> tuple[list, list]:
+    """
+    Same expenses as list_expenses_for_group as plain rows, without building ORM objects:
+    (id, description, amount, payer username, created_at, category_id), newest first, and
+    (expense_id, username, amount) per split.
+    """
+    expenses, splits = _expense_rows_stmts(group_id)
+    return db.execute(expenses).all(), db.execute(splits).all()
+
+
+async def list_expense_rows_for_group_async(db: AsyncSession, group_id: int) -> tuple[list, list]:
+    expenses, splits = _expense_rows_stmts(group_id)
+    return (await db.execute(expenses)).all(), (await db.execute(splits)).all()
+
+
+def _created_at_param(dialect_name: str, value: datetime):
+    # created_at is stored as naive UTC (CURRENT_TIMESTAMP), so an aware bound is converted to the
+    # same instant in UTC before its offset is dropped
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    if dialect_name != "sqlite":
+        return value
+    # SQLite keeps created_at as the CURRENT_TIMESTAMP text ('YYYY-MM-DD HH:MM:SS'), so compare
+    # against the same text form; the default datetime binding appends '.000000' and breaks equality.
+    return literal(value.isoformat(sep=" "), String)
+
+
+def list_expenses_page(
+    db: Session,
+    group_id: int,
+    *,
+    limit: int,
+    after: tuple[datetime, int] | None = None,
+    category_id: int | None = None,
+    paid_by_id: int | None = None,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+) -> tuple[List[Expense], tuple[datetime, int] | None]:
+    """
+    Returns one page of expenses, newest first, plus the (created_at, id) key to continue after
+    (None on the last page). Walks ix_expenses_group_created_id instead of offsetting.
+    """
+    stmt = _expenses_page_stmt(
+        db.get_bind().dialect.name, group_id, limit=limit, after=after, category_id=category_id,
+        paid_by_id=paid_by_id, created_from=created_from, created_to=created_to,
+    )
+    return _split_page(list(db.scalars(stmt).all()), limit)
+
+
+async def list_expenses_page_async(
+    db: AsyncSession,
+    group_id: int,
+    *,
+    limit: int,
+    after: tuple[datetime, int] | None = None,
+    category_id: int | None = None,
+    paid_by_id: int | None = None,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+) -> tuple[List[Expense], tuple[datetime, int] | None]:
+    stmt = _expenses_page_stmt(
+        db.get_bind().dialect.name, group_id, limit=limit, after=after, category_id=category_id,
+        paid_by_id=paid_by_id, created_from=created_from, created_to=created_to,
+    )
+    return _split_page(list((await db.scalars(stmt)).all()), limit)
+
+
+def _expenses_page_stmt(
+    dialect_name: str,
+    group_id: int,
+    *,
+    limit: int,
+    after: tuple[datetime, int] | None,
+    category_id: int | None,
+    paid_by_id: int | None,
+    created_from: datetime | None,
+    created_to: datetime | None,
+):
+    stmt = (
+        select(Expense)
+        .options(
+            selectinload(Expense.paid_by),
+            selectinload(Expense.splits).selectinload(ExpenseSplit.user),
+        )
+        .where(Expense.group_id == group_id)
+    )
+    if after is not None:
+        after_created_at = _created_at_param(dialect_name, after[0])
+        stmt = stmt.where(
+            or_(
+                Expense.created_at < after_created_at,
+                and_(Expense.created_at == after_created_at, Expense.id < after[1]),
+            )
+        )
+    if category_id is not None:
+        stmt = stmt.where(Expense.category_id == category_id)
+    if paid_by_id is not None:
+        stmt = stmt.where(Expense.paid_by_id == paid_by_id)
+    if created_from is not None:
+        stmt = stmt.where(Expense.created_at >= _created_at_param(dialect_name, created_from))
+    if created_to is not None:
+        stmt = stmt.where(Expense.created_at < _created_at_param(dialect_name, created_to))
+    return stmt.order_by(Expense.created_at.desc(), Expense.id.desc()).limit(limit + 1)
+
+
+def _split_page(rows: List[Expense], limit: int):
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, (rows[-1].created_at, rows[-1].id)
+
+
 def get_expense(db: Session, expense_id: int) -> Expense | None:
     return (
         db.query(Expense)
@@ -66,6 +251,10 @@ def update_expense(
     category_id: int|None,
     splits: List[dict],
 ) -> Expense:
+    deltas = {user_id: -delta for user_id, delta in _stored_expense_deltas(db, expense).items()}
+    for user_id, delta in expense_balance_deltas(paid_by_id, amount_cents, splits).items():
+        deltas[user_id] = deltas.get(user_id, 0) + delta
+
     expense.description = description
     expense.amount = amount_cents
     expense.paid_by_id = paid_by_id
@@ -83,12 +272,15 @@ def update_expense(
             )
         )
 
+    apply_balance_deltas(db, expense.group_id, deltas)
     db.commit()
     db.refresh(expense)
     return expense
 
 
 def delete_expense(db: Session, expense: Expense):
+    reversed_deltas = {user_id: -delta for user_id, delta in _stored_expense_deltas(db, expense).items()}
+    apply_balance_deltas(db, expense.group_id, reversed_deltas)
     db.query(ExpenseSplit).filter(ExpenseSplit.expense_id == expense.id).delete()
     db.delete(expense)
     db.commit()
@@ -1,4 +1,6 @@
 from typing import Iterable, List
+from sqlalchemy import exists, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, selectinload
 from backend.models.group import Group, GroupMember
 
@@ -29,6 +31,42 @@ def get_groups_for_user(db: Session, user_id: int) -> List[Group]:
     )
 
 
+def _user_group_versions_stmt(user_id: int):
+    return (
+        select(Group.id, Group.version)
+        .join(GroupMember, GroupMember.group_id == Group.id)
+        .where(GroupMember.user_id == user_id)
+        .order_by(Group.id)
+    )
+
+
+def get_group_versions_for_user(db: Session, user_id: int) -> list[tuple[int, int]]:
+    """(group id, version) for every group the user belongs to, without loading the groups."""
+    return [tuple(row) for row in db.execute(_user_group_versions_stmt(user_id)).all()]
+
+
+async def get_group_versions_for_user_async(db: AsyncSession, user_id: int) -> list[tuple[int, int]]:
+    return [tuple(row) for row in (await db.execute(_user_group_versions_stmt(user_id))).all()]
+
+
+def get_groups_with_members(db: Session, group_ids: Iterable[int]) -> List[Group]:
+    return (
+        db.query(Group)
+        .options(selectinload(Group.members).selectinload(GroupMember.user))
+        .filter(Group.id.in_(list(group_ids)))
+        .all()
+    )
+
+
+async def get_groups_with_members_async(db: AsyncSession, group_ids: Iterable[int]) -> List[Group]:
+    result = await db.scalars(
+        select(Group)
+        .options(selectinload(Group.members).selectinload(GroupMember.user))
+        .where(Group.id.in_(list(group_ids)))
+    )
+    return list(result.all())
+
+
 def get_group_with_members(db: Session, group_id: int) -> Group | None:
     return (
         db.query(Group)
@@ -38,15 +76,71 @@ def get_group_with_members(db: Session, group_id: int) -> Group | None:
     )
 
 
-def is_user_in_group(db: Session, group_id: int, user_id: int) -> bool:
+async def get_group_with_members_async(db: AsyncSession, group_id: int) -> Group | None:
+    result = await db.scalars(
+        select(Group)
+        .options(selectinload(Group.members).selectinload(GroupMember.user))
+        .where(Group.id == group_id)
+    )
+    return result.first()
+
+
+def bump_group_version(db: Session, group_id: int) -> int:
+    """
+    Atomically increments the group's version and returns the new value. Does not commit: call it
+    before the data write, so the change and its version commit (or roll back) together.
+    """
+    db.execute(update(Group).where(Group.id == group_id).values(version=Group.version + 1))
+    return db.execute(select(Group.version).where(Group.id == group_id)).scalar_one()
+
+
+def bump_group_versions_for_user(db: Session, user_id: int):
+    """
+    Bumps every group the user belongs to, for changes to data shown in them (e.g. their email).
+    Does not commit, like bump_group_version.
+    """
+    member_of = select(GroupMember.group_id).where(GroupMember.user_id == user_id)
+    db.execute(update(Group).where(Group.id.in_(member_of)).values(version=Group.version + 1))
+
+
+def _member_version_stmt(group_id: int, user_id: int):
     return (
-        db.query(GroupMember)
-        .filter(GroupMember.group_id == group_id, GroupMember.user_id == user_id)
-        .first()
-        is not None
+        select(Group.version)
+        .join(GroupMember, GroupMember.group_id == Group.id)
+        .where(Group.id == group_id, GroupMember.user_id == user_id)
     )
 
 
+def get_group_version_for_member(db: Session, group_id: int, user_id: int) -> int | None:
+    """The group's version, or None when the group is missing or user_id is not a member."""
+    return db.execute(_member_version_stmt(group_id, user_id)).scalar_one_or_none()
+
+
+async def get_group_version_for_member_async(db: AsyncSession, group_id: int, user_id: int) -> int | None:
+    return (await db.execute(_member_version_stmt(group_id, user_id))).scalar_one_or_none()
+
+
+def _membership_exists_stmt(group_id: int, user_id: int):
+    # answered from the uq_group_members (group_id, user_id) index alone
+    return select(exists().where(GroupMember.group_id == group_id, GroupMember.user_id == user_id))
+
+
+def is_user_in_group(db: Session, group_id: int, user_id: int) -> bool:
+    return bool(db.scalar(_membership_exists_stmt(group_id, user_id)))
+
+
+async def is_user_in_group_async(db: AsyncSession, group_id: int, user_id: int) -> bool:
+    return bool(await db.scalar(_membership_exists_stmt(group_id, user_id)))
+
+
+def group_exists(db: Session, group_id: int) -> bool:
+    return bool(db.scalar(select(exists().where(Group.id == group_id))))
+
+
+async def group_exists_async(db: AsyncSession, group_id: int) -> bool:
+    return bool(await db.scalar(select(exists().where(Group.id == group_id))))
+
+
 def add_member_to_group(db: Session, group_id: int, user_id: int) -> GroupMember:
     existing = (
         db.query(GroupMember)
@@ -1,7 +1,11 @@
 from datetime import datetime, timezone
 from typing import List
-from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, aliased, selectinload
 from backend.models.group import Settlement
+from backend.models.user import User
+from backend.crud.balances import SETTLEMENT_APPLIED_STATUSES, apply_balance_deltas, settlement_balance_deltas
 
 
 def list_settlements_for_group(db: Session, group_id: int) -> List[Settlement]:
@@ -17,6 +21,39 @@ def list_settlements_for_group(db: Session, group_id: int) -> List[Settlement]:
     )
 
 
+def _settlement_rows_stmt(group_id: int):
+    payer = aliased(User)
+    receiver = aliased(User)
+    return (
+        select(
+            Settlement.id,
+            payer.username,
+            receiver.username,
+            Settlement.amount,
+            Settlement.status,
+            Settlement.payer_confirmed_at.is_not(None),
+            Settlement.receiver_confirmed_at.is_not(None),
+            Settlement.created_at,
+        )
+        .outerjoin(payer, payer.id == Settlement.payer_id)
+        .outerjoin(receiver, receiver.id == Settlement.receiver_id)
+        .where(Settlement.group_id == group_id)
+        .order_by(Settlement.created_at.desc(), Settlement.id.desc())
+    )
+
+
+def list_settlement_rows_for_group(db: Session, group_id: int) -> list:
+    """
+    list_settlements_for_group as plain rows: (id, payer username, receiver username, amount,
+    status, payer_confirmed, receiver_confirmed, created_at).
+    """
+    return db.execute(_settlement_rows_stmt(group_id)).all()
+
+
+async def list_settlement_rows_for_group_async(db: AsyncSession, group_id: int) -> list:
+    return (await db.execute(_settlement_rows_stmt(group_id))).all()
+
+
 def create_settlement_record(
     db: Session,
     *,
@@ -34,6 +71,7 @@ def create_settlement_record(
         payer_confirmed_at=datetime.now(timezone.utc),
     )
     db.add(settlement)
+    apply_balance_deltas(db, group_id, settlement_balance_deltas(payer_id, receiver_id, amount_cents))
     db.commit()
     db.refresh(settlement)
     return settlement
@@ -52,6 +90,12 @@ def get_settlement(db: Session, settlement_id: int) -> Settlement | None:
 
 
 def confirm_settlement(db: Session, settlement: Settlement) -> Settlement:
+    if settlement.status not in SETTLEMENT_APPLIED_STATUSES:
+        apply_balance_deltas(
+            db,
+            settlement.group_id,
+            settlement_balance_deltas(settlement.payer_id, settlement.receiver_id, settlement.amount),
+        )
     settlement.status = "complete"
     settlement.receiver_confirmed_at = datetime.now(timezone.utc)
     db.add(settlement)
@@ -0,0 +1,62 @@
+from sqlalchemy import func, literal, null, select, union_all
+from sqlalchemy.orm import Session
+from backend.models.group import Expense, ExpenseSplit, Group, GroupMember
+
+
+def spending_summary_rows(db: Session, user_id: int):
+    """
+    One statement returning the user's paid/owed cents per member group and per currency.
+
+    Rows are (kind, group_id, group_name, currency, paid_cents, owed_cents) with kind "group"
+    or "currency"; currency rows roll up every member group with that currency.
+    The paid/owed sums are served by ix_expenses_payer_group and ix_expense_splits_user_expense.
+    """
+    paid = (
+        select(Expense.group_id, func.sum(Expense.amount).label("paid_cents"))
+        .where(Expense.paid_by_id == user_id)
+        .group_by(Expense.group_id)
+        .cte("paid")
+    )
+    owed = (
+        select(Expense.group_id, func.sum(ExpenseSplit.amount).label("owed_cents"))
+        .join(Expense, Expense.id == ExpenseSplit.expense_id)
+        .where(ExpenseSplit.user_id == user_id)
+        .group_by(Expense.group_id)
+        .cte("owed")
+    )
+    per_group = (
+        select(
+            Group.id.label("group_id"),
+            Group.name.label("group_name"),
+            Group.currency.label("currency"),
+            func.coalesce(paid.c.paid_cents, 0).label("paid_cents"),
+            func.coalesce(owed.c.owed_cents, 0).label("owed_cents"),
+        )
+        .join(GroupMember, GroupMember.group_id == Group.id)
+        .outerjoin(paid, paid.c.group_id == Group.id)
+        .outerjoin(owed, owed.c.group_id == Group.id)
+        .where(GroupMember.user_id == user_id)
+        .cte("per_group")
+    )
+
+    group_rows = select(
+        literal("group").label("kind"),
+        per_group.c.group_id,
+        per_group.c.group_name,
+        per_group.c.currency,
+        per_group.c.paid_cents,
+        per_group.c.owed_cents,
+    )
+    currency_rows = select(
+        literal("currency").label("kind"),
+        null().label("group_id"),
+        null().label("group_name"),
+        per_group.c.currency,
+        func.sum(per_group.c.paid_cents).label("paid_cents"),
+        func.sum(per_group.c.owed_cents).label("owed_cents"),
+    ).group_by(per_group.c.currency)
+
+    rows = db.execute(union_all(group_rows, currency_rows)).all()
+    groups = [row for row in rows if row.kind == "group"]
+    currencies = [row for row in rows if row.kind == "currency"]
+    return groups, currencies
@@ -1,4 +1,6 @@
 from datetime import date
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, selectinload
 from backend.models.group import Subscription, SubscriptionMember
 
@@ -11,6 +13,18 @@ def list_subscriptions_for_group(db: Session, group_id: int):
         .all()
     )
 
+async def list_subscriptions_for_group_async(db: AsyncSession, group_id: int):
+    result = await db.scalars(
+        select(Subscription)
+        .options(
+            selectinload(Subscription.group),
+            selectinload(Subscription.members).selectinload(SubscriptionMember.user),
+        )
+        .where(Subscription.group_id == group_id)
+        .order_by(Subscription.next_due_date.asc(), Subscription.id.asc())
+    )
+    return list(result.all())
+
 def get_subscription(db: Session, sub_id: int):
     return (
         db.query(Subscription)
@@ -1,11 +1,18 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from backend.models.user import User
+from backend.cache import user_cache
 
 
 def get_user_by_username(db: Session, username: str):
     return db.query(User).filter(User.username == username).first()
 
 
+async def get_user_by_username_async(db: AsyncSession, username: str):
+    return (await db.scalars(select(User).where(User.username == username))).first()
+
+
 def get_user_by_email(db: Session, email: str):
     return db.query(User).filter(User.email == email).first()
 
@@ -33,4 +40,6 @@ def update_user(
     db.add(user)
     db.commit()
     db.refresh(user)
+    if email is not None or password_hash is not None:
+        user_cache.delete(user.username)
     return user
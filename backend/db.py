@@ -1,29 +1,218 @@
 import os
-from sqlalchemy import create_engine
+import threading
+import time
+from collections import deque
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.exc import DBAPIError, TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./dev.db")
+# Serve the hot read endpoints from an AsyncEngine (aiosqlite / asyncmy) instead of the threadpool
+DB_ASYNC = os.getenv("DB_ASYNC", "off").lower() in ("1", "true", "on", "yes")
 
+# QueuePool sizing (MySQL/pymysql and file-backed SQLite)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_RECYCLE_SECS = int(os.getenv("DB_POOL_RECYCLE_SECS", "1800"))
+DB_POOL_TIMEOUT_SECS = float(os.getenv("DB_POOL_TIMEOUT_SECS", "30"))
 
+# Applied to every new SQLite connection
+SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+SQLITE_FOREIGN_KEYS = os.getenv("SQLITE_FOREIGN_KEYS", "on").lower() in ("1", "true", "on", "yes")
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", "65536"))
 
-connect_args = {}
-if DATABASE_URL.startswith("sqlite"):
-    connect_args = {"check_same_thread": False}
+# Latest Alembic revision in backend/migrations (tests keep it in step). Startup only compares the
+# database against it, so booting never imports Alembic or parses the migration scripts.
+SCHEMA_REVISION = "0004"
+# Run `python -m backend.migrate` in-process at startup instead (in-memory SQLite, quick local runs)
+DB_MIGRATE_ON_STARTUP = os.getenv("DB_MIGRATE_ON_STARTUP", "off").lower() in ("1", "true", "on", "yes")
 
-engine = create_engine(
-    DATABASE_URL,
-    connect_args=connect_args,
-    pool_pre_ping=True,
-)
+
+class SchemaOutOfDate(RuntimeError):
+    pass
+
+
+class PoolMetrics:
+    """Checkout wait times and timeouts recorded by InstrumentedQueuePool."""
+
+    def __init__(self, window: int = 1024):
+        self._lock = threading.Lock()
+        self._waits_ms: deque[float] = deque(maxlen=window)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.max_wait_ms = 0.0
+
+    def record(self, wait_ms: float, timed_out: bool = False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self._waits_ms.append(wait_ms)
+            self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+
+    def stats(self, pool) -> dict:
+        with self._lock:
+            waits = sorted(self._waits_ms)
+
+        def pct(p: float) -> float | None:
+            if not waits:
+                return None
+            return waits[min(len(waits) - 1, int(p / 100 * len(waits)))]
+
+        result = {
+            "pool": type(pool).__name__,
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "wait_ms_p50": pct(50),
+            "wait_ms_p99": pct(99),
+            "wait_ms_max": self.max_wait_ms,
+        }
+        if isinstance(pool, QueuePool):
+            capacity = pool.size() + max(pool._max_overflow, 0)
+            result.update({
+                "size": pool.size(),
+                "max_overflow": pool._max_overflow,
+                "checked_out": pool.checkedout(),
+                "idle": pool.checkedin(),
+                "saturation": pool.checkedout() / capacity if capacity else 0.0,
+            })
+        return result
+
+
+pool_metrics = PoolMetrics()
+async_pool_metrics = PoolMetrics()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that reports how long each checkout waited for a free connection."""
+
+    metrics = pool_metrics
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.record((time.perf_counter() - started) * 1000, timed_out=True)
+            raise
+        self.metrics.record((time.perf_counter() - started) * 1000)
+        return conn
+
+
+class InstrumentedAsyncQueuePool(InstrumentedQueuePool, AsyncAdaptedQueuePool):
+    metrics = async_pool_metrics
+
+
+def _is_memory_sqlite(url: str) -> bool:
+    return url.startswith("sqlite") and (":memory:" in url or url.rstrip("/").endswith(":"))
+
+
+def set_sqlite_pragmas(dbapi_connection, connection_record=None):
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute(f"PRAGMA journal_mode={SQLITE_JOURNAL_MODE}")
+        cursor.execute(f"PRAGMA synchronous={SQLITE_SYNCHRONOUS}")
+        cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+        cursor.execute(f"PRAGMA foreign_keys={'ON' if SQLITE_FOREIGN_KEYS else 'OFF'}")
+        cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+        # negative cache_size is in KiB rather than pages
+        cursor.execute(f"PRAGMA cache_size=-{SQLITE_CACHE_SIZE_KB}")
+    finally:
+        cursor.close()
+
+
+def _engine_kwargs(url: str, poolclass) -> dict:
+    kwargs = {"pool_pre_ping": True}
+    if url.startswith("sqlite"):
+        kwargs["connect_args"] = {"check_same_thread": False}
+    if not _is_memory_sqlite(url):
+        kwargs.update(
+            poolclass=poolclass,
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_recycle=DB_POOL_RECYCLE_SECS,
+            pool_timeout=DB_POOL_TIMEOUT_SECS,
+        )
+    return kwargs
+
+
+def build_engine(url: str):
+    built = create_engine(url, **_engine_kwargs(url, InstrumentedQueuePool))
+    if url.startswith("sqlite"):
+        event.listen(built, "connect", set_sqlite_pragmas)
+    return built
+
+
+def async_database_url(url: str) -> str:
+    """Maps a sync DATABASE_URL onto its async driver (sqlite -> aiosqlite, mysql -> asyncmy)."""
+    scheme, sep, rest = url.partition("://")
+    dialect = scheme.split("+")[0]
+    drivers = {"sqlite": "sqlite+aiosqlite", "mysql": "mysql+asyncmy"}
+    if dialect not in drivers:
+        raise ValueError(f"No async driver configured for {scheme}")
+    return drivers[dialect] + sep + rest
+
+
+def build_async_engine(url: str):
+    built = create_async_engine(url, **_engine_kwargs(url, InstrumentedAsyncQueuePool))
+    if url.startswith("sqlite"):
+        event.listen(built.sync_engine, "connect", set_sqlite_pragmas)
+    return built
+
+
+def pool_stats() -> dict:
+    stats = pool_metrics.stats(engine.pool)
+    if async_engine is not None:
+        stats["async"] = async_pool_metrics.stats(async_engine.pool)
+    return stats
+
+
+engine = build_engine(DATABASE_URL)
 
 SessionLocal = sessionmaker(engine, autoflush=False, autocommit=False)
 
+async_engine = None
+AsyncSessionLocal = None
+if DB_ASYNC:
+    async_engine = build_async_engine(os.getenv("ASYNC_DATABASE_URL") or async_database_url(DATABASE_URL))
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 class Base(DeclarativeBase):
     pass
 
+
+def current_schema_revision(bind) -> str | None:
+    """The database's Alembic revision, or None before the first migration."""
+    try:
+        with bind.connect() as conn:
+            return conn.execute(text("SELECT version_num FROM alembic_version")).scalar()
+    except DBAPIError:
+        return None
+
+
+def check_schema_revision(bind) -> str:
+    """One query against alembic_version; raises SchemaOutOfDate unless it is SCHEMA_REVISION."""
+    revision = current_schema_revision(bind)
+    if revision != SCHEMA_REVISION:
+        raise SchemaOutOfDate(
+            f"database schema is at {revision or 'no revision'}, expected {SCHEMA_REVISION}; "
+            "run `python -m backend.migrate` first"
+        )
+    return revision
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,105 @@
+import codecs
+import csv
+import json
+
+IMPORT_FORMATS = ("csv", "jsonl")
+CSV_COLUMNS = ("description", "amount", "paid_by", "split_mode", "splits", "category_id")
+
+
+class RowError(ValueError):
+    pass
+
+
+def detect_format(content_type: str | None, explicit: str | None = None) -> str | None:
+    if explicit:
+        return explicit.lower() if explicit.lower() in IMPORT_FORMATS else None
+    content_type = (content_type or "").split(";")[0].strip().lower()
+    if content_type in ("text/csv", "application/csv"):
+        return "csv"
+    if content_type in ("application/x-ndjson", "application/jsonl", "application/x-jsonlines", "application/json-seq"):
+        return "jsonl"
+    return None
+
+
+async def iter_lines(chunks):
+    """Decodes an async stream of UTF-8 byte chunks into lines without buffering the whole body."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending.rstrip("\r")
+
+
+def parse_splits(value: str) -> list[dict]:
+    """'alice:12.50;bob:7.50' -> [{"username": "alice", "amount": "12.50"}, ...]"""
+    splits = []
+    for part in filter(None, (item.strip() for item in value.split(";"))):
+        username, sep, amount = part.rpartition(":")
+        if not sep or not username.strip():
+            raise RowError(f"Invalid split '{part}', expected username:amount")
+        splits.append({"username": username.strip(), "amount": amount.strip()})
+    return splits
+
+
+def csv_row_to_payload(header: list[str], fields: list[str]) -> dict:
+    if len(fields) != len(header):
+        raise RowError(f"Expected {len(header)} columns, got {len(fields)}")
+    row = dict(zip(header, fields))
+    payload = {
+        "description": row.get("description", ""),
+        "amount": row.get("amount", ""),
+        "paid_by": row.get("paid_by", ""),
+        "split_mode": row.get("split_mode") or "custom",
+        "splits": parse_splits(row.get("splits", "")),
+    }
+    if row.get("category_id"):
+        payload["category_id"] = row["category_id"]
+    return payload
+
+
+def jsonl_row_to_payload(line: str) -> dict:
+    try:
+        payload = json.loads(line)
+    except ValueError as exc:
+        raise RowError(f"Invalid JSON: {exc.msg}")
+    if not isinstance(payload, dict):
+        raise RowError("Each line must be a JSON object")
+    return payload
+
+
+async def iter_row_batches(chunks, fmt: str, batch_size: int):
+    """
+    Yields lists of (line_number, payload dict or RowError), batch_size rows at a time.
+    CSV needs a header naming the CSV_COLUMNS it uses; quoted fields may not span lines.
+    """
+    header = None
+    batch = []
+    line_number = 0
+    async for line in iter_lines(chunks):
+        line_number += 1
+        if not line.strip():
+            continue
+        if fmt == "csv" and header is None:
+            header = [name.strip().lower() for name in next(csv.reader([line]))]
+            missing = {"description", "amount", "paid_by"} - set(header)
+            if missing:
+                raise RowError(f"CSV header is missing {', '.join(sorted(missing))}")
+            continue
+        try:
+            if fmt == "csv":
+                payload = csv_row_to_payload(header, next(csv.reader([line])))
+            else:
+                payload = jsonl_row_to_payload(line)
+        except RowError as exc:
+            payload = exc
+        batch.append((line_number, payload))
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
@@ -0,0 +1,26 @@
+import json
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson  # optional, the stdlib encoder gives the same JSON more slowly
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+
+def dumps(content) -> bytes:
+    """Compact UTF-8 JSON for plain dicts, lists and scalars (no Pydantic models)."""
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse rendered with orjson when it is installed. Bytes are taken as an already
+    serialized body, so cached read models go out without being decoded again.
+    """
+
+    def render(self, content) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return dumps(content)
@@ -1,22 +1,34 @@
+import asyncio
 import os
 from decimal import Decimal, ROUND_HALF_UP
+from dataclasses import dataclass, asdict
 from typing import List, Iterable
-import bcrypt
-import json, re, urllib.request
-from urllib.error import URLError, HTTPError
-from itsdangerous import URLSafeTimedSerializer, BadSignature, BadTimeSignature
-from fastapi import FastAPI, Depends, HTTPException, Response, Request, status, WebSocket, WebSocketDisconnect, BackgroundTasks
+import base64, hashlib, hmac, json, re
+from fastapi import FastAPI, Depends, Header, HTTPException, Query, Response, Request, status, WebSocket, WebSocketDisconnect, BackgroundTasks
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
-from pydantic import BaseModel, EmailStr
+from fastapi.responses import FileResponse, JSONResponse
+from fastapi.concurrency import run_in_threadpool
+from functools import lru_cache
+from pydantic import BaseModel, EmailStr, TypeAdapter, ValidationError
 from sqlalchemy.orm import Session, selectinload
-from sqlalchemy import func
 from sqlalchemy.exc import IntegrityError
-from backend.db import get_db, SessionLocal, Base, engine
-from backend.crud.users import get_user_by_username, create_user, get_user_by_email, update_user
-from datetime import date, timedelta
+from sqlalchemy.ext.asyncio import AsyncSession
+from backend.db import (
+    DB_ASYNC, DB_MIGRATE_ON_STARTUP, get_db, get_async_db, SessionLocal, AsyncSessionLocal, engine, async_engine,
+    pool_stats, check_schema_revision,
+)
+from backend.cache import user_cache, rephrase_cache, read_model_cache
+from backend.passwords import PasswordPoolBusy, password_hasher
+from backend.rephraser_client import CircuitBreaker, RephraserClient
+from backend.expense_import import RowError, detect_format, iter_row_batches
+from backend.settlement_strategies import SETTLEMENT_STRATEGIES, settle
+from backend.notifications import manager
+from backend.fast_json import FastJSONResponse, dumps
+from backend.crud.users import get_user_by_username, get_user_by_username_async, create_user, get_user_by_email, update_user
+from datetime import date, datetime, timedelta
 from backend.crud.subscriptions import (
     list_subscriptions_for_group,
+    list_subscriptions_for_group_async,
     get_subscription,
     create_subscription as persist_subscription,
     update_subscription as persist_subscription_update,
@@ -25,9 +37,20 @@ from backend.crud.subscriptions import (
 from backend.models.group import Subscription, SubscriptionMember
 from backend.crud.groups import (
     create_group as persist_group,
-    get_groups_for_user,
     get_group_with_members,
+    get_group_with_members_async,
     is_user_in_group,
+    is_user_in_group_async,
+    group_exists,
+    group_exists_async,
+    bump_group_version,
+    bump_group_versions_for_user,
+    get_group_version_for_member,
+    get_group_version_for_member_async,
+    get_group_versions_for_user,
+    get_group_versions_for_user_async,
+    get_groups_with_members,
+    get_groups_with_members_async,
 )
 from backend.crud.invites import (
     create_group_invite,
@@ -37,18 +60,31 @@ from backend.crud.invites import (
 )
 from backend.crud.expenses import (
     create_expense,
-    list_expenses_for_group,
+    bulk_create_expenses,
+    list_expense_rows_for_group,
+    list_expense_rows_for_group_async,
+    list_expenses_page,
+    list_expenses_page_async,
     get_expense,
     update_expense,
     delete_expense,
 )
 from backend.crud.settlements import (
     create_settlement_record,
-    list_settlements_for_group,
+    list_settlement_rows_for_group,
+    list_settlement_rows_for_group_async,
     get_settlement,
     confirm_settlement,
 )
+from backend.crud.spending import spending_summary_rows
+from backend.crud.category import list_categories_with_splits, list_categories_with_splits_async
+from backend.crud.balances import (
+    get_group_balances,
+    get_group_balances_async,
+    delete_group_balances,
+)
 from backend.models.group import Group, GroupInvite, GroupMember, Expense, Settlement, GroupCategory, CategorySplit, ExpenseSplit
+from backend.models.user import User
 app = FastAPI()
 
 FRONTEND_DIST = os.getenv(
@@ -62,14 +98,35 @@ if os.path.isdir(os.path.join(FRONTEND_DIST, "assets")):
 
 
 def ensure_database():
-    from backend.models import user, group  # noqa: F401 
-    from backend.models.group import Subscription, SubscriptionMember
-    Base.metadata.create_all(bind=engine)
+    """Refuses to serve a database that `python -m backend.migrate` has not brought up to date."""
+    if DB_MIGRATE_ON_STARTUP:
+        from backend.migrate import upgrade_database
+        upgrade_database(engine)
+    check_schema_revision(engine)
 
 
 @app.on_event("startup")
-def startup_event():
+async def startup_event():
     ensure_database()
+    rephraser_client.attach_to_running_loop()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    password_hasher.shutdown()
+    await rephraser_client.aclose()
+    await manager.close_all()
+    if async_engine is not None:
+        await async_engine.dispose()
+
+
+@app.exception_handler(PasswordPoolBusy)
+async def password_pool_busy_handler(request: Request, exc: PasswordPoolBusy):
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Too many sign-in attempts in progress, please retry"},
+        headers={"Retry-After": "1"},
+    )
     
 
 class LoginRequest(BaseModel):
@@ -183,6 +240,23 @@ class ExpenseResponse(BaseModel):
     splits: List[ExpenseSplitResponse]
 
 
+class ExpensePageResponse(BaseModel):
+    items: List[ExpenseResponse]
+    next_cursor: str | None = None
+
+
+class ExpenseImportRowError(BaseModel):
+    line: int
+    error: str
+
+
+class ExpenseImportResponse(BaseModel):
+    imported: int
+    failed: int
+    errors: List[ExpenseImportRowError]
+    errors_truncated: bool = False
+
+
 class SettlementResponse(BaseModel):
     payer: str
     receiver: str
@@ -224,6 +298,13 @@ class GroupSpendingSummary(BaseModel):
     net_display: str
 
 
+class CurrencySpendingTotal(BaseModel):
+    currency: str
+    paid: float
+    owed: float
+    net: float
+
+
 class ProfileSpendingSummaryResponse(BaseModel):
     overall_paid: float
     overall_owed: float
@@ -233,6 +314,7 @@ class ProfileSpendingSummaryResponse(BaseModel):
     overall_net_display: str
     overall_currency: str | None = None
     currencies: List[str] = []
+    currency_totals: List[CurrencySpendingTotal] = []
     groups: List[GroupSpendingSummary]
 
 
@@ -268,10 +350,24 @@ class SubscriptionResponse(BaseModel):
     members: List[ExpenseSplitResponse]  
 
 
-SETTLEMENT_APPLIED_STATUSES = {"payer_confirmed", "complete"}
+class GroupDashboardResponse(BaseModel):
+    version: int
+    group: GroupResponse
+    expenses: ExpensePageResponse | List[ExpenseResponse]
+    categories: List[CategoryResponse]
+    settlements: SettlementSummaryResponse
+    subscriptions: List[SubscriptionResponse]
+
+
 SECRET_KEY = os.getenv("SECRET_KEY", "dev-secret-key")
 SESSION_SALT = "session-cookie"
-serializer = URLSafeTimedSerializer(SECRET_KEY, salt=SESSION_SALT)
+
+
+@lru_cache(maxsize=1)
+def session_serializer():
+    from itsdangerous import URLSafeTimedSerializer  # only needed once a request carries a session
+
+    return URLSafeTimedSerializer(SECRET_KEY, salt=SESSION_SALT)
 
 
 def dollars_to_cents(value) -> int:
@@ -306,6 +402,10 @@ def format_money(currency: str, amount: float) -> str:
 
 REPHRASER_URL = os.getenv("REPHRASER_URL", "http://127.0.0.1:8001")
 REPHRASER_TIMEOUT_SECS = float(os.getenv("REPHRASER_TIMEOUT_SECS", "1.0"))
+REPHRASER_MAX_CONNECTIONS = int(os.getenv("REPHRASER_MAX_CONNECTIONS", "10"))
+REPHRASER_BREAKER_FAILURES = int(os.getenv("REPHRASER_BREAKER_FAILURES", "5"))
+REPHRASER_BREAKER_COOLDOWN_SECS = float(os.getenv("REPHRASER_BREAKER_COOLDOWN_SECS", "30"))
+_money_re = re.compile(r"(?<![\d.])(\d+\.\d{2})(?![\d])")
 
 
 def build_rephraser_facts(profile_summary: ProfileSpendingSummaryResponse) -> dict:
@@ -332,12 +432,13 @@ def deterministic_fallback_summary(profile_summary: ProfileSpendingSummaryRespon
         return f"You have no group activity yet (paid {paid}, owed {owed})."
 
     totals_by_cur: dict[str, dict[str, float]] = {}
-    for g in groups:
-        cur = (g.currency or "").upper() or "UNK"
+    # Prefer the per-currency rollup computed in SQL; re-bucket groups only if it is missing.
+    for t in (profile_summary.currency_totals or groups):
+        cur = (t.currency or "").upper() or "UNK"
         bucket = totals_by_cur.setdefault(cur, {"paid": 0.0, "owed": 0.0, "net": 0.0})
-        bucket["paid"] += float(g.paid)
-        bucket["owed"] += float(g.owed)
-        bucket["net"] += float(g.net)
+        bucket["paid"] += float(t.paid)
+        bucket["owed"] += float(t.owed)
+        bucket["net"] += float(t.net)
         
     cur_codes = sorted(totals_by_cur.keys())
     cur_count = len(cur_codes)
@@ -413,79 +514,48 @@ def validate_rephraser_output(text: str, facts: dict) -> bool:
     return True
 
 
-def call_rephraser(facts: dict, max_sentences: int = 2) -> tuple[str, str] | None:
-    """
-    Calls the rephraser service. Returns (summary, mode) or None on failure.
-    """
-    payload = {"facts": facts, "max_sentences": max_sentences}
-    data = json.dumps(payload).encode("utf-8")
-
-    req = urllib.request.Request(
-        url=f"{REPHRASER_URL.rstrip('/')}/rephrase",
-        data=data,
-        headers={"Content-Type": "application/json"},
-        method="POST",
-    )
+rephraser_client = RephraserClient(
+    REPHRASER_URL,
+    timeout_secs=REPHRASER_TIMEOUT_SECS,
+    max_connections=REPHRASER_MAX_CONNECTIONS,
+    breaker=CircuitBreaker(
+        failure_threshold=REPHRASER_BREAKER_FAILURES,
+        cooldown_secs=REPHRASER_BREAKER_COOLDOWN_SECS,
+    ),
+    validator=validate_rephraser_output,
+)
 
-    try:
-        with urllib.request.urlopen(req, timeout=REPHRASER_TIMEOUT_SECS) as resp:
-            body = resp.read().decode("utf-8")
-            obj = json.loads(body)
-            summary = (obj.get("summary") or "").strip()
-            mode = (obj.get("mode") or "template").strip()
-            if not summary:
-                return None
-            if not validate_rephraser_output(summary, facts):
-                return None
-            return summary, mode
-    except (HTTPError, URLError, TimeoutError, ValueError):
-        return None
-    
 
-class ConnectionManager:
-    def __init__(self):
-        self.connections: dict[int, set[WebSocket]] = {}
+def rephraser_cache_key(facts: dict, max_sentences: int) -> str:
+    canonical = json.dumps({"facts": facts, "max_sentences": max_sentences}, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
 
-    async def connect(self, user_id: int, websocket: WebSocket):
-        await websocket.accept()
-        self.connections.setdefault(user_id, set()).add(websocket)
 
-    def disconnect(self, user_id: int, websocket: WebSocket):
-        websockets = self.connections.get(user_id)
-        if not websockets:
-            return
-        websockets.discard(websocket)
-        if not websockets:
-            self.connections.pop(user_id, None)
+async def call_rephraser(facts: dict, max_sentences: int = 2) -> tuple[str, str] | None:
+    """
+    Calls the rephraser service. Returns (summary, mode), or None on failure, invalid output,
+    or while the circuit breaker is open. Successful rephrasings are cached by payload hash.
+    """
+    cache_key = rephraser_cache_key(facts, max_sentences)
+    cached = rephrase_cache.get(cache_key)
+    if cached:
+        return cached["summary"], cached["mode"]
 
-    async def send(self, user_id: int, message: dict):
-        websockets = list(self.connections.get(user_id, []))
-        for socket in websockets:
-            try:
-                await socket.send_json(message)
-            except RuntimeError:
-                self.disconnect(user_id, socket)
+    rephrased = await rephraser_client.rephrase(facts, max_sentences=max_sentences)
+    if rephrased:
+        rephrase_cache.set(cache_key, {"summary": rephrased[0], "mode": rephrased[1]})
+    return rephrased
 
 
-manager = ConnectionManager()
 
 
 def notify_users(background_tasks: BackgroundTasks | None, user_ids: Iterable[int], message: dict):
     if background_tasks is None:
         return
     unique_ids = {user_id for user_id in user_ids if user_id}
-    for user_id in unique_ids:
-        background_tasks.add_task(manager.send, user_id, message)
-
-
-def notify_settlement_update(
-    background_tasks: BackgroundTasks | None, group_id: int, user_ids: Iterable[int]
-):
-    notify_users(
-        background_tasks,
-        user_ids,
-        {"type": "settlement_update", "data": {"group_id": group_id}},
-    )
+    if unique_ids:
+        # one task per write: the message is serialized once and queued on every member's sockets
+        background_tasks.add_task(manager.publish, unique_ids, message)
 
 
 def notify_group_members(
@@ -504,52 +574,258 @@ def notify_group_members(
     ]
     if member_ids:
         notify_users(background_tasks, member_ids, message)
-def verify_password(plain_password: str, password_hash: str) -> bool:
-    if not password_hash:
-        return False
 
-    try:
-        return bcrypt.checkpw(plain_password.encode(), password_hash.encode())
-    except ValueError:
-        return False
+
+def publish_group_change(
+    background_tasks: BackgroundTasks | None,
+    group: Group,
+    event_type: str,
+    *,
+    version: int,
+    **data,
+) -> int:
+    """
+    Sends the change to every member, the writer included, as
+    {"type": event_type, "data": {"group_id", "version", **data}}. Clients apply the entity in
+    place and only refetch when they see a version gap. `version` comes from bump_group_version,
+    called before the write so the new version committed in the same transaction as the data.
+    """
+    # entries are keyed by version, so this only frees the old bodies early
+    read_model_cache.invalidate_group(group.id)
+    notify_group_members(
+        background_tasks,
+        group,
+        {"type": event_type, "data": {"group_id": group.id, "version": version, **data}},
+    )
+    return version
 
 
-def authenticate_user(username: str, password: str, db: Session):
-    user = get_user_by_username(db, username)
-    if not user or not verify_password(password, user.password_hash):
+def group_recommendations(db: Session, group) -> list[dict]:
+    return [item.dict() for item in settlements_from_balances(group, load_member_balances(db, group))]
+
+
+def publish_expense_change(
+    db: Session, background_tasks: BackgroundTasks | None, group: Group, version: int, op: str, expense: dict
+):
+    # recommendations ride along so members don't refetch settlements after every expense
+    publish_group_change(
+        background_tasks, group, "expenses_changed", version=version,
+        op=op, expense=expense, recommendations=group_recommendations(db, group),
+    )
+
+
+def publish_settlement_change(
+    db: Session,
+    background_tasks: BackgroundTasks | None,
+    group: Group,
+    version: int,
+    op: str,
+    record: SettlementRecordResponse,
+):
+    publish_group_change(
+        background_tasks, group, "settlement_update", version=version,
+        op=op, settlement=record.dict(), recommendations=group_recommendations(db, group),
+    )
+
+
+async def verify_password(plain_password: str, password_hash: str) -> bool:
+    return await password_hasher.verify(plain_password, password_hash)
+
+
+async def release_connection(db: Session):
+    # Hand the pooled connection back before waiting on bcrypt; a queue of logins holding
+    # connections would otherwise exhaust the pool and every thread waiting on it.
+    await run_in_threadpool(db.close)
+
+
+async def authenticate_user(username: str, password: str, db: Session):
+    user = await run_in_threadpool(get_user_by_username, db, username)
+    if not user:
+        return None
+    await release_connection(db)
+    if not await verify_password(password, user.password_hash):
         return None
+    if password_hasher.needs_rehash(user.password_hash):
+        # Transparently move the stored hash to the configured bcrypt cost.
+        new_hash = await hash_password(password)
+        user = await run_in_threadpool(update_user, db, user, password_hash=new_hash)
     return user
 
 
 def create_session(username: str) -> str:
-    return serializer.dumps({"sub": username})
+    return session_serializer().dumps({"sub": username})
 
 
-def hash_password(password: str) -> str:
-    return bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
+async def hash_password(password: str) -> str:
+    return await password_hasher.hash(password)
 
 
 def get_session_username(session_token: str) -> str | None:
     if not session_token:
         return None
+    from itsdangerous import BadSignature
+
     try:
-        data = serializer.loads(session_token)
-    except (BadSignature, BadTimeSignature):
+        data = session_serializer().loads(session_token)
+    except BadSignature:  # BadTimeSignature is a subclass
         return None
     return data.get("sub")
 
 
-def get_current_user(request: Request, db: Session = Depends(get_db)):
-    session_token = request.cookies.get("session")
-    username = get_session_username(session_token)
+@dataclass(frozen=True)
+class CurrentUser:
+    """Lightweight, session-independent view of the authenticated user (safe to cache)."""
+    id: int
+    username: str
+    email: str | None
+
+
+def _session_username(request: Request) -> str:
+    username = get_session_username(request.cookies.get("session"))
     if not username:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
+    return username
 
-    user = get_user_by_username(db, username)
+
+def _remember_current_user(username: str, user) -> CurrentUser:
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
+    snapshot = CurrentUser(id=user.id, username=user.username, email=user.email)
+    user_cache.set(username, asdict(snapshot))
+    return snapshot
+
+
+def get_current_user(request: Request, db: Session = Depends(get_db)) -> CurrentUser:
+    username = _session_username(request)
+    cached = user_cache.get(username)
+    if cached:
+        return CurrentUser(**cached)
+    return _remember_current_user(username, get_user_by_username(db, username))
+
+
+def socket_user(username: str) -> CurrentUser | None:
+    cached = user_cache.get(username)
+    if cached:
+        return CurrentUser(**cached)
+    with SessionLocal() as db:
+        user = get_user_by_username(db, username)
+        return _remember_current_user(username, user) if user else None
+
+
+# The hot read endpoints are async def. With DB_ASYNC on they await an AsyncSession directly;
+# otherwise each sync crud call is pushed to the threadpool instead of pinning a thread per request.
+get_read_db = get_async_db if DB_ASYNC else get_db
+
+
+async def run_read(db, sync_fn, async_fn, *args, **kwargs):
+    if isinstance(db, AsyncSession):
+        return await async_fn(db, *args, **kwargs)
+    return await run_in_threadpool(sync_fn, db, *args, **kwargs)
+
+
+def group_etag(group_id: int, version: int, *parts) -> str:
+    return 'W/"' + "-".join([f"g{group_id}", f"v{version}", *map(str, parts)]) + '"'
 
-    return user
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # weak comparison, as If-None-Match requires
+    return etag.removeprefix("W/") in {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+
+
+def group_not_modified(request: Request, response: Response, group_id: int, version: int | None, *parts) -> Response | None:
+    """
+    Tags the response with the group's version and returns a 304 when the client already holds
+    it. Read the version before the data: a racing write then only makes the tag older than
+    the body, which costs a refetch rather than a stale hit. version None (not a member, or no
+    such group) skips the check so the full path can answer with its 403/404.
+    """
+    if version is None:
+        return None
+    headers = {"ETag": group_etag(group_id, version, *parts), "Cache-Control": "private, no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return None
+
+
+@lru_cache(maxsize=None)
+def _json_adapter(model_type) -> TypeAdapter:
+    return TypeAdapter(model_type)
+
+
+def read_model_body(group_id: int, resource: str, version: int | None, payload, model_type=None) -> bytes:
+    """
+    Serializes a read model once and keeps the bytes for later requests at the same version.
+    Without model_type the payload must already be plain dicts/lists and goes straight to orjson.
+    """
+    body = dumps(payload) if model_type is None else _json_adapter(model_type).dump_json(payload)
+    read_model_cache.set(group_id, resource, version, body)
+    return body
+
+
+def json_body_response(body: bytes, response: Response | None = None) -> Response:
+    # FastAPI does not merge the injected response's headers into a returned Response
+    headers = {}
+    if response is not None:
+        headers = {name: response.headers[name] for name in ("etag", "cache-control") if name in response.headers}
+    return FastJSONResponse(body, headers=headers)
+
+
+async def get_current_user_for_read(request: Request, db=Depends(get_read_db)) -> CurrentUser:
+    username = _session_username(request)
+    cached = user_cache.get(username)
+    if cached:
+        return CurrentUser(**cached)
+    user = await run_read(db, get_user_by_username, get_user_by_username_async, username)
+    return _remember_current_user(username, user)
+
+
+def _refuse_group_access(found: bool):
+    if not found:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Group not found")
+    raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
+
+
+@dataclass(frozen=True)
+class GroupMemberUser(CurrentUser):
+    """The current user once admitted to a group, with the group's version from the same lookup."""
+    group_version: int
+
+
+def _admit_group_member(current_user: CurrentUser, version: int) -> GroupMemberUser:
+    return GroupMemberUser(**asdict(current_user), group_version=version)
+
+
+def require_group_member(
+    group_id: int, current_user=Depends(get_current_user), db: Session = Depends(get_db)
+) -> GroupMemberUser:
+    """
+    The current user, once the database confirms they belong to the group in the path: 404 when
+    the group does not exist, 403 when they are not a member. Loads no members. The same indexed
+    lookup returns the group's version for ETags and read-model keys, and nothing is cached per
+    worker, so a leave or removal applies to every worker at once.
+    """
+    version = get_group_version_for_member(db, group_id, current_user.id)
+    if version is None:
+        _refuse_group_access(group_exists(db, group_id))
+    return _admit_group_member(current_user, version)
+
+
+async def require_group_member_for_read(
+    group_id: int,
+    current_user=Depends(get_current_user_for_read),
+    db=Depends(get_read_db),
+) -> GroupMemberUser:
+    version = await run_read(
+        db, get_group_version_for_member, get_group_version_for_member_async, group_id, current_user.id
+    )
+    if version is None:
+        _refuse_group_access(await run_read(db, group_exists, group_exists_async, group_id))
+    return _admit_group_member(current_user, version)
 
 
 def serialize_group(group: Group) -> GroupResponse:
@@ -593,89 +869,115 @@ def serialize_invite(invite: GroupInvite) -> InviteResponse:
     )
 
 
+def expense_dict(expense: Expense) -> dict:
+    """ExpenseResponse-shaped dict, for list endpoints that serialize without Pydantic."""
+    return {
+        "id": expense.id,
+        "description": expense.description,
+        "amount": cents_to_dollars(expense.amount),
+        "paid_by": expense.paid_by.username if expense.paid_by else "",
+        "created_at": expense.created_at.isoformat(),
+        "category_id": expense.category_id,
+        "splits": [
+            {"username": split.user.username if split.user else "", "amount": cents_to_dollars(split.amount), "share": None}
+            for split in expense.splits
+        ],
+    }
+
+
 def serialize_expense(expense: Expense) -> ExpenseResponse:
+    return ExpenseResponse(**expense_dict(expense))
+
+
+def expense_dicts_from_rows(expense_rows, split_rows) -> list[dict]:
+    """
+    ExpenseResponse-shaped dicts from list_expense_rows_for_group. amount / 100 is the same
+    correctly rounded float as cents_to_dollars without the Decimal round trip.
+    """
+    splits_by_expense: dict[int, list[dict]] = {}
+    for expense_id, username, amount in split_rows:
+        splits_by_expense.setdefault(expense_id, []).append(
+            {"username": username or "", "amount": amount / 100, "share": None}
+        )
+    return [
+        {
+            "id": expense_id,
+            "description": description,
+            "amount": amount / 100,
+            "paid_by": paid_by or "",
+            "created_at": created_at.isoformat(),
+            "category_id": category_id,
+            "splits": splits_by_expense.get(expense_id, []),
+        }
+        for expense_id, description, amount, paid_by, created_at, category_id in expense_rows
+    ]
+
+
+def serialize_written_expense(expense: Expense, usernames: dict[int, str], split_items: List[dict]) -> ExpenseResponse:
+    """
+    Response for an expense this request just wrote, built from its refreshed row and the split
+    dicts it was written with; usernames should be read before the commit expires the members.
+    """
     return ExpenseResponse(
         id=expense.id,
         description=expense.description,
         amount=cents_to_dollars(expense.amount),
-        paid_by=expense.paid_by.username if expense.paid_by else "",
+        paid_by=usernames.get(expense.paid_by_id, ""),
         created_at=expense.created_at.isoformat(),
         category_id=expense.category_id,
         splits=[
             ExpenseSplitResponse(
-                username=split.user.username if split.user else "",
-                amount=cents_to_dollars(split.amount),
+                username=usernames.get(split["user_id"], ""),
+                amount=cents_to_dollars(split["amount_cents"]),
             )
-            for split in expense.splits
+            for split in split_items
         ],
     )
 
 
-def calculate_member_balances(
-    group,
-    expenses: List[Expense],
-    completed_settlements: List[Settlement] | None = None,
-) -> dict[int, int]:
-    member_ids = [member.user_id for member in group.members if member.user]
-    balances = {user_id: 0 for user_id in member_ids}
-
-    for expense in expenses:
-        if expense.paid_by_id in balances:
-            balances[expense.paid_by_id] += expense.amount
-        for split in expense.splits:
-            if split.user_id in balances:
-                balances[split.user_id] -= split.amount
-
-    if completed_settlements:
-        for record in completed_settlements:
-            if record.payer_id in balances:
-                balances[record.payer_id] += record.amount
-            if record.receiver_id in balances:
-                balances[record.receiver_id] -= record.amount
-
-    return balances
-
-
-def calculate_settlements(
-    group,
-    expenses: List[Expense],
-    completed_settlements: List[Settlement] | None = None,
-) -> List[SettlementResponse]:
+def split_usernames(db: Session, group, split_items: List[dict]) -> dict[int, str]:
+    """user id -> username for the group's members plus any split user who has since left."""
+    usernames = {member.user_id: member.user.username for member in group.members if member.user}
+    missing = {split["user_id"] for split in split_items} - usernames.keys()
+    if missing:
+        usernames.update(db.query(User.id, User.username).filter(User.id.in_(missing)).all())
+    return usernames
+
+
+def encode_expense_cursor(key: tuple[datetime, int]) -> str:
+    created_at, expense_id = key
+    raw = json.dumps({"t": created_at.isoformat(), "id": expense_id}).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_expense_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        data = json.loads(raw)
+        return datetime.fromisoformat(data["t"]), int(data["id"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def load_member_balances(db: Session, group) -> dict[int, int]:
+    """Reads current members' balances from the materialized ledger instead of replaying history."""
+    return member_balances_from_ledger(group, get_group_balances(db, group.id))
+
+
+def member_balances_from_ledger(group, ledger: dict[int, int]) -> dict[int, int]:
+    return {member.user_id: ledger.get(member.user_id, 0) for member in group.members if member.user}
+
+
+def settlements_from_balances(group, balances: dict[int, int], strategy: str = "greedy") -> List[SettlementResponse]:
     members = {member.user_id: member.user for member in group.members if member.user}
-    balances = calculate_member_balances(group, expenses, completed_settlements)
-
-    creditors = []
-    debtors = []
-    for user_id, balance in balances.items():
-        if balance > 0:
-            creditors.append([user_id, balance])
-        elif balance < 0:
-            debtors.append([user_id, -balance])
-
-    creditors.sort(key=lambda x: x[1], reverse=True)
-    debtors.sort(key=lambda x: x[1], reverse=True)
-
-    settlements: List[SettlementResponse] = []
-    i = j = 0
-    while i < len(debtors) and j < len(creditors):
-        debtor_id, debt_amount = debtors[i]
-        creditor_id, credit_amount = creditors[j]
-        payment = min(debt_amount, credit_amount)
-        settlements.append(
-            SettlementResponse(
-                payer=members[debtor_id].username,
-                receiver=members[creditor_id].username,
-                amount=cents_to_dollars(payment),
-            )
+    return [
+        SettlementResponse(
+            payer=members[payer_id].username,
+            receiver=members[receiver_id].username,
+            amount=cents_to_dollars(amount),
         )
-        debtors[i][1] -= payment
-        creditors[j][1] -= payment
-        if debtors[i][1] == 0:
-            i += 1
-        if creditors[j][1] == 0:
-            j += 1
-
-    return settlements
+        for payer_id, receiver_id, amount in settle(balances, strategy)
+    ]
 
 
 def serialize_settlement_record(record: Settlement) -> SettlementRecordResponse:
@@ -691,11 +993,29 @@ def serialize_settlement_record(record: Settlement) -> SettlementRecordResponse:
     )
 
 
+def settlement_record_dicts_from_rows(rows) -> list[dict]:
+    """SettlementRecordResponse-shaped dicts from list_settlement_rows_for_group."""
+    return [
+        {
+            "id": settlement_id,
+            "payer": payer or "",
+            "receiver": receiver or "",
+            "amount": amount / 100,
+            "status": status,
+            "payer_confirmed": bool(payer_confirmed),
+            "receiver_confirmed": bool(receiver_confirmed),
+            "created_at": created_at.isoformat(),
+        }
+        for settlement_id, payer, receiver, amount, status, payer_confirmed, receiver_confirmed, created_at in rows
+    ]
+
+
 CADENCE_DAY_DELTAS = {"monthly": 30, "quarterly": 90, "yearly": 365}
 
-def serialize_subscription(sub: Subscription) -> SubscriptionResponse:
+def subscription_dict(sub: Subscription, today: date | None = None) -> dict:
+    """SubscriptionResponse-shaped dict, for list endpoints that serialize without Pydantic."""
     amount = cents_to_dollars(sub.amount)
-    today = date.today()
+    today = today or date.today()
     due_in = (sub.next_due_date - today).days
     status = "ok"
     if due_in <= 0:
@@ -708,21 +1028,25 @@ def serialize_subscription(sub: Subscription) -> SubscriptionResponse:
     for m in sub.members:
         username = m.user.username if m.user else ""
         share_amount = cents_to_dollars((sub.amount * m.share) // total_share if total_share else 0)
-        member_payloads.append(ExpenseSplitResponse(username=username, amount=share_amount, share=m.share))
-
-    return SubscriptionResponse(
-        id=sub.id,
-        name=sub.name,
-        amount=amount,
-        amount_display=format_money(sub.group.currency if sub.group else None, amount),
-        cadence=sub.cadence,
-        next_due_date=sub.next_due_date.isoformat(),
-        due_in_days=due_in,
-        status=status,
-        notes=sub.notes or "",
-        category_id=sub.category_id,
-        members=member_payloads,
-    )
+        member_payloads.append({"username": username, "amount": share_amount, "share": m.share})
+
+    return {
+        "id": sub.id,
+        "name": sub.name,
+        "amount": amount,
+        "amount_display": format_money(sub.group.currency if sub.group else None, amount),
+        "cadence": sub.cadence,
+        "next_due_date": sub.next_due_date.isoformat(),
+        "due_in_days": due_in,
+        "status": status,
+        "notes": sub.notes or "",
+        "category_id": sub.category_id,
+        "members": member_payloads,
+    }
+
+
+def serialize_subscription(sub: Subscription) -> SubscriptionResponse:
+    return SubscriptionResponse(**subscription_dict(sub))
 
 def _build_member_shares(group, members: List[SubscriptionMemberInput]):
     member_map = {m.user.username: m.user.id for m in group.members if m.user}
@@ -760,10 +1084,33 @@ def health():
     return {"ok": True}
 
 
+# /api/metrics answers only requests carrying this value in X-Metrics-Token; unset, it is disabled
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+
+def require_metrics_token(x_metrics_token: str | None = Header(default=None)):
+    """404 unless the request carries METRICS_TOKEN, so the endpoint looks absent to everyone else."""
+    if not METRICS_TOKEN or not hmac.compare_digest((x_metrics_token or "").encode(), METRICS_TOKEN.encode()):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+
+
+@app.get("/api/metrics", dependencies=[Depends(require_metrics_token)])
+def metrics():
+    return {
+        "user_cache": user_cache.stats(),
+        "password_hasher": password_hasher.stats(),
+        "rephraser": rephraser_client.stats(),
+        "rephrase_cache": rephrase_cache.stats(),
+        "db_pool": pool_stats(),
+        "websockets": manager.stats(),
+        "read_model_cache": read_model_cache.stats(),
+    }
+
+
 
 @app.post("/api/auth/login")
-def login(data: LoginRequest, response: Response, db: Session = Depends(get_db)):
-    user = authenticate_user(data.username, data.password, db)
+async def login(data: LoginRequest, response: Response, db: Session = Depends(get_db)):
+    user = await authenticate_user(data.username, data.password, db)
 
     if not user:
         raise HTTPException(
@@ -796,12 +1143,12 @@ def validate_password(password: str):
 
 
 @app.post("/api/auth/register")
-def register(data: RegisterRequest, response: Response, db: Session = Depends(get_db)):
-    existing = get_user_by_username(db, data.username)
+async def register(data: RegisterRequest, response: Response, db: Session = Depends(get_db)):
+    existing = await run_in_threadpool(get_user_by_username, db, data.username)
     if existing:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Username already taken")
 
-    existing_email = get_user_by_email(db, data.email)
+    existing_email = await run_in_threadpool(get_user_by_email, db, data.email)
     if existing_email:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered")
 
@@ -810,7 +1157,9 @@ def register(data: RegisterRequest, response: Response, db: Session = Depends(ge
 
     validate_password(data.password)
 
-    user = create_user(db, data.username, data.email, hash_password(data.password))
+    await release_connection(db)
+    password_hash = await hash_password(data.password)
+    user = await run_in_threadpool(create_user, db, data.username, data.email, password_hash)
     response.set_cookie(
         key="session",
         value=create_session(user.username),
@@ -832,7 +1181,7 @@ def auth_me(current_user=Depends(get_current_user)):
 
 
 @app.put("/api/auth/me", response_model=UserResponse)
-def update_profile(
+async def update_profile(
     payload: UpdateProfileRequest,
     current_user=Depends(get_current_user),
     db: Session = Depends(get_db),
@@ -840,21 +1189,30 @@ def update_profile(
     email = payload.email
     new_password = payload.new_password
     current_password = payload.current_password
+    user = await run_in_threadpool(get_user_by_username, db, current_user.username)
+    if not user:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
 
-    if email and email != current_user.email:
-        if get_user_by_email(db, email):
+    user_email = user.email
+    if email and email != user_email:
+        if await run_in_threadpool(get_user_by_email, db, email):
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already in use")
 
     password_hash = None
     if new_password:
-        if not current_password or not verify_password(current_password, current_user.password_hash):
+        await release_connection(db)
+        if not current_password or not await verify_password(current_password, user.password_hash):
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Current password is incorrect")
         validate_password(new_password)
-        password_hash = hash_password(new_password)
+        password_hash = await hash_password(new_password)
 
-    updated_user = update_user(
+    if email and email != user_email:
+        # member emails are part of every group payload they appear in; commits with update_user
+        await run_in_threadpool(bump_group_versions_for_user, db, user.id)
+    updated_user = await run_in_threadpool(
+        update_user,
         db,
-        current_user,
+        user,
         email=email if email is not None else None,
         password_hash=password_hash,
     )
@@ -867,16 +1225,9 @@ def profile_spending_summary(
     current_user=Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
-    user_id = current_user.id
-
-    member_groups = (
-        db.query(Group.id, Group.name, Group.currency)
-        .join(GroupMember, GroupMember.group_id == Group.id)
-        .filter(GroupMember.user_id == user_id)
-        .all()
-    )
+    group_rows, currency_rows = spending_summary_rows(db, current_user.id)
 
-    if not member_groups:
+    if not group_rows:
         return ProfileSpendingSummaryResponse(
             overall_paid=0.0,
             overall_owed=0.0,
@@ -889,44 +1240,15 @@ def profile_spending_summary(
             groups=[],
         )
 
-    group_ids = [g.id for g in member_groups]
-
-    paid_rows = (
-        db.query(Expense.group_id, func.coalesce(func.sum(Expense.amount), 0).label("paid_cents"))
-        .filter(Expense.group_id.in_(group_ids))
-        .filter(Expense.paid_by_id == user_id)
-        .group_by(Expense.group_id)
-        .all()
-    )
-    paid_map = {row.group_id: int(row.paid_cents or 0) for row in paid_rows}
-
-    owed_rows = (
-        db.query(Expense.group_id, func.coalesce(func.sum(ExpenseSplit.amount), 0).label("owed_cents"))
-        .join(Expense, Expense.id == ExpenseSplit.expense_id)
-        .filter(Expense.group_id.in_(group_ids))
-        .filter(ExpenseSplit.user_id == user_id)
-        .group_by(Expense.group_id)
-        .all()
-    )
-    owed_map = {row.group_id: int(row.owed_cents or 0) for row in owed_rows}
-
     groups_payload: List[GroupSpendingSummary] = []
-    total_paid_cents = 0
-    total_owed_cents = 0
-
-    for g in member_groups:
-        paid_cents = paid_map.get(g.id, 0)
-        owed_cents = owed_map.get(g.id, 0)
-        total_paid_cents += paid_cents
-        total_owed_cents += owed_cents
-
-        paid = cents_to_dollars(paid_cents)
-        owed = cents_to_dollars(owed_cents)
+    for g in group_rows:
+        paid = cents_to_dollars(int(g.paid_cents))
+        owed = cents_to_dollars(int(g.owed_cents))
         net = paid - owed
         groups_payload.append(
             GroupSpendingSummary(
-                group_id=g.id,
-                group_name=g.name,
+                group_id=g.group_id,
+                group_name=g.group_name,
                 currency=g.currency,
                 paid=paid,
                 owed=owed,
@@ -937,13 +1259,29 @@ def profile_spending_summary(
             )
         )
 
+    currency_totals: List[CurrencySpendingTotal] = []
+    total_paid_cents = 0
+    total_owed_cents = 0
+    for c in currency_rows:
+        total_paid_cents += int(c.paid_cents)
+        total_owed_cents += int(c.owed_cents)
+        currency_totals.append(
+            CurrencySpendingTotal(
+                currency=c.currency or "",
+                paid=cents_to_dollars(int(c.paid_cents)),
+                owed=cents_to_dollars(int(c.owed_cents)),
+                net=cents_to_dollars(int(c.paid_cents) - int(c.owed_cents)),
+            )
+        )
+    currency_totals.sort(key=lambda t: t.currency)
+
     overall_paid = cents_to_dollars(total_paid_cents)
     overall_owed = cents_to_dollars(total_owed_cents)
     overall_net = overall_paid - overall_owed
 
     groups_payload.sort(key=lambda x: abs(x.net), reverse=True)
 
-    currency_set = sorted({g.currency for g in member_groups if g.currency})
+    currency_set = [t.currency for t in currency_totals if t.currency]
     currency_count = len(currency_set)
 
     if currency_count == 1:
@@ -966,35 +1304,42 @@ def profile_spending_summary(
         overall_net_display=overall_net_display,
         overall_currency=overall_currency,
         currencies=currency_set,
+        currency_totals=currency_totals,
         groups=groups_payload,
     )
 
 
 @app.get("/api/profile/spending-summary-text", response_model=ProfileSpendingSummaryTextResponse)
-def profile_spending_summary_text(
+async def profile_spending_summary_text(
     current_user=Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
-    
-    summary_obj = profile_spending_summary(current_user=current_user, db=db)
+    summary_obj = await run_in_threadpool(profile_spending_summary, current_user=current_user, db=db)
 
     facts = build_rephraser_facts(summary_obj)
 
     # Try rephraser first (optional)
-    rephrased = call_rephraser(facts, max_sentences=2)
+    rephrased = await call_rephraser(facts, max_sentences=2)
     if rephrased:
         summary_text, mode = rephrased
-        return ProfileSpendingSummaryTextResponse(summary=summary_text, mode="rephraser")
+        result = {"summary": summary_text, "mode": "rephraser"}
+    else:
+        # Fallback always works
+        result = {"summary": deterministic_fallback_summary(summary_obj), "mode": "fallback"}
 
-    # Fallback always works
-    fallback = deterministic_fallback_summary(summary_obj)
-    return ProfileSpendingSummaryTextResponse(summary=fallback, mode="fallback")
+    return ProfileSpendingSummaryTextResponse(**result)
 
 
 @app.get("/api/groups", response_model=List[GroupResponse])
-def list_groups(current_user=Depends(get_current_user), db: Session = Depends(get_db)):
-    groups = get_groups_for_user(db, current_user.id)
-    return [serialize_group(group) for group in groups]
+async def list_groups(current_user=Depends(get_current_user_for_read), db=Depends(get_read_db)):
+    versions = await run_read(db, get_group_versions_for_user, get_group_versions_for_user_async, current_user.id)
+    bodies = {group_id: read_model_cache.get(group_id, "group", version) for group_id, version in versions}
+    missing = [group_id for group_id, body in bodies.items() if body is None]
+    if missing:
+        groups = await run_read(db, get_groups_with_members, get_groups_with_members_async, missing)
+        for group in groups:
+            bodies[group.id] = read_model_body(group.id, "group", group.version, serialize_group(group), GroupResponse)
+    return json_body_response(b"[" + b",".join(bodies[group_id] for group_id, _ in versions if bodies[group_id]) + b"]")
 
 
 @app.post("/api/groups", response_model=GroupResponse, status_code=status.HTTP_201_CREATED)
@@ -1028,18 +1373,21 @@ def create_group_endpoint(
 @app.get("/api/groups/{group_id}/categories",response_model=List[CategoryResponse])
 def list_group_categories(
     group_id: int,
-    current_user=Depends(get_current_user),
+    request: Request,
+    response: Response,
+    current_user=Depends(require_group_member),
     db: Session = Depends(get_db)
 ):
-    group = get_group_with_members(db,group_id=group_id)
-    if not group:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,detail="Group not found")
-    
-    if not any(member.user_id == current_user.id for member in group.members):
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access Denied")
-    
-    categories = (db.query(GroupCategory).options(selectinload(GroupCategory.splits).selectinload(CategorySplit.user)).filter(GroupCategory.group_id==group_id).all())
-    return [serialize_category(category) for category in categories]
+    version = current_user.group_version
+    not_modified = group_not_modified(request, response, group_id, version)
+    if not_modified:
+        return not_modified
+    cached = read_model_cache.get(group_id, "categories", version)
+    if cached is not None:
+        return json_body_response(cached, response)
+    categories = list_categories_with_splits(db, group_id)
+    payload = [serialize_category(category) for category in categories]
+    return json_body_response(read_model_body(group_id, "categories", version, payload, List[CategoryResponse]), response)
 @app.delete("/api/groups/{group_id}/categories/{category_id}")
 def delete_category(
     group_id: int,
@@ -1056,14 +1404,13 @@ def delete_category(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Category not found.")
     if group.owner_id != current_user.id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="User is not the owner")
+    version = bump_group_version(db, group_id)
+    db.query(Subscription).filter(Subscription.category_id == category_id).update(
+        {Subscription.category_id: None}, synchronize_session=False
+    )
     db.delete(category)
     db.commit()
-    notify_group_members(
-        background_tasks,
-        group,
-        {"type": "categories_changed", "data": {"group_id": group_id}},
-        exclude_user_ids=[current_user.id],
-    )
+    publish_group_change(background_tasks, group, "categories_changed", version=version, op="deleted", category={"id": category_id})
 
 @app.post("/api/groups/{group_id}/categories",response_model=CategoryResponse,status_code=status.HTTP_201_CREATED)
 def create_group_category(
@@ -1089,6 +1436,7 @@ def create_group_category(
     if existing:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Category name already exists")
     
+    version = bump_group_version(db, group_id)
     category = GroupCategory(
         group_id=group_id,
         name=name,
@@ -1111,13 +1459,9 @@ def create_group_category(
         db.add(CategorySplit(category_id=category.id,user_id=user_id,share=split.share))
     db.commit()
     db.refresh(category)
-    notify_group_members(
-        background_tasks,
-        group,
-        {"type": "categories_changed", "data": {"group_id": group_id}},
-        exclude_user_ids=[current_user.id],
-    )
-    return serialize_category(category=category)
+    payload_data = serialize_category(category=category)
+    publish_group_change(background_tasks, group, "categories_changed", version=version, op="created", category=payload_data.dict())
+    return payload_data
 
 
 @app.put("/api/groups/{group_id}/categories/{category_id}",response_model=CategoryResponse)
@@ -1154,6 +1498,7 @@ def update_group_category(
     if existing:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Category name already exists")
 
+    version = bump_group_version(db, group_id)
     category.name = name
     category.description = payload.description or ""
     category.budget = payload.budget or 0
@@ -1173,13 +1518,9 @@ def update_group_category(
         db.rollback()
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Category name already exists")
     db.refresh(category)
-    notify_group_members(
-        background_tasks,
-        group,
-        {"type": "categories_changed", "data": {"group_id": group_id}},
-        exclude_user_ids=[current_user.id],
-    )
-    return serialize_category(category)
+    payload_data = serialize_category(category)
+    publish_group_change(background_tasks, group, "categories_changed", version=version, op="updated", category=payload_data.dict())
+    return payload_data
 
     
 
@@ -1212,36 +1553,36 @@ def update_group_endpoint(
         updated = True
 
     if updated:
+        version = bump_group_version(db, group_id)
         db.add(group)
         db.commit()
         db.refresh(group)
 
     group_payload = serialize_group(group)
     if updated:
-        notify_group_members(
-            background_tasks,
-            group,
-            {"type": "group_updated", "data": group_payload.dict()},
-            exclude_user_ids=[current_user.id],
-        )
+        publish_group_change(background_tasks, group, "group_updated", version=version, **group_payload.dict())
     return group_payload
 
 
 @app.get("/api/groups/{group_id}", response_model=GroupResponse)
-def get_group_endpoint(
+async def get_group_endpoint(
     group_id: int,
-    current_user=Depends(get_current_user),
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    current_user=Depends(require_group_member_for_read),
+    db=Depends(get_read_db),
 ):
-    group = get_group_with_members(db, group_id)
+    version = current_user.group_version
+    not_modified = group_not_modified(request, response, group_id, version)
+    if not_modified:
+        return not_modified
+    cached = read_model_cache.get(group_id, "group", version)
+    if cached is not None:
+        return json_body_response(cached, response)
+    group = await run_read(db, get_group_with_members, get_group_with_members_async, group_id)
     if not group:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Group not found")
-
-    member_ids = {member.user_id for member in group.members}
-    if current_user.id not in member_ids:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
-
-    return serialize_group(group)
+    return json_body_response(read_model_body(group_id, "group", version, serialize_group(group), GroupResponse), response)
 
 
 @app.post("/api/groups/{group_id}/leave", status_code=status.HTTP_204_NO_CONTENT)
@@ -1249,6 +1590,7 @@ def leave_group(
     group_id: int,
     current_user=Depends(get_current_user),
     db: Session = Depends(get_db),
+    background_tasks: BackgroundTasks = None,
 ):
     group = get_group_with_members(db, group_id)
     if not group:
@@ -1263,18 +1605,17 @@ def leave_group(
             detail="Group owners must delete the group instead of leaving",
         )
 
-    expenses = list_expenses_for_group(db, group_id)
-    records = list_settlements_for_group(db, group_id)
-    applied_records = [record for record in records if record.status in SETTLEMENT_APPLIED_STATUSES]
-    balances = calculate_member_balances(group, expenses, applied_records)
+    balances = load_member_balances(db, group)
     if balances.get(current_user.id, 0) != 0:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Settle all outstanding balances before leaving the group",
         )
 
+    version = bump_group_version(db, group_id)
     db.delete(membership)
     db.commit()
+    publish_group_change(background_tasks, group, "group_updated", version=version, **serialize_group(group).dict())
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
@@ -1290,26 +1631,31 @@ def delete_group_endpoint(
     if group.owner_id != current_user.id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only the owner can delete this group")
 
-    expenses = list_expenses_for_group(db, group_id)
-    records = list_settlements_for_group(db, group_id)
-    applied_records = [record for record in records if record.status in SETTLEMENT_APPLIED_STATUSES]
-    balances = calculate_member_balances(group, expenses, applied_records)
+    balances = load_member_balances(db, group)
     if any(amount != 0 for amount in balances.values()):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Settle all outstanding balances before deleting the group",
         )
 
-    for record in records:
-        db.delete(record)
-    for expense in expenses:
-        db.delete(expense)
+    db.query(Settlement).filter(Settlement.group_id == group_id).delete(synchronize_session=False)
+    expense_ids = db.query(Expense.id).filter(Expense.group_id == group_id).scalar_subquery()
+    db.query(ExpenseSplit).filter(ExpenseSplit.expense_id.in_(expense_ids)).delete(synchronize_session=False)
+    db.query(Expense).filter(Expense.group_id == group_id).delete(synchronize_session=False)
+    delete_group_balances(db, group_id)
+    subscription_ids = db.query(Subscription.id).filter(Subscription.group_id == group_id).scalar_subquery()
+    db.query(SubscriptionMember).filter(SubscriptionMember.subscription_id.in_(subscription_ids)).delete(synchronize_session=False)
+    db.query(Subscription).filter(Subscription.group_id == group_id).delete(synchronize_session=False)
+    category_ids = db.query(GroupCategory.id).filter(GroupCategory.group_id == group_id).scalar_subquery()
+    db.query(CategorySplit).filter(CategorySplit.category_id.in_(category_ids)).delete(synchronize_session=False)
+    db.query(GroupCategory).filter(GroupCategory.group_id == group_id).delete(synchronize_session=False)
     invites = db.query(GroupInvite).filter(GroupInvite.group_id == group_id).all()
     for invite in invites:
         db.delete(invite)
 
     db.delete(group)
     db.commit()
+    read_model_cache.invalidate_group(group_id)
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
@@ -1347,20 +1693,23 @@ def derive_splits_from_category(
         paid_by_id:int,
 )-> list[dict]:
     category = (db.query(GroupCategory).options(selectinload(GroupCategory.splits)).filter(GroupCategory.id == category_id, GroupCategory.group_id == group.id).first())
+    return splits_from_category(category, amount, paid_by_id)
+
 
+def splits_from_category(category: GroupCategory | None, amount: int, paid_by_id: int) -> list[dict]:
     if not category:
         raise HTTPException(
-            status_code=status.HTTP_404_BAD_REQUEST,
+            status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid Category",)
     
     if not category.splits:
         raise HTTPException(
-            status_code=status.HTTP_404_BAD_REQUEST,
+            status_code=status.HTTP_400_BAD_REQUEST,
             detail="Category has no split ratios",)
     total_shares = sum(cat_split.share for cat_split in category.splits)
     if total_shares <= 0:
         raise HTTPException(
-            status_code=status.HTTP_404_BAD_REQUEST,
+            status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid category split config",)
     
     splits = []
@@ -1378,20 +1727,202 @@ def derive_splits_from_category(
     return splits
 
 
-@app.get("/api/groups/{group_id}/expenses", response_model=List[ExpenseResponse])
-def get_group_expenses(
+EXPENSE_PAGE_DEFAULT_LIMIT = 50
+EXPENSE_PAGE_MAX_LIMIT = 200
+
+EXPENSE_IMPORT_BATCH_SIZE = int(os.getenv("EXPENSE_IMPORT_BATCH_SIZE", "2000"))
+EXPENSE_IMPORT_MAX_REPORTED_ERRORS = 1000
+
+
+def load_group_categories(db: Session, group_id: int) -> dict[int, GroupCategory]:
+    categories = (
+        db.query(GroupCategory)
+        .options(selectinload(GroupCategory.splits))
+        .filter(GroupCategory.group_id == group_id)
+        .all()
+    )
+    return {category.id: category for category in categories}
+
+
+def expense_item_for_import(group, payload: ExpenseCreateRequest, member_map: dict, categories: dict) -> dict:
+    """Applies create_group_expense's checks to one imported row, without touching the database."""
+    payer = member_map.get(payload.paid_by)
+    if not payer:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Payer must be in group")
+    if payload.category_id is not None and payload.category_id not in categories:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid Category")
+    amount_cents = dollars_to_cents(payload.amount)
+    if payload.split_mode == "category":
+        if payload.category_id is None:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Category Split requires a category")
+        split_items = splits_from_category(categories[payload.category_id], amount_cents, payer.id)
+    else:
+        _, split_items, _ = validate_expense_payload(group, payload)
+    user_ids = [split["user_id"] for split in split_items]
+    if len(set(user_ids)) != len(user_ids):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Each member can only appear once in splits")
+    return {
+        "description": payload.description.strip(),
+        "amount_cents": amount_cents,
+        "paid_by_id": payer.id,
+        "category_id": payload.category_id,
+        "splits": split_items,
+    }
+
+
+def import_expense_batch(
+    db: Session, group, batch, categories: dict
+) -> tuple[int, List[ExpenseImportRowError], int | None]:
+    """Inserts the batch's valid rows in one transaction; returns (imported, errors, new group version)."""
+    member_map = {member.user.username: member.user for member in group.members if member.user}
+    items = []
+    errors = []
+    for line, data in batch:
+        try:
+            if isinstance(data, RowError):
+                raise data
+            items.append(expense_item_for_import(group, ExpenseCreateRequest(**data), member_map, categories))
+        except RowError as exc:
+            errors.append(ExpenseImportRowError(line=line, error=str(exc)))
+        except ValidationError as exc:
+            first = exc.errors()[0]
+            field = ".".join(str(part) for part in first["loc"])
+            errors.append(ExpenseImportRowError(line=line, error=f"{field}: {first['msg']}"))
+        except HTTPException as exc:
+            errors.append(ExpenseImportRowError(line=line, error=str(exc.detail)))
+    if not items:
+        return 0, errors, None
+    # every committed batch changes what readers see, so each one carries its own version bump
+    version = bump_group_version(db, group.id)
+    return bulk_create_expenses(db, group_id=group.id, items=items), errors, version
+
+
+@app.post("/api/groups/{group_id}/expenses/import", response_model=ExpenseImportResponse)
+async def import_group_expenses(
     group_id: int,
+    request: Request,
+    format: str | None = None,
     current_user=Depends(get_current_user),
     db: Session = Depends(get_db),
+    background_tasks: BackgroundTasks = None,
 ):
-    group = get_group_with_members(db, group_id)
+    """
+    Streams a CSV (text/csv) or JSON lines (application/x-ndjson) body, or ?format=csv|jsonl.
+    Valid rows are inserted EXPENSE_IMPORT_BATCH_SIZE at a time, one transaction per batch;
+    invalid rows are skipped and reported by line number.
+    """
+    fmt = detect_format(request.headers.get("content-type"), format)
+    if not fmt:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Send text/csv or application/x-ndjson, or pass format=csv|jsonl",
+        )
+    group = await run_in_threadpool(get_group_with_members, db, group_id)
     if not group:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Group not found")
     if not any(member.user_id == current_user.id for member in group.members):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
+    categories = await run_in_threadpool(load_group_categories, db, group_id)
+
+    imported = 0
+    failed = 0
+    version = None
+    errors: List[ExpenseImportRowError] = []
+    try:
+        async for batch in iter_row_batches(request.stream(), fmt, EXPENSE_IMPORT_BATCH_SIZE):
+            batch_imported, batch_errors, batch_version = await run_in_threadpool(
+                import_expense_batch, db, group, batch, categories
+            )
+            version = batch_version or version
+            imported += batch_imported
+            failed += len(batch_errors)
+            errors.extend(batch_errors[: max(0, EXPENSE_IMPORT_MAX_REPORTED_ERRORS - len(errors))])
+    except RowError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+    # batches commit as they go, so an import that fails part way leaves rows behind without an
+    # event; the next event for the group shows clients the version gap and they resync
+    if imported:
+        # too many rows for a delta: clients refetch
+        publish_group_change(
+            background_tasks, group, "expenses_changed", version=version, op="imported", count=imported
+        )
+    return ExpenseImportResponse(
+        imported=imported,
+        failed=failed,
+        errors=errors,
+        errors_truncated=failed > len(errors),
+    )
+
+
+@app.get(
+    "/api/groups/{group_id}/expenses",
+    response_model=ExpensePageResponse | List[ExpenseResponse],
+    response_class=FastJSONResponse,
+)
+async def get_group_expenses(
+    group_id: int,
+    request: Request,
+    response: Response,
+    limit: int = EXPENSE_PAGE_DEFAULT_LIMIT,
+    cursor: str | None = None,
+    category_id: int | None = None,
+    paid_by: str | None = None,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+    include_all: bool = Query(False, alias="all"),
+    current_user=Depends(require_group_member_for_read),
+    db=Depends(get_read_db),
+):
+    version = current_user.group_version
+    not_modified = group_not_modified(request, response, group_id, version)
+    if not_modified:
+        return not_modified
+    # every filter and the cursor are part of the key, so each page is cached separately
+    resource = "expenses:all" if include_all else "expenses?" + "&".join(
+        f"{key}={value}" for key, value in sorted(request.query_params.multi_items())
+    )
+    cached = read_model_cache.get(group_id, resource, version)
+    if cached is not None:
+        return json_body_response(cached, response)
+
+    # Legacy unpaginated list, still used by the current frontend.
+    if include_all:
+        expense_rows, split_rows = await run_read(
+            db, list_expense_rows_for_group, list_expense_rows_for_group_async, group_id
+        )
+        payload = expense_dicts_from_rows(expense_rows, split_rows)
+        return json_body_response(read_model_body(group_id, resource, version, payload), response)
 
-    expenses = list_expenses_for_group(db, group_id)
-    return [serialize_expense(exp) for exp in expenses]
+    if limit < 1 or limit > EXPENSE_PAGE_MAX_LIMIT:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Limit must be between 1 and {EXPENSE_PAGE_MAX_LIMIT}",
+        )
+
+    paid_by_id = None
+    if paid_by is not None:
+        payer = await run_read(db, get_user_by_username, get_user_by_username_async, paid_by)
+        if not payer or not await run_read(db, is_user_in_group, is_user_in_group_async, group_id, payer.id):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Payer must be in group")
+        paid_by_id = payer.id
+
+    expenses, next_key = await run_read(
+        db,
+        list_expenses_page,
+        list_expenses_page_async,
+        group_id,
+        limit=limit,
+        after=decode_expense_cursor(cursor) if cursor else None,
+        category_id=category_id,
+        paid_by_id=paid_by_id,
+        created_from=created_from,
+        created_to=created_to,
+    )
+    payload = {
+        "items": [expense_dict(exp) for exp in expenses],
+        "next_cursor": encode_expense_cursor(next_key) if next_key else None,
+    }
+    return json_body_response(read_model_body(group_id, resource, version, payload), response)
 
 
 @app.post("/api/groups/{group_id}/expenses", response_model=ExpenseResponse, status_code=status.HTTP_201_CREATED)
@@ -1421,6 +1952,8 @@ def create_group_expense(
         split_items = derive_splits_from_category(db=db,group=group,category_id=payload.category_id,amount=amount_cents,paid_by_id=payer.id)
     else:
         _, split_items,_ = validate_expense_payload(group,payload)
+    usernames = split_usernames(db, group, split_items)
+    version = bump_group_version(db, group_id)
     expense = create_expense(
         db,
         group_id=group_id,
@@ -1430,15 +1963,9 @@ def create_group_expense(
         category_id=payload.category_id,
         splits=split_items,
     )
-    expenses = list_expenses_for_group(db, group_id)
-    expense_with_relations = next((e for e in expenses if e.id == expense.id), expense)
-    notify_group_members(
-        background_tasks,
-        group,
-        {"type": "expenses_changed", "data": {"group_id": group_id}},
-        exclude_user_ids=[current_user.id],
-    )
-    return serialize_expense(expense_with_relations)
+    payload_data = serialize_written_expense(expense, usernames, split_items)
+    publish_expense_change(db, background_tasks, group, version, "created", payload_data.dict())
+    return payload_data
 
 
 @app.put("/api/groups/{group_id}/expenses/{expense_id}", response_model=ExpenseResponse)
@@ -1460,6 +1987,7 @@ def update_group_expense(
     if not expense or expense.group_id != group_id:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Expense not found")
 
+    member_map = {m.user.username: m.user for m in group.members if m.user}
     payer = member_map.get(payload.paid_by)
     if not payer:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,detail="Payer must be in group")
@@ -1470,7 +1998,9 @@ def update_group_expense(
         split_items = derive_splits_from_category(db=db, group=group,category_id=payload.category_id,amount=amount_cents,paid_by_id=payer.id)
     else:
         _, split_items, _ = validate_expense_payload(group=group, payload=payload)
-    update_expense(
+    usernames = split_usernames(db, group, split_items)
+    version = bump_group_version(db, group_id)
+    updated = update_expense(
         db,
         expense,
         description=payload.description.strip(),
@@ -1479,14 +2009,9 @@ def update_group_expense(
         category_id= payload.category_id,
         splits=split_items,
     )
-    updated = get_expense(db, expense_id) or expense
-    notify_group_members(
-        background_tasks,
-        group,
-        {"type": "expenses_changed", "data": {"group_id": group_id}},
-        exclude_user_ids=[current_user.id],
-    )
-    return serialize_expense(updated)
+    payload_data = serialize_written_expense(updated, usernames, split_items)
+    publish_expense_change(db, background_tasks, group, version, "updated", payload_data.dict())
+    return payload_data
 
 
 @app.delete("/api/groups/{group_id}/expenses/{expense_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -1507,37 +2032,51 @@ def delete_group_expense(
     if not expense or expense.group_id != group_id:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Expense not found")
 
+    version = bump_group_version(db, group_id)
     delete_expense(db, expense)
-    notify_group_members(
-        background_tasks,
-        group,
-        {"type": "expenses_changed", "data": {"group_id": group_id}},
-        exclude_user_ids=[current_user.id],
-    )
+    publish_expense_change(db, background_tasks, group, version, "deleted", {"id": expense_id})
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
-@app.get("/api/groups/{group_id}/settlements", response_model=SettlementSummaryResponse)
-def get_group_settlements(
+@app.get("/api/groups/{group_id}/settlements", response_model=SettlementSummaryResponse, response_class=FastJSONResponse)
+async def get_group_settlements(
     group_id: int,
-    current_user=Depends(get_current_user),
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    strategy: str = "greedy",
+    current_user=Depends(require_group_member_for_read),
+    db=Depends(get_read_db),
 ):
-    group = get_group_with_members(db, group_id)
+    if strategy not in SETTLEMENT_STRATEGIES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Strategy must be one of: {', '.join(SETTLEMENT_STRATEGIES)}",
+        )
+    version = current_user.group_version
+    not_modified = group_not_modified(request, response, group_id, version)
+    if not_modified:
+        return not_modified
+    resource = f"settlements:{strategy}"
+    cached = read_model_cache.get(group_id, resource, version)
+    if cached is not None:
+        return json_body_response(cached, response)
+    # recommendations are labelled with member usernames
+    group = await run_read(db, get_group_with_members, get_group_with_members_async, group_id)
     if not group:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Group not found")
-    if not any(member.user_id == current_user.id for member in group.members):
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
 
-    expenses = list_expenses_for_group(db, group_id)
-    records = list_settlements_for_group(db, group_id)
-    # Treat payer-confirmed settlements as affecting balances so recommendations shrink immediately.
-    applied_records = [record for record in records if record.status in SETTLEMENT_APPLIED_STATUSES]
-    recommendations = calculate_settlements(group, expenses, applied_records)
-    return SettlementSummaryResponse(
-        recommendations=recommendations,
-        records=[serialize_settlement_record(record) for record in records],
+    records = await run_read(db, list_settlement_rows_for_group, list_settlement_rows_for_group_async, group_id)
+    # The ledger already counts payer-confirmed settlements so recommendations shrink immediately.
+    ledger = await run_read(db, get_group_balances, get_group_balances_async, group_id)
+    # the optimal solver is CPU-bound for up to SETTLEMENT_TIME_BUDGET_MS: keep it off the event loop
+    recommendations = await run_in_threadpool(
+        settlements_from_balances, group, member_balances_from_ledger(group, ledger), strategy
     )
+    payload = {
+        "recommendations": [item.dict() for item in recommendations],
+        "records": settlement_record_dicts_from_rows(records),
+    }
+    return json_body_response(read_model_body(group_id, resource, version, payload), response)
 
 
 @app.post("/api/groups/{group_id}/settlements", response_model=SettlementRecordResponse, status_code=status.HTTP_201_CREATED)
@@ -1564,6 +2103,7 @@ def record_settlement_payment(
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Receiver cannot be the same as payer")
 
     amount_cents = dollars_to_cents(payload.amount)
+    version = bump_group_version(db, group_id)
     settlement = create_settlement_record(
         db,
         group_id=group_id,
@@ -1571,8 +2111,9 @@ def record_settlement_payment(
         receiver_id=receiver.id,
         amount_cents=amount_cents,
     )
-    notify_settlement_update(background_tasks, group_id, [current_user.id, receiver.id])
-    return serialize_settlement_record(settlement)
+    payload_data = serialize_settlement_record(settlement)
+    publish_settlement_change(db, background_tasks, group, version, "created", payload_data)
+    return payload_data
 
 
 @app.post("/api/groups/{group_id}/settlements/{settlement_id}/confirm", response_model=SettlementRecordResponse)
@@ -1597,20 +2138,135 @@ def confirm_settlement_payment(
     if settlement.status == "complete":
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Settlement already confirmed")
 
+    version = bump_group_version(db, group_id)
     updated = confirm_settlement(db, settlement)
-    notify_settlement_update(background_tasks, group_id, [settlement.payer_id, settlement.receiver_id])
-    return serialize_settlement_record(updated)
+    payload_data = serialize_settlement_record(updated)
+    publish_settlement_change(db, background_tasks, group, version, "confirmed", payload_data)
+    return payload_data
 
 
-@app.get("/api/groups/{group_id}/subscriptions", response_model=List[SubscriptionResponse])
-def list_group_subscriptions(group_id: int, current_user=Depends(get_current_user), db: Session = Depends(get_db)):
-    group = get_group_with_members(db, group_id)
+@app.get("/api/groups/{group_id}/subscriptions", response_model=List[SubscriptionResponse], response_class=FastJSONResponse)
+async def list_group_subscriptions(
+    group_id: int,
+    request: Request,
+    response: Response,
+    current_user=Depends(require_group_member_for_read),
+    db=Depends(get_read_db),
+):
+    version = current_user.group_version
+    # due_in_days moves with the calendar, so the tag does too
+    today = date.today()
+    not_modified = group_not_modified(request, response, group_id, version, today.isoformat())
+    if not_modified:
+        return not_modified
+    resource = f"subscriptions:{today.isoformat()}"
+    cached = read_model_cache.get(group_id, resource, version)
+    if cached is not None:
+        return json_body_response(cached, response)
+    subs = await run_read(db, list_subscriptions_for_group, list_subscriptions_for_group_async, group_id)
+    payload = [subscription_dict(s, today) for s in subs]
+    return json_body_response(read_model_body(group_id, resource, version, payload), response)
+
+
+def load_dashboard_parts(db: Session, group_id: int, *, limit: int, include_all: bool) -> tuple:
+    """Every read behind the dashboard on one session, so the sync path takes a single threadpool hop."""
+    if include_all:
+        expenses = list_expense_rows_for_group(db, group_id)
+    else:
+        expenses = list_expenses_page(db, group_id, limit=limit)
+    return (
+        expenses,
+        list_categories_with_splits(db, group_id),
+        list_settlement_rows_for_group(db, group_id),
+        get_group_balances(db, group_id),
+        list_subscriptions_for_group(db, group_id),
+    )
+
+
+async def _read_in_own_session(async_fn, *args, **kwargs):
+    async with AsyncSessionLocal() as session:
+        return await async_fn(session, *args, **kwargs)
+
+
+async def load_dashboard_parts_async(group_id: int, *, limit: int, include_all: bool) -> tuple:
+    """
+    The reads of load_dashboard_parts run concurrently, each on its own AsyncSession (one session
+    cannot run two statements at once). Costs up to five pooled connections per request.
+    """
+    if include_all:
+        expenses = _read_in_own_session(list_expense_rows_for_group_async, group_id)
+    else:
+        expenses = _read_in_own_session(list_expenses_page_async, group_id, limit=limit)
+    return tuple(await asyncio.gather(
+        expenses,
+        _read_in_own_session(list_categories_with_splits_async, group_id),
+        _read_in_own_session(list_settlement_rows_for_group_async, group_id),
+        _read_in_own_session(get_group_balances_async, group_id),
+        _read_in_own_session(list_subscriptions_for_group_async, group_id),
+    ))
+
+
+@app.get("/api/groups/{group_id}/dashboard", response_model=GroupDashboardResponse, response_class=FastJSONResponse)
+async def get_group_dashboard(
+    group_id: int,
+    request: Request,
+    response: Response,
+    limit: int = EXPENSE_PAGE_DEFAULT_LIMIT,
+    include_all: bool = Query(False, alias="all"),
+    current_user=Depends(require_group_member_for_read),
+    db=Depends(get_read_db),
+):
+    """
+    Everything the group page shows in one round trip: the group, the first page of expenses
+    (or all of them with ?all=true), categories, settlements and subscriptions, checking
+    membership once.
+    """
+    if not include_all and (limit < 1 or limit > EXPENSE_PAGE_MAX_LIMIT):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Limit must be between 1 and {EXPENSE_PAGE_MAX_LIMIT}",
+        )
+    version = current_user.group_version
+    # subscriptions' due_in_days moves with the calendar
+    today = date.today()
+    not_modified = group_not_modified(request, response, group_id, version, today.isoformat())
+    if not_modified:
+        return not_modified
+    resource = f"dashboard:{today.isoformat()}:" + ("all" if include_all else str(limit))
+    cached = read_model_cache.get(group_id, resource, version)
+    if cached is not None:
+        return json_body_response(cached, response)
+    group = await run_read(db, get_group_with_members, get_group_with_members_async, group_id)
     if not group:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Group not found")
-    if not any(m.user_id == current_user.id for m in group.members):
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
-    subs = list_subscriptions_for_group(db, group_id)
-    return [serialize_subscription(s) for s in subs]
+
+    if isinstance(db, AsyncSession):
+        parts = await load_dashboard_parts_async(group_id, limit=limit, include_all=include_all)
+    else:
+        parts = await run_in_threadpool(load_dashboard_parts, db, group_id, limit=limit, include_all=include_all)
+    expenses, categories, settlement_rows, ledger, subs = parts
+
+    if include_all:
+        expense_payload = expense_dicts_from_rows(*expenses)
+    else:
+        page, next_key = expenses
+        expense_payload = {
+            "items": [expense_dict(exp) for exp in page],
+            "next_cursor": encode_expense_cursor(next_key) if next_key else None,
+        }
+    recommendations = settlements_from_balances(group, member_balances_from_ledger(group, ledger))
+    payload = {
+        "version": version,
+        "group": serialize_group(group).dict(),
+        "expenses": expense_payload,
+        "categories": [serialize_category(category).dict() for category in categories],
+        "settlements": {
+            "recommendations": [item.dict() for item in recommendations],
+            "records": settlement_record_dicts_from_rows(settlement_rows),
+        },
+        "subscriptions": [subscription_dict(sub, today) for sub in subs],
+    }
+    return json_body_response(read_model_body(group_id, resource, version, payload), response)
 
 @app.post("/api/groups/{group_id}/subscriptions", response_model=SubscriptionResponse, status_code=status.HTTP_201_CREATED)
 def create_group_subscription(
@@ -1639,6 +2295,7 @@ def create_group_subscription(
 
     member_shares = _build_member_shares(group, payload.members)
     amount_cents = dollars_to_cents(payload.amount)
+    version = bump_group_version(db, group_id)
     try:
         sub = persist_subscription(
             db,
@@ -1655,8 +2312,9 @@ def create_group_subscription(
     except IntegrityError:
         db.rollback()
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Subscription name already exists")
-    notify_group_members(background_tasks, group, {"type": "subscriptions_changed", "data": {"group_id": group_id}}, exclude_user_ids=[current_user.id])
-    return serialize_subscription(sub)
+    payload_data = serialize_subscription(sub)
+    publish_group_change(background_tasks, group, "subscriptions_changed", version=version, op="created", subscription=payload_data.dict())
+    return payload_data
 
 @app.put("/api/groups/{group_id}/subscriptions/{sub_id}", response_model=SubscriptionResponse)
 def update_group_subscription(
@@ -1694,6 +2352,7 @@ def update_group_subscription(
 
     member_shares = _build_member_shares(group, payload.members)
     amount_cents = dollars_to_cents(payload.amount)
+    version = bump_group_version(db, group_id)
     try:
         updated = persist_subscription_update(
             db,
@@ -1709,8 +2368,9 @@ def update_group_subscription(
     except IntegrityError:
         db.rollback()
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Subscription name already exists")
-    notify_group_members(background_tasks, group, {"type": "subscriptions_changed", "data": {"group_id": group_id}}, exclude_user_ids=[current_user.id])
-    return serialize_subscription(updated)
+    payload_data = serialize_subscription(updated)
+    publish_group_change(background_tasks, group, "subscriptions_changed", version=version, op="updated", subscription=payload_data.dict())
+    return payload_data
 
 @app.delete("/api/groups/{group_id}/subscriptions/{sub_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_group_subscription(
@@ -1730,8 +2390,9 @@ def delete_group_subscription(
     if not sub or sub.group_id != group_id:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Subscription not found")
 
+    version = bump_group_version(db, group_id)
     persist_subscription_delete(db, sub)
-    notify_group_members(background_tasks, group, {"type": "subscriptions_changed", "data": {"group_id": group_id}}, exclude_user_ids=[current_user.id])
+    publish_group_change(background_tasks, group, "subscriptions_changed", version=version, op="deleted", subscription={"id": sub_id})
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 @app.post("/api/groups/{group_id}/subscriptions/{sub_id}/pay", response_model=ExpenseResponse, status_code=status.HTTP_201_CREATED)
@@ -1754,6 +2415,14 @@ def pay_subscription(
 
     payer = current_user
     splits = _subscription_splits_from_shares(sub, payer.id)
+    usernames = split_usernames(db, group, splits)
+    usernames[payer.id] = payer.username
+    # two events, so two versions; both commit with the expense and the new due date
+    subscription_version = bump_group_version(db, group_id)
+    expense_version = bump_group_version(db, group_id)
+    delta_days = CADENCE_DAY_DELTAS.get(sub.cadence, 30)
+    sub.next_due_date = (sub.next_due_date or date.today()) + timedelta(days=delta_days)
+    db.add(sub)
     expense = create_expense(
         db,
         group_id=group_id,
@@ -1763,16 +2432,14 @@ def pay_subscription(
         category_id=sub.category_id,
         splits=splits,
     )
+    response = serialize_written_expense(expense, usernames, splits)
 
-    delta_days = CADENCE_DAY_DELTAS.get(sub.cadence, 30)
-    sub.next_due_date = (sub.next_due_date or date.today()) + timedelta(days=delta_days)
-    db.add(sub)
-    db.commit()
-    updated_expense = get_expense(db, expense.id) or expense
-
-    notify_group_members(background_tasks, group, {"type": "subscriptions_changed", "data": {"group_id": group_id}}, exclude_user_ids=[current_user.id])
-    notify_group_members(background_tasks, group, {"type": "expenses_changed", "data": {"group_id": group_id}}, exclude_user_ids=[current_user.id])
-    return serialize_expense(updated_expense)
+    publish_group_change(
+        background_tasks, group, "subscriptions_changed",
+        version=subscription_version, op="updated", subscription=serialize_subscription(sub).dict(),
+    )
+    publish_expense_change(db, background_tasks, group, expense_version, "created", response.dict())
+    return response
 
 
 @app.post("/api/groups/{group_id}/invite", response_model=InviteResponse, status_code=status.HTTP_201_CREATED)
@@ -1807,8 +2474,7 @@ def invite_user_to_group(
     invite = create_group_invite(db, group_id=group.id, inviter_id=current_user.id, invitee_id=invitee.id)
     invite = get_invite_by_id(db, invite.id) or invite
     payload_data = serialize_invite(invite)
-    if background_tasks is not None:
-        background_tasks.add_task(manager.send, invitee.id, {"type": "invite", "data": payload_data.dict()})
+    notify_users(background_tasks, [invitee.id], {"type": "invite", "data": payload_data.dict()})
     return payload_data
 
 
@@ -1823,6 +2489,7 @@ def accept_group_invite(
     invite_id: int,
     current_user=Depends(get_current_user),
     db: Session = Depends(get_db),
+    background_tasks: BackgroundTasks = None,
 ):
     invite = get_invite_by_id(db, invite_id)
     if not invite or invite.invitee_id != current_user.id:
@@ -1836,6 +2503,7 @@ def accept_group_invite(
 
     membership_exists = is_user_in_group(db, invite.group_id, current_user.id)
     if not membership_exists:
+        version = bump_group_version(db, invite.group_id)
         db.add(GroupMember(group_id=invite.group_id, user_id=current_user.id))
 
     db.query(GroupInvite).filter(
@@ -1851,7 +2519,10 @@ def accept_group_invite(
     db.refresh(invite)
 
     group = get_group_with_members(db, invite.group_id)
-    return serialize_group(group)
+    payload_data = serialize_group(group)
+    if not membership_exists:
+        publish_group_change(background_tasks, group, "group_updated", version=version, **payload_data.dict())
+    return payload_data
 
 
 @app.get("/api/users/{username}")
@@ -1870,21 +2541,19 @@ async def notifications_socket(websocket: WebSocket):
         await websocket.close(code=4401)
         return
 
-    db = SessionLocal()
-    try:
-        user = get_user_by_username(db, username)
-        if not user:
-            await websocket.close(code=4401)
-            return
+    # The session is closed before the socket is accepted; a long-lived socket holds no connection.
+    user = await run_in_threadpool(socket_user, username)
+    if not user:
+        await websocket.close(code=4401)
+        return
 
-        await manager.connect(user.id, websocket)
-        try:
-            while True:
-                await websocket.receive_text()
-        except WebSocketDisconnect:
-            manager.disconnect(user.id, websocket)
-    finally:
-        db.close()
+    connection = await manager.connect(user.id, websocket)
+    if connection is None:
+        return
+    try:
+        await manager.serve(connection)
+    except WebSocketDisconnect:
+        pass
 
 
 if os.path.isfile(FRONTEND_INDEX):
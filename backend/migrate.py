@@ -0,0 +1,73 @@
+"""
+One-shot schema migration: brings DATABASE_URL up to the latest Alembic revision.
+
+    python -m backend.migrate                 # upgrade to head (creates a fresh database)
+    python -m backend.migrate --check         # exit 1 unless the database is already at head
+
+Run it as a deploy step before the new code serves (the image build migrates the bundled SQLite
+database, cloudbuild.yaml runs it as a job against DATABASE_URL); the app itself only checks the
+revision at startup. A database created by create_all before migrations existed is stamped as
+0001, the schema it was built with, and then upgraded in place.
+"""
+import argparse
+import os
+import sys
+from alembic import command
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+from sqlalchemy import inspect
+from backend.db import SCHEMA_REVISION, current_schema_revision, engine
+
+ALEMBIC_INI = os.path.join(os.path.dirname(__file__), "alembic.ini")
+# the revision matching the schema create_all built before migrations existed
+PRE_MIGRATION_REVISION = "0001"
+
+
+def alembic_config(connection=None) -> Config:
+    config = Config(ALEMBIC_INI)
+    if connection is not None:
+        config.attributes["connection"] = connection
+    return config
+
+
+def head_revision() -> str:
+    return ScriptDirectory.from_config(alembic_config()).get_current_head()
+
+
+def _adopt_pre_migration_schema(connection, config: Config) -> bool:
+    """Stamps an unversioned create_all database as 0001, the schema it was built with."""
+    tables = set(inspect(connection).get_table_names())
+    if "alembic_version" in tables or "users" not in tables:
+        return False
+    command.stamp(config, PRE_MIGRATION_REVISION)
+    return True
+
+
+def upgrade_database(bind=engine) -> str:
+    """Upgrades bind to the head revision in one transaction and returns that revision."""
+    with bind.begin() as connection:
+        config = alembic_config(connection)
+        if _adopt_pre_migration_schema(connection, config):
+            print(f"stamped existing schema as {PRE_MIGRATION_REVISION}")
+        command.upgrade(config, "head")
+    return current_schema_revision(bind)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--check", action="store_true", help="only report whether the database is at head")
+    args = parser.parse_args(argv)
+
+    if args.check:
+        revision = current_schema_revision(engine)
+        print(f"database at {revision or 'no revision'}, head is {SCHEMA_REVISION}")
+        return 0 if revision == SCHEMA_REVISION else 1
+
+    before = current_schema_revision(engine)
+    after = upgrade_database(engine)
+    print(f"database at {after}" + (f" (was {before or 'unversioned'})" if before != after else ", nothing to do"))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
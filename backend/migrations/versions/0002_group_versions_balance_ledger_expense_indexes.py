@@ -0,0 +1,58 @@
+"""group versions, balance ledger and expense indexes
+
+What the models gained on top of the pre-migration schema: groups.version (bumped with every
+write, behind ETags and notification ordering), the group_member_balances ledger (left empty
+here; 0004 fills it from history) and the expense indexes behind keyset paging
+(ix_expenses_group_created_id) and the spending summary aggregates (ix_expenses_payer_group,
+ix_expense_splits_user_expense).
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 20:29:47.203118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, Sequence[str], None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('groups', sa.Column('version', sa.Integer(), server_default='0', nullable=False))
+
+    op.create_table('group_member_balances',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('group_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('balance', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['group_id'], ['groups.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('group_id', 'user_id', name='uq_group_member_balance')
+    )
+    op.create_index('ix_group_member_balances_group_id', 'group_member_balances', ['group_id'], unique=False)
+
+    op.create_index('ix_expenses_group_created_id', 'expenses', ['group_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_expenses_payer_group', 'expenses', ['paid_by_id', 'group_id', 'amount'], unique=False)
+    op.create_index('ix_expense_splits_user_expense', 'expense_splits', ['user_id', 'expense_id', 'amount'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_expense_splits_user_expense', table_name='expense_splits')
+    op.drop_index('ix_expenses_payer_group', table_name='expenses')
+    op.drop_index('ix_expenses_group_created_id', table_name='expenses')
+
+    op.drop_index('ix_group_member_balances_group_id', table_name='group_member_balances')
+    op.drop_table('group_member_balances')
+
+    with op.batch_alter_table('groups') as batch_op:
+        batch_op.drop_column('version')
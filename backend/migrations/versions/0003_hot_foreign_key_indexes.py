@@ -0,0 +1,40 @@
+"""hot foreign key indexes
+
+Composite indexes for the lookups python -m backend.query_plan_audit found scanning whole tables:
+groups-of-a-user (group_members.user_id), pending invites of a user (group_invites.invitee_id,
+status) and a group's settlements newest first (settlements.group_id, created_at, id).
+expenses.group_id/paid_by_id and expense_splits.expense_id/user_id are already the leading
+columns of ix_expenses_group_created_id, ix_expenses_payer_group, uq_expense_split_user and
+ix_expense_splits_user_expense, so they get nothing new.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 20:30:53.544295
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, Sequence[str], None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_group_members_user_group', 'group_members', ['user_id', 'group_id'], unique=False)
+    op.create_index('ix_group_invites_invitee_status', 'group_invites', ['invitee_id', 'status'], unique=False)
+    op.create_index(
+        'ix_settlements_group_created_id', 'settlements', ['group_id', 'created_at', 'id'], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_settlements_group_created_id', table_name='settlements')
+    op.drop_index('ix_group_invites_invitee_status', table_name='group_invites')
+    op.drop_index('ix_group_members_user_group', table_name='group_members')
@@ -0,0 +1,51 @@
+"""backfill group member balances
+
+Rebuilds the group_member_balances ledger from expense, split and settlement history, so groups
+created before the ledger existed (whose rows were never written) read their real balances
+without a manual `python -m backend.rebuild_balances --fix`. Every group's version is bumped so
+cached reads and ETags taken before the backfill are not served again.
+
+The applied settlement statuses are frozen here rather than imported from backend.crud.balances.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 09:12:40.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, Sequence[str], None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+APPLIED_SETTLEMENT = "status IN ('payer_confirmed', 'complete')"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("DELETE FROM group_member_balances")
+    op.execute(f"""
+        INSERT INTO group_member_balances (group_id, user_id, balance)
+        SELECT group_id, user_id, SUM(delta) FROM (
+            SELECT group_id, paid_by_id AS user_id, amount AS delta FROM expenses
+            UNION ALL
+            SELECT expenses.group_id, expense_splits.user_id, -expense_splits.amount
+            FROM expense_splits JOIN expenses ON expenses.id = expense_splits.expense_id
+            UNION ALL
+            SELECT group_id, payer_id, amount FROM settlements WHERE {APPLIED_SETTLEMENT}
+            UNION ALL
+            SELECT group_id, receiver_id, -amount FROM settlements WHERE {APPLIED_SETTLEMENT}
+        ) AS deltas
+        GROUP BY group_id, user_id
+    """)
+    op.execute("UPDATE groups SET version = version + 1")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # data only: the ledger rows stay valid under 0003
@@ -1,6 +1,6 @@
 from datetime import datetime, date
 from typing import List, TYPE_CHECKING
-from sqlalchemy import String, ForeignKey, UniqueConstraint, DateTime, func, Integer, Date
+from sqlalchemy import String, ForeignKey, UniqueConstraint, Index, DateTime, func, Integer, Date
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from backend.db import Base
 
@@ -15,6 +15,8 @@ class Group(Base):
     name: Mapped[str] = mapped_column(String(100))
     owner_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
     currency: Mapped[str] = mapped_column(String(10), default="GBP")
+    # bumped on every change to the group's data; sent with each notification
+    version: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
 
     members: Mapped[List["GroupMember"]] = relationship(
         "GroupMember", back_populates="group", cascade="all, delete-orphan"
@@ -23,7 +25,11 @@ class Group(Base):
 
 class GroupMember(Base):
     __tablename__ = "group_members"
-    __table_args__ = (UniqueConstraint("group_id", "user_id", name="uq_group_members"),)
+    __table_args__ = (
+        UniqueConstraint("group_id", "user_id", name="uq_group_members"),
+        # "which groups is this user in": group lists, membership checks, the spending summary
+        Index("ix_group_members_user_group", "user_id", "group_id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     group_id: Mapped[int] = mapped_column(ForeignKey("groups.id"))
@@ -62,6 +68,10 @@ class CategorySplit(Base):
 
 class Expense(Base):
     __tablename__ = "expenses"
+    __table_args__ = (
+        Index("ix_expenses_group_created_id", "group_id", "created_at", "id"),
+        Index("ix_expenses_payer_group", "paid_by_id", "group_id", "amount"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     group_id: Mapped[int] = mapped_column(ForeignKey("groups.id"))
@@ -82,7 +92,10 @@ class Expense(Base):
 
 class ExpenseSplit(Base):
     __tablename__ = "expense_splits"
-    __table_args__ = (UniqueConstraint("expense_id", "user_id", name="uq_expense_split_user"),)
+    __table_args__ = (
+        UniqueConstraint("expense_id", "user_id", name="uq_expense_split_user"),
+        Index("ix_expense_splits_user_expense", "user_id", "expense_id", "amount"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     expense_id: Mapped[int] = mapped_column(ForeignKey("expenses.id"))
@@ -93,9 +106,22 @@ class ExpenseSplit(Base):
     user: Mapped["User"] = relationship("User")
 
 
+class GroupMemberBalance(Base):
+    __tablename__ = "group_member_balances"
+    __table_args__ = (UniqueConstraint("group_id", "user_id", name="uq_group_member_balance"),)
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    group_id: Mapped[int] = mapped_column(ForeignKey("groups.id"), index=True)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
+    balance: Mapped[int] = mapped_column(Integer, default=0)  # cents, positive means owed money
+
+
 class GroupInvite(Base):
     __tablename__ = "group_invites"
-    __table_args__ = (UniqueConstraint("group_id", "invitee_id", "status", name="uq_group_invite_pending"),)
+    __table_args__ = (
+        UniqueConstraint("group_id", "invitee_id", "status", name="uq_group_invite_pending"),
+        Index("ix_group_invites_invitee_status", "invitee_id", "status"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     group_id: Mapped[int] = mapped_column(ForeignKey("groups.id"))
@@ -111,6 +137,7 @@ class GroupInvite(Base):
 
 class Settlement(Base):
     __tablename__ = "settlements"
+    __table_args__ = (Index("ix_settlements_group_created_id", "group_id", "created_at", "id"),)
 
     id: Mapped[int] = mapped_column(primary_key=True)
     group_id: Mapped[int] = mapped_column(ForeignKey("groups.id"))
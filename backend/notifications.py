@@ -0,0 +1,350 @@
+import asyncio
+import json
+import os
+from typing import Iterable
+
+# memory: this process only; redis: every worker subscribed to NOTIFY_BUS_CHANNEL on REDIS_URL
+NOTIFY_BUS_BACKEND = os.getenv("NOTIFY_BUS_BACKEND", "memory").lower()
+NOTIFY_BUS_CHANNEL = os.getenv("NOTIFY_BUS_CHANNEL", "notifications")
+NOTIFY_BUS_RETRY_SECS = float(os.getenv("NOTIFY_BUS_RETRY_SECS", "1"))
+
+WS_SEND_QUEUE_SIZE = int(os.getenv("WS_SEND_QUEUE_SIZE", "64"))
+# the server pings after this much silence and drops clients that stay silent for WS_IDLE_TIMEOUT_SECS
+WS_PING_INTERVAL_SECS = float(os.getenv("WS_PING_INTERVAL_SECS", "25"))
+WS_IDLE_TIMEOUT_SECS = float(os.getenv("WS_IDLE_TIMEOUT_SECS", "60"))
+# per worker
+WS_MAX_CONNECTIONS = int(os.getenv("WS_MAX_CONNECTIONS", "10000"))
+WS_MAX_CONNECTIONS_PER_USER = int(os.getenv("WS_MAX_CONNECTIONS_PER_USER", "5"))
+WS_SLOW_CONSUMER_POLICY = os.getenv("WS_SLOW_CONSUMER_POLICY", "drop")  # drop|disconnect
+# "Try Again Later": the client is expected to reconnect and refetch
+WS_SLOW_CONSUMER_CLOSE_CODE = 1013
+# 44xx mirror the HTTP status, like the 4401 sent for a missing session
+WS_IDLE_CLOSE_CODE = 4408
+WS_LIMIT_CLOSE_CODE = 4429
+
+SLOW_CONSUMER_POLICIES = ("drop", "disconnect")
+
+
+def encode_message(message: dict) -> str:
+    # Same encoding as WebSocket.send_json, done once per notification instead of once per socket
+    return json.dumps(message, separators=(",", ":"), ensure_ascii=False)
+
+
+PING_TEXT = encode_message({"type": "ping"})
+
+
+class Connection:
+    """One accepted socket with its own bounded send queue, drained by a dedicated writer task."""
+
+    def __init__(self, user_id: int, websocket, queue_size: int):
+        self.user_id = user_id
+        self.websocket = websocket
+        self.queue: asyncio.Queue[str] = asyncio.Queue(maxsize=queue_size)
+        self.writer: asyncio.Task | None = None
+        self.sent = 0
+        self.dropped = 0
+
+    async def write_loop(self, manager: "ConnectionManager"):
+        try:
+            while True:
+                text = await self.queue.get()
+                await self.websocket.send_text(text)
+                self.sent += 1
+                manager.sent += 1
+        except Exception:
+            # the peer went away mid-send; the receive loop will see the disconnect too
+            manager.disconnect(self.user_id, self.websocket)
+
+
+class MemoryBus:
+    """Delivers straight to this process's sockets; enough for a single worker."""
+
+    backend = "memory"
+
+    def __init__(self):
+        self._deliver = None
+        self.published = 0
+
+    async def start(self, deliver):
+        self._deliver = deliver
+
+    async def publish(self, user_ids: list[int], text: str):
+        self.published += 1
+        if self._deliver is not None:
+            self._deliver(user_ids, text)
+
+    async def stop(self):
+        self._deliver = None
+
+    def stats(self) -> dict:
+        return {"backend": self.backend, "published": self.published}
+
+
+class RedisBus:
+    """
+    Shares notifications between workers over Redis pub/sub, through any client exposing the
+    redis.asyncio API (publish, pubsub().subscribe/get_message/unsubscribe/aclose). Every worker,
+    the publisher included, receives each envelope and delivers it to its own sockets.
+    """
+
+    backend = "redis"
+
+    def __init__(self, client, *, channel: str = NOTIFY_BUS_CHANNEL, retry_secs: float = NOTIFY_BUS_RETRY_SECS):
+        self.client = client
+        self.channel = channel
+        self.retry_secs = retry_secs
+        self._listener: asyncio.Task | None = None
+        self._subscribed = asyncio.Event()
+        self.published = 0
+        self.received = 0
+        self.errors = 0
+
+    async def start(self, deliver):
+        if self._listener is None:
+            self._listener = asyncio.create_task(self._listen(deliver))
+            await self._subscribed.wait()
+
+    async def _listen(self, deliver):
+        while True:
+            pubsub = self.client.pubsub()
+            try:
+                await pubsub.subscribe(self.channel)
+                self._subscribed.set()
+                while True:
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                    if message is None or message.get("type") != "message":
+                        continue
+                    envelope = json.loads(message["data"])
+                    self.received += 1
+                    deliver(envelope["user_ids"], envelope["text"])
+            except asyncio.CancelledError:
+                await _close_pubsub(pubsub, self.channel)
+                raise
+            except Exception:
+                # lost connection or a malformed envelope: resubscribe after a pause
+                self.errors += 1
+                self._subscribed.set()
+                await _close_pubsub(pubsub, self.channel)
+                await asyncio.sleep(self.retry_secs)
+
+    async def publish(self, user_ids: list[int], text: str):
+        await self.client.publish(self.channel, json.dumps({"user_ids": user_ids, "text": text}))
+        self.published += 1
+
+    async def stop(self):
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+
+    def stats(self) -> dict:
+        return {
+            "backend": self.backend,
+            "channel": self.channel,
+            "published": self.published,
+            "received": self.received,
+            "errors": self.errors,
+        }
+
+
+async def _close_pubsub(pubsub, channel: str):
+    try:
+        await pubsub.unsubscribe(channel)
+        await pubsub.aclose()
+    except Exception:
+        pass
+
+
+def bus_from_env():
+    if NOTIFY_BUS_BACKEND == "redis":
+        import redis.asyncio  # optional dependency, only needed for the shared backend
+
+        return RedisBus(redis.asyncio.Redis.from_url(os.getenv("REDIS_URL", "redis://127.0.0.1:6379/0")))
+    if NOTIFY_BUS_BACKEND != "memory":
+        raise ValueError(f"Unknown notification bus backend '{NOTIFY_BUS_BACKEND}'")
+    return MemoryBus()
+
+
+class ConnectionManager:
+    """
+    Tracks this worker's notification sockets per user. publish() serializes a message once and
+    hands it to the bus, which delivers it to the sockets of every worker. Delivery enqueues on each
+    target connection without awaiting any socket, so a slow client only ever delays itself.
+    When a connection's queue is full, "drop" discards its oldest pending message and "disconnect"
+    closes the socket. Connections beyond max_connections (per worker) or max_connections_per_user
+    are refused.
+    """
+
+    def __init__(
+        self,
+        *,
+        bus=None,
+        queue_size: int = WS_SEND_QUEUE_SIZE,
+        slow_consumer_policy: str = WS_SLOW_CONSUMER_POLICY,
+        ping_interval_secs: float = WS_PING_INTERVAL_SECS,
+        idle_timeout_secs: float = WS_IDLE_TIMEOUT_SECS,
+        max_connections: int = WS_MAX_CONNECTIONS,
+        max_connections_per_user: int = WS_MAX_CONNECTIONS_PER_USER,
+    ):
+        if slow_consumer_policy not in SLOW_CONSUMER_POLICIES:
+            raise ValueError(f"Unknown slow consumer policy '{slow_consumer_policy}'")
+        self.bus = bus or MemoryBus()
+        self.queue_size = queue_size
+        self.slow_consumer_policy = slow_consumer_policy
+        self.ping_interval_secs = ping_interval_secs
+        self.idle_timeout_secs = idle_timeout_secs
+        self.max_connections = max_connections
+        self.max_connections_per_user = max_connections_per_user
+        self.connections: dict[int, dict[object, Connection]] = {}
+        self._started = False
+        self._closing: set[asyncio.Task] = set()
+        self.published = 0
+        self.sent = 0
+        self.dropped = 0
+        self.slow_disconnects = 0
+        self.live = 0
+        self.peak = 0
+        self.rejected = 0
+        self.pings = 0
+        self.reaped = 0
+
+    async def start(self):
+        # started on first use so each worker subscribes from inside its own event loop
+        if not self._started:
+            self._started = True
+            await self.bus.start(self.deliver)
+
+    async def connect(self, user_id: int, websocket) -> Connection | None:
+        """Accepts and registers the socket, or closes it and returns None when a cap is reached."""
+        if self.live >= self.max_connections or len(self.connections.get(user_id, ())) >= self.max_connections_per_user:
+            self.rejected += 1
+            await self._close(websocket, WS_LIMIT_CLOSE_CODE)
+            return None
+        await self.start()
+        await websocket.accept()
+        connection = Connection(user_id, websocket, self.queue_size)
+        connection.writer = asyncio.create_task(connection.write_loop(self))
+        self.connections.setdefault(user_id, {})[websocket] = connection
+        self.live += 1
+        self.peak = max(self.peak, self.live)
+        return connection
+
+    async def serve(self, connection: Connection):
+        """
+        Reads from the client until it leaves. After ping_interval_secs of silence a ping is queued;
+        a client silent for idle_timeout_secs is treated as dead and closed. Any message (the client
+        answers pings with a pong) counts as activity.
+        """
+        loop = asyncio.get_running_loop()
+        last_seen = loop.time()
+        try:
+            while True:
+                try:
+                    await asyncio.wait_for(connection.websocket.receive_text(), self.ping_interval_secs)
+                    last_seen = loop.time()
+                except asyncio.TimeoutError:
+                    if loop.time() - last_seen >= self.idle_timeout_secs:
+                        self.reaped += 1
+                        await self._close(connection.websocket, WS_IDLE_CLOSE_CODE)
+                        return
+                    self.pings += 1
+                    self._enqueue(connection, PING_TEXT)
+        finally:
+            self.disconnect(connection.user_id, connection.websocket)
+
+    def disconnect(self, user_id: int, websocket):
+        connections = self.connections.get(user_id)
+        if not connections:
+            return
+        connection = connections.pop(websocket, None)
+        if not connections:
+            self.connections.pop(user_id, None)
+        if connection:
+            self.live -= 1
+        if connection and connection.writer and connection.writer is not asyncio.current_task():
+            connection.writer.cancel()
+
+    def _close_slow_consumer(self, connection: Connection):
+        self.slow_disconnects += 1
+        self.disconnect(connection.user_id, connection.websocket)
+        task = asyncio.create_task(self._close(connection.websocket, WS_SLOW_CONSUMER_CLOSE_CODE))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    @staticmethod
+    async def _close(websocket, code: int):
+        try:
+            await websocket.close(code=code)
+        except Exception:
+            pass
+
+    def _enqueue(self, connection: Connection, text: str):
+        try:
+            connection.queue.put_nowait(text)
+            return
+        except asyncio.QueueFull:
+            pass
+        if self.slow_consumer_policy == "disconnect":
+            self._close_slow_consumer(connection)
+            return
+        connection.queue.get_nowait()
+        connection.queue.put_nowait(text)
+        connection.dropped += 1
+        self.dropped += 1
+
+    async def publish(self, user_ids: Iterable[int], message: dict):
+        # async so BackgroundTasks runs it on the event loop: asyncio.Queue is not thread-safe
+        user_ids = sorted(set(user_ids))
+        if not user_ids:
+            return
+        await self.start()
+        self.published += 1
+        await self.bus.publish(user_ids, encode_message(message))
+
+    def deliver(self, user_ids: Iterable[int], text: str):
+        """Queues an already-serialized message on this worker's sockets for user_ids."""
+        for user_id in user_ids:
+            for connection in list(self.connections.get(user_id, {}).values()):
+                self._enqueue(connection, text)
+
+    async def send(self, user_id: int, message: dict):
+        await self.publish([user_id], message)
+
+    async def close_all(self):
+        await self.bus.stop()
+        self._started = False
+        for user_id, connections in list(self.connections.items()):
+            for websocket in list(connections):
+                self.disconnect(user_id, websocket)
+        if self._closing:
+            await asyncio.gather(*self._closing, return_exceptions=True)
+
+    def stats(self) -> dict:
+        connections = [c for by_socket in self.connections.values() for c in by_socket.values()]
+        depths = [c.queue.qsize() for c in connections]
+        return {
+            "pid": os.getpid(),
+            "users": len(self.connections),
+            "connections": self.live,
+            "peak_connections": self.peak,
+            "max_connections": self.max_connections,
+            "max_connections_per_user": self.max_connections_per_user,
+            "rejected": self.rejected,
+            "pings": self.pings,
+            "reaped": self.reaped,
+            "queue_size": self.queue_size,
+            "queue_depth_total": sum(depths),
+            "queue_depth_max": max(depths, default=0),
+            "slow_consumer_policy": self.slow_consumer_policy,
+            "published": self.published,
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "slow_disconnects": self.slow_disconnects,
+            "bus": self.bus.stats(),
+        }
+
+
+manager = ConnectionManager(bus=bus_from_env())
@@ -0,0 +1,124 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor
+
+PASSWORD_HASH_ROUNDS = int(os.getenv("PASSWORD_HASH_ROUNDS", "12"))
+PASSWORD_WORKERS = int(os.getenv("PASSWORD_WORKERS", "2"))
+PASSWORD_MAX_PENDING = int(os.getenv("PASSWORD_MAX_PENDING", "32"))
+PASSWORD_EXECUTOR = os.getenv("PASSWORD_EXECUTOR", "thread")  # thread|process
+
+
+class PasswordPoolBusy(Exception):
+    """Raised when more password operations are queued than PASSWORD_MAX_PENDING allows."""
+
+
+# bcrypt is imported inside the worker functions: only sign-in and registration need it, and with
+# PASSWORD_EXECUTOR=process it loads in the worker processes rather than the server
+def _hashpw(password: bytes, rounds: int) -> bytes:
+    import bcrypt
+
+    return bcrypt.hashpw(password, bcrypt.gensalt(rounds))
+
+
+def _checkpw(password: bytes, password_hash: bytes) -> bool:
+    import bcrypt
+
+    try:
+        return bcrypt.checkpw(password, password_hash)
+    except ValueError:
+        return False
+
+
+def hash_rounds(password_hash: str) -> int | None:
+    # bcrypt hashes look like $2b$12$<salt+digest>
+    parts = password_hash.split("$")
+    if len(parts) < 4 or not parts[2].isdigit():
+        return None
+    return int(parts[2])
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt on a dedicated, size-limited executor so a burst of logins cannot occupy the
+    request threadpool. Work beyond max_pending is rejected instead of queued.
+    """
+
+    def __init__(self, *, rounds: int, workers: int, max_pending: int, use_processes: bool = False):
+        self.rounds = rounds
+        self.workers = workers
+        self.max_pending = max_pending
+        self.use_processes = use_processes
+        self._executor: Executor | None = None
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.rejected = 0
+        self.completed = 0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    if self.use_processes:
+                        # concurrent.futures.process pulls in multiprocessing; only load it when asked for
+                        from concurrent.futures import ProcessPoolExecutor as pool_cls
+                    else:
+                        pool_cls = ThreadPoolExecutor
+                    self._executor = pool_cls(max_workers=self.workers)
+        return self._executor
+
+    def _release(self, _future):
+        with self._lock:
+            self.pending -= 1
+            self.completed += 1
+
+    async def _run(self, fn, *args):
+        with self._lock:
+            if self.pending >= self.max_pending:
+                self.rejected += 1
+                raise PasswordPoolBusy()
+            self.pending += 1
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except Exception:
+            with self._lock:
+                self.pending -= 1
+            raise
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    async def hash(self, password: str) -> str:
+        hashed = await self._run(_hashpw, password.encode(), self.rounds)
+        return hashed.decode()
+
+    async def verify(self, password: str, password_hash: str) -> bool:
+        if not password_hash:
+            return False
+        return await self._run(_checkpw, password.encode(), password_hash.encode())
+
+    def needs_rehash(self, password_hash: str) -> bool:
+        return hash_rounds(password_hash) != self.rounds
+
+    def stats(self) -> dict:
+        return {
+            "executor": "process" if self.use_processes else "thread",
+            "workers": self.workers,
+            "rounds": self.rounds,
+            "pending": self.pending,
+            "max_pending": self.max_pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(
+    rounds=PASSWORD_HASH_ROUNDS,
+    workers=PASSWORD_WORKERS,
+    max_pending=PASSWORD_MAX_PENDING,
+    use_processes=PASSWORD_EXECUTOR == "process",
+)
@@ -0,0 +1,394 @@
+"""
+EXPLAIN QUERY PLAN audit over every query issued by backend/crud.
+
+Builds a throwaway SQLite database with the Alembic migrations, seeds a large dataset, runs
+each public crud function (and its _async twin) while capturing the SQL it sends, and explains
+every captured SELECT/UPDATE/DELETE with the same parameters. Fails when any plan does a full
+SCAN of a table, or when a crud function has no entry in AUDITED_CALLS.
+
+    python -m backend.query_plan_audit              # ~2k users, ~60k expenses
+    python -m backend.query_plan_audit --scale 0.1  # quicker, smaller dataset
+    python -m backend.query_plan_audit --verbose    # print every plan, not just the failures
+
+Plans are SQLite's; MySQL picks its own, so check those with EXPLAIN against a production copy.
+"""
+import argparse
+import asyncio
+import importlib
+import inspect
+import os
+import pkgutil
+import random
+import re
+import sys
+import tempfile
+from datetime import date, datetime, timedelta, timezone
+from types import SimpleNamespace
+from sqlalchemy import create_engine, event, insert, text
+from sqlalchemy.orm import sessionmaker
+import backend.crud
+from backend.db import Base
+from backend.migrate import upgrade_database
+from backend.models.user import User
+from backend.models.group import (
+    CategorySplit, Expense, ExpenseSplit, Group, GroupCategory, GroupInvite, GroupMember,
+    GroupMemberBalance, Settlement, Subscription, SubscriptionMember,
+)
+
+# Each entry runs one crud function: builder(db, seed) -> (args, kwargs), called with the db first.
+# The builder runs before capture starts, so loading ORM arguments with db.get is not audited.
+# _async twins reuse their sync function's builders; list a name twice to audit several shapes.
+AUDITED_CALLS = [
+    # users
+    ("get_user_by_username", lambda db, s: ((s.username,), {})),
+    ("get_user_by_email", lambda db, s: ((s.email,), {})),
+    ("create_user", lambda db, s: (("audit_user", "audit_user@example.com", "hash"), {})),
+    ("update_user", lambda db, s: ((db.get(User, s.user_id),), {"email": "audit_changed@example.com"})),
+    # groups
+    ("create_group", lambda db, s: ((), {"name": "Audit", "owner_id": s.user_id,
+                                         "member_ids": [s.other_user_id], "currency": "GBP"})),
+    ("get_groups_for_user", lambda db, s: ((s.user_id,), {})),
+    ("get_group_versions_for_user", lambda db, s: ((s.user_id,), {})),
+    ("get_groups_with_members", lambda db, s: (([s.group_id, s.other_group_id],), {})),
+    ("get_group_with_members", lambda db, s: ((s.group_id,), {})),
+    ("bump_group_version", lambda db, s: ((s.group_id,), {})),
+    ("bump_group_versions_for_user", lambda db, s: ((s.user_id,), {})),
+    ("get_group_version_for_member", lambda db, s: ((s.group_id, s.user_id), {})),
+    ("is_user_in_group", lambda db, s: ((s.group_id, s.user_id), {})),
+    ("group_exists", lambda db, s: ((s.group_id,), {})),
+    ("add_member_to_group", lambda db, s: ((s.group_id, s.outsider_id), {})),
+    # invites
+    ("create_group_invite", lambda db, s: ((), {"group_id": s.group_id, "inviter_id": s.user_id,
+                                                "invitee_id": s.outsider_id})),
+    ("get_pending_invite", lambda db, s: ((), {"group_id": s.other_group_id, "invitee_id": s.outsider_id})),
+    ("get_invite_by_id", lambda db, s: ((s.invite_id,), {})),
+    ("list_pending_invites_for_user", lambda db, s: ((s.outsider_id,), {})),
+    ("accept_invite", lambda db, s: ((db.get(GroupInvite, s.invite_id),), {})),
+    # ledger
+    ("apply_balance_deltas", lambda db, s: ((s.group_id, {s.user_id: 100, s.other_user_id: -100}), {})),
+    ("get_group_balances", lambda db, s: ((s.group_id,), {})),
+    ("compute_balances_from_history", lambda db, s: ((s.group_id,), {})),
+    ("find_balance_drift", lambda db, s: ((s.group_id,), {})),
+    ("rebuild_group_balances", lambda db, s: ((s.group_id,), {})),
+    ("delete_group_balances", lambda db, s: ((s.other_group_id,), {})),
+    # categories
+    ("create_category", lambda db, s: ((), {"group_id": s.group_id, "name": "Audit", "description": "",
+                                            "budget": 0, "splits": [{"username": s.username, "share": 1}]})),
+    ("list_categories", lambda db, s: ((s.group_id,), {})),
+    ("list_categories_with_splits", lambda db, s: ((s.group_id,), {})),
+    # expenses
+    ("create_expense", lambda db, s: ((), {"group_id": s.group_id, **_expense_fields(s)})),
+    ("bulk_create_expenses", lambda db, s: ((), {"group_id": s.group_id, "items": [_expense_fields(s)] * 3})),
+    ("list_expenses_for_group", lambda db, s: ((s.group_id,), {})),
+    ("list_expense_rows_for_group", lambda db, s: ((s.group_id,), {})),
+    ("list_expenses_page", lambda db, s: ((s.group_id,), {"limit": 50})),
+    ("list_expenses_page", lambda db, s: ((s.group_id,), {
+        "limit": 50, "after": (s.now, s.expense_id), "paid_by_id": s.user_id,
+        "created_from": s.now - timedelta(days=30), "created_to": s.now,
+    })),
+    ("list_expenses_page", lambda db, s: ((s.group_id,), {"limit": 50, "category_id": s.category_id})),
+    ("get_expense", lambda db, s: ((s.expense_id,), {})),
+    ("update_expense", lambda db, s: ((db.get(Expense, s.expense_id),), _expense_fields(s))),
+    ("delete_expense", lambda db, s: ((db.get(Expense, s.doomed_expense_id),), {})),
+    # settlements
+    ("list_settlements_for_group", lambda db, s: ((s.group_id,), {})),
+    ("list_settlement_rows_for_group", lambda db, s: ((s.group_id,), {})),
+    ("create_settlement_record", lambda db, s: ((), {"group_id": s.group_id, "payer_id": s.user_id,
+                                                     "receiver_id": s.other_user_id, "amount_cents": 500})),
+    ("get_settlement", lambda db, s: ((s.settlement_id,), {})),
+    ("confirm_settlement", lambda db, s: ((db.get(Settlement, s.settlement_id),), {})),
+    # spending
+    ("spending_summary_rows", lambda db, s: ((s.user_id,), {})),
+    # subscriptions
+    ("list_subscriptions_for_group", lambda db, s: ((s.group_id,), {})),
+    ("get_subscription", lambda db, s: ((s.subscription_id,), {})),
+    ("create_subscription", lambda db, s: ((), {"group_id": s.group_id, "created_by_id": s.user_id,
+                                                **_subscription_fields(s, "audit-new")})),
+    ("update_subscription", lambda db, s: ((db.get(Subscription, s.subscription_id),),
+                                           _subscription_fields(s, "audit-renamed"))),
+    ("delete_subscription", lambda db, s: ((db.get(Subscription, s.doomed_subscription_id),), {})),
+]
+
+_SCAN = re.compile(r"^SCAN (\w+)")
+_SKIPPED_STATEMENTS = ("INSERT", "PRAGMA", "SAVEPOINT", "RELEASE", "ROLLBACK", "BEGIN", "COMMIT")
+
+
+def _expense_fields(s) -> dict:
+    return {
+        "description": "audit", "amount_cents": 1000, "paid_by_id": s.user_id, "category_id": None,
+        "splits": [{"user_id": s.user_id, "amount_cents": 500}, {"user_id": s.other_user_id, "amount_cents": 500}],
+    }
+
+
+def _subscription_fields(s, name: str) -> dict:
+    return {
+        "name": name, "amount_cents": 999, "cadence": "monthly", "next_due": date.today(),
+        "notes": "", "category_id": None, "member_shares": [{"user_id": s.user_id, "share": 1}],
+    }
+
+
+def crud_functions() -> dict:
+    """Every public function in backend/crud that takes a db session first, by name."""
+    found = {}
+    for module_info in pkgutil.iter_modules(backend.crud.__path__):
+        module = importlib.import_module(f"backend.crud.{module_info.name}")
+        for name, fn in inspect.getmembers(module, inspect.isfunction):
+            if fn.__module__ != module.__name__ or name.startswith("_"):
+                continue
+            if next(iter(inspect.signature(fn).parameters), None) == "db":
+                found[name] = fn
+    return found
+
+
+def seed(engine, scale: float = 1.0) -> SimpleNamespace:
+    """
+    Bulk-inserts a dataset shaped like production: many groups, most users in several of them and
+    one busy focus group. Returns the ids AUDITED_CALLS needs.
+    """
+    rng = random.Random(1)
+    n_users = max(20, int(2000 * scale))
+    n_groups = max(4, int(400 * scale))
+    per_group = 8
+    expenses_per_group = max(5, int(100 * scale))
+    focus_expenses = max(20, int(20000 * scale))
+    now = datetime.now(timezone.utc).replace(microsecond=0, tzinfo=None)
+
+    with engine.begin() as conn:
+        conn.execute(insert(User), [
+            {"id": i, "username": f"user{i}", "email": f"user{i}@example.com", "password_hash": "x"}
+            for i in range(1, n_users + 1)
+        ])
+        # the last user is kept out of every group so invites and joins have someone to target
+        members = {1: list(range(1, per_group + 1))}
+        for group_id in range(2, n_groups + 1):
+            members[group_id] = rng.sample(range(1, n_users), per_group)
+        conn.execute(insert(Group), [
+            {"id": group_id, "name": f"group{group_id}", "owner_id": ids[0], "currency": "GBP", "version": 0}
+            for group_id, ids in members.items()
+        ])
+        conn.execute(insert(GroupMember), [
+            {"group_id": group_id, "user_id": user_id} for group_id, ids in members.items() for user_id in ids
+        ])
+        conn.execute(insert(GroupMemberBalance), [
+            {"group_id": group_id, "user_id": user_id, "balance": 0}
+            for group_id, ids in members.items() for user_id in ids
+        ])
+        conn.execute(insert(GroupCategory), [
+            {"id": group_id * 2 + k, "group_id": group_id, "name": f"cat{k}", "description": "", "budget": 0}
+            for group_id in members for k in range(2)
+        ])
+        conn.execute(insert(CategorySplit), [
+            {"category_id": group_id * 2 + k, "user_id": user_id, "share": 1}
+            for group_id, ids in members.items() for k in range(2) for user_id in ids[:3]
+        ])
+
+        expenses, splits = [], []
+        expense_id = 0
+        for group_id, ids in members.items():
+            for n in range(focus_expenses if group_id == 1 else expenses_per_group):
+                expense_id += 1
+                payer = rng.choice(ids)
+                sharers = rng.sample(ids, 3)
+                expenses.append({
+                    "id": expense_id, "group_id": group_id, "category_id": group_id * 2 + n % 2,
+                    "description": f"e{expense_id}", "amount": 300, "paid_by_id": payer,
+                    "created_at": now - timedelta(minutes=n), "split_mode": "equal",
+                })
+                splits.extend({"expense_id": expense_id, "user_id": user_id, "amount": 100} for user_id in sharers)
+        conn.execute(insert(Expense), expenses)
+        conn.execute(insert(ExpenseSplit), splits)
+
+        settlements = []
+        for group_id, ids in members.items():
+            for n in range(max(2, expenses_per_group // 10)):
+                payer, receiver = rng.sample(ids, 2)
+                settlements.append({
+                    "group_id": group_id, "payer_id": payer, "receiver_id": receiver, "amount": 100,
+                    "status": "pending" if n % 3 == 0 else "complete",
+                })
+        conn.execute(insert(Settlement), settlements)
+
+        invites = [
+            {"group_id": group_id, "inviter_id": ids[0], "invitee_id": rng.randrange(1, n_users),
+             "status": rng.choice(("pending", "accepted", "declined"))}
+            for group_id, ids in members.items() for _ in range(2)
+        ]
+        invites.append({"group_id": 2, "inviter_id": members[2][0], "invitee_id": n_users, "status": "pending"})
+        conn.execute(insert(GroupInvite).prefix_with("OR IGNORE"), invites)
+
+        conn.execute(insert(Subscription), [
+            {"id": group_id * 2 + k, "group_id": group_id, "name": f"sub{k}", "amount": 1000, "cadence": "monthly",
+             "next_due_date": date.today(), "notes": "", "created_by_id": ids[0]}
+            for group_id, ids in members.items() for k in range(2)
+        ])
+        conn.execute(insert(SubscriptionMember), [
+            {"subscription_id": group_id * 2 + k, "user_id": user_id, "share": 1}
+            for group_id, ids in members.items() for k in range(2) for user_id in ids[:3]
+        ])
+
+        invite_id = conn.execute(
+            text("SELECT id FROM group_invites WHERE group_id = 2 AND invitee_id = :user_id"), {"user_id": n_users}
+        ).scalar_one()
+        settlement_id = conn.execute(
+            text("SELECT id FROM settlements WHERE group_id = 1 AND status = 'pending' LIMIT 1")
+        ).scalar_one()
+
+    return SimpleNamespace(
+        user_id=1, username="user1", email="user1@example.com", other_user_id=2, outsider_id=n_users,
+        group_id=1, other_group_id=2, category_id=2, expense_id=1, doomed_expense_id=2,
+        settlement_id=settlement_id, invite_id=invite_id, subscription_id=2, doomed_subscription_id=3,
+        now=now,
+    )
+
+
+class _StatementLog:
+    """Collects the statements an engine sends while recording is on."""
+
+    def __init__(self):
+        self.recording = False
+        self.statements: list[tuple[str, tuple]] = []
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        if not self.recording or executemany:
+            return
+        upper = statement.lstrip().upper()
+        # an upsert looks up its conflict target, so it is explained like any other lookup
+        if upper.startswith(_SKIPPED_STATEMENTS) and " ON CONFLICT " not in upper:
+            return
+        self.statements.append((statement, tuple(parameters or ())))
+
+    def take(self) -> list[tuple[str, tuple]]:
+        statements, self.statements = self.statements, []
+        return statements
+
+
+def scanned_tables(statement: str, plan: list[str]) -> list[str]:
+    """Tables (not CTEs or subqueries) the plan reads in full; aliases resolve to their table."""
+    tables = set(Base.metadata.tables)
+    aliases = {alias: table for table, alias in re.findall(r"\b(\w+) AS (\w+)\b", statement) if table in tables}
+    scans = []
+    for detail in plan:
+        match = _SCAN.match(detail)
+        if not match:
+            continue
+        name = aliases.get(match.group(1), match.group(1))
+        if name in tables:
+            scans.append(name)
+    return scans
+
+
+def explain(engine, statement: str, parameters: tuple) -> list[str]:
+    with engine.connect() as conn:
+        rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+    return [row[3] for row in rows]
+
+
+def _run_sync(engine, log, fn, builder, seeded) -> list:
+    db = sessionmaker(engine, autoflush=False)()
+    try:
+        args, kwargs = builder(db, seeded)
+        log.recording = True
+        try:
+            fn(db, *args, **kwargs)
+        finally:
+            log.recording = False
+        db.rollback()
+    finally:
+        db.close()
+    return log.take()
+
+
+async def _run_async(async_engine, log, fn, args, kwargs) -> list:
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+
+    async with async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)() as db:
+        log.recording = True
+        try:
+            await fn(db, *args, **kwargs)
+        finally:
+            log.recording = False
+    return log.take()
+
+
+def audit(path: str, scale: float = 1.0, analyze: bool = True) -> dict:
+    """
+    Runs AUDITED_CALLS against a fresh database at path. Returns {"results": [...], "unaudited": [...]},
+    where each result is {"call", "statement", "plan", "scans"}.
+    """
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    engine = create_engine(f"sqlite:///{path}")
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    log = _StatementLog()
+    event.listen(engine, "before_cursor_execute", log)
+    event.listen(async_engine.sync_engine, "before_cursor_execute", log)
+    try:
+        upgrade_database(engine)
+        seeded = seed(engine, scale)
+        if analyze:
+            with engine.begin() as conn:
+                conn.exec_driver_sql("ANALYZE")
+
+        functions = crud_functions()
+        builders: dict[str, list] = {}
+        for name, builder in AUDITED_CALLS:
+            builders.setdefault(name, []).append(builder)
+
+        captured = []
+        for name, builder in AUDITED_CALLS:
+            captured.append((name, _run_sync(engine, log, functions[name], builder, seeded)))
+        for name, fn in functions.items():
+            if not name.endswith("_async") or name[:-len("_async")] not in builders:
+                continue
+            for builder in builders[name[:-len("_async")]]:
+                db = sessionmaker(engine)()
+                try:
+                    args, kwargs = builder(db, seeded)
+                finally:
+                    db.close()
+                captured.append((name, asyncio.run(_run_async(async_engine, log, fn, args, kwargs))))
+
+        results = []
+        for name, statements in captured:
+            for statement, parameters in statements:
+                plan = explain(engine, statement, parameters)
+                results.append({"call": name, "statement": statement, "plan": plan,
+                                "scans": scanned_tables(statement, plan)})
+        unaudited = sorted(
+            name for name in functions
+            if name not in builders and not (name.endswith("_async") and name[:-len("_async")] in builders)
+        )
+        return {"results": results, "unaudited": unaudited}
+    finally:
+        asyncio.run(async_engine.dispose())
+        engine.dispose()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=float, default=1.0, help="dataset size multiplier")
+    parser.add_argument("--no-analyze", action="store_true", help="skip ANALYZE, so plans ignore table statistics")
+    parser.add_argument("--verbose", action="store_true", help="print every statement and plan")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        report = audit(os.path.join(tmp, "audit.db"), scale=args.scale, analyze=not args.no_analyze)
+
+    failures = [result for result in report["results"] if result["scans"]]
+    for result in report["results"]:
+        if not (args.verbose or result["scans"]):
+            continue
+        label = f"FULL SCAN of {', '.join(result['scans'])}" if result["scans"] else "ok"
+        print(f"{result['call']}: {label}\n  {' '.join(result['statement'].split())}")
+        for detail in result["plan"]:
+            print(f"    {detail}")
+    for name in report["unaudited"]:
+        print(f"{name}: not in AUDITED_CALLS")
+    calls = len({result["call"] for result in report["results"]})
+    print(f"explained {len(report['results'])} statement(s) from {calls} crud function(s), "
+          f"{len(failures)} full scan(s), {len(report['unaudited'])} unaudited function(s)")
+    return 1 if failures or report["unaudited"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,48 @@
+"""
+Verify or rebuild the materialized group_member_balances ledger from expense/settlement history.
+
+    python -m backend.rebuild_balances            # report drift, exit 1 if any
+    python -m backend.rebuild_balances --fix      # rewrite drifted groups from history
+    python -m backend.rebuild_balances --group-id 3
+"""
+import argparse
+import sys
+from backend.db import SessionLocal
+from backend.crud.balances import find_balance_drift, rebuild_group_balances
+from backend.crud.groups import bump_group_version
+from backend.models.user import User  # noqa: F401  (registers the mapper)
+from backend.models.group import Group
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--group-id", type=int, action="append", help="only check this group (repeatable)")
+    parser.add_argument("--fix", action="store_true", help="rebuild ledger rows for groups with drift")
+    args = parser.parse_args(argv)
+
+    db = SessionLocal()
+    try:
+        group_ids = args.group_id or [row.id for row in db.query(Group.id).order_by(Group.id).all()]
+        drifted = 0
+        for group_id in group_ids:
+            drift = find_balance_drift(db, group_id)
+            if not drift:
+                continue
+            drifted += 1
+            for user_id, (stored, expected) in sorted(drift.items()):
+                print(f"group {group_id} user {user_id}: stored {stored} expected {expected} (drift {stored - expected})")
+            if args.fix:
+                # settlement recommendations come from the ledger, so cached reads are stale now;
+                # the bump commits with the rebuilt rows
+                bump_group_version(db, group_id)
+                rebuild_group_balances(db, group_id)
+                print(f"group {group_id}: rebuilt")
+
+        print(f"checked {len(group_ids)} group(s), {drifted} with drift")
+        return 1 if drifted and not args.fix else 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,185 @@
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import httpx
+
+
+class CircuitBreaker:
+    """
+    closed -> open after `failure_threshold` consecutive failures; open short-circuits every call
+    for `cooldown_secs`; then half_open lets a single trial call through to decide which way to go.
+    """
+
+    def __init__(self, *, failure_threshold: int, cooldown_secs: float, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.cooldown_secs = cooldown_secs
+        self._clock = clock
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.times_opened = 0
+        self._trial_in_flight = False
+
+    def allow(self) -> bool:
+        if self.state == "open":
+            if self._clock() - self.opened_at < self.cooldown_secs:
+                return False
+            self.state = "half_open"
+        if self.state == "half_open":
+            if self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+        return True
+
+    def record_success(self):
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self._trial_in_flight = False
+
+    def record_failure(self):
+        self.consecutive_failures += 1
+        self._trial_in_flight = False
+        if self.state == "half_open" or self.consecutive_failures >= self.failure_threshold:
+            if self.state != "open":
+                self.times_opened += 1
+            self.state = "open"
+            self.opened_at = self._clock()
+
+    def release_trial(self):
+        """Frees the half-open slot when a trial ends without a verdict (e.g. it was cancelled)."""
+        self._trial_in_flight = False
+
+    def stats(self) -> dict:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "times_opened": self.times_opened,
+        }
+
+
+class RephraserClient:
+    """
+    Keep-alive, connection-pooled async client for the rephraser service behind a circuit breaker.
+    rephrase() returns (summary, mode), or None whenever the caller should use its fallback.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        *,
+        timeout_secs: float,
+        max_connections: int,
+        breaker: CircuitBreaker,
+        validator=None,
+        transport: "httpx.AsyncBaseTransport | None" = None,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.timeout_secs = timeout_secs
+        self.max_connections = max_connections
+        self.breaker = breaker
+        self.validator = validator
+        self._transport = transport
+        self._client: "httpx.AsyncClient | None" = None
+        self._client_loop = None
+        self.calls = 0
+        self.failures = 0
+        self.short_circuits = 0
+        self.fallbacks = 0
+        self._latencies_ms: deque[float] = deque(maxlen=512)
+
+    def attach_to_running_loop(self):
+        """
+        Makes the running loop (the app's, from its startup hook) the owner of the pooled client;
+        aclose() from the shutdown hook closes it. Pooled connections belong to the loop that
+        opened them and cannot be closed once it has stopped, so the pool is never moved.
+        """
+        self._client_loop = asyncio.get_running_loop()
+
+    def _new_client(self) -> "httpx.AsyncClient":
+        import httpx  # ~150ms of imports, deferred until the first rephrase call
+
+        return httpx.AsyncClient(
+            base_url=self.base_url,
+            timeout=self.timeout_secs,
+            limits=httpx.Limits(max_connections=self.max_connections, max_keepalive_connections=self.max_connections),
+            transport=self._transport,
+        )
+
+    @asynccontextmanager
+    async def _client_for_call(self):
+        if self._client_loop is asyncio.get_running_loop():
+            if self._client is None:
+                self._client = self._new_client()
+            yield self._client
+            return
+        # any other loop (scripts, tests) gets a one-off client, closed before its loop can stop
+        async with self._new_client() as client:
+            yield client
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        self._client_loop = None
+
+    async def rephrase(self, facts: dict, max_sentences: int = 2) -> tuple[str, str] | None:
+        import httpx
+
+        self.calls += 1
+        if not self.breaker.allow():
+            self.short_circuits += 1
+            self.fallbacks += 1
+            return None
+
+        started = time.perf_counter()
+        try:
+            async with self._client_for_call() as client:
+                resp = await client.post("/rephrase", json={"facts": facts, "max_sentences": max_sentences})
+            resp.raise_for_status()
+            obj = resp.json()
+            if not isinstance(obj, dict):
+                raise ValueError("unexpected rephraser response")
+        except (httpx.HTTPError, ValueError):
+            self.failures += 1
+            self.fallbacks += 1
+            self.breaker.record_failure()
+            return None
+        finally:
+            self._latencies_ms.append((time.perf_counter() - started) * 1000)
+            # CancelledError skips both record_* calls; without this the breaker stays half-open
+            self.breaker.release_trial()
+
+        self.breaker.record_success()
+        summary = (obj.get("summary") or "").strip()
+        mode = (obj.get("mode") or "template").strip()
+        try:
+            valid = bool(summary) and (self.validator is None or self.validator(summary, facts))
+        except ValueError:
+            valid = False
+        if not valid:
+            self.fallbacks += 1
+            return None
+        return summary, mode
+
+    def stats(self) -> dict:
+        latencies = sorted(self._latencies_ms)
+
+        def pct(p: float) -> float | None:
+            if not latencies:
+                return None
+            return latencies[min(len(latencies) - 1, int(p / 100 * len(latencies)))]
+
+        return {
+            "breaker": self.breaker.stats(),
+            "calls": self.calls,
+            "failures": self.failures,
+            "short_circuits": self.short_circuits,
+            "fallbacks": self.fallbacks,
+            "fallback_rate": self.fallbacks / self.calls if self.calls else 0.0,
+            "latency_ms_p50": pct(50),
+            "latency_ms_p99": pct(99),
+        }
@@ -0,0 +1,206 @@
+import os
+import time
+from collections import defaultdict
+
+# Transfers are (payer_id, receiver_id, amount_cents); balances map user id -> cents (+ owed money).
+Transfer = tuple[int, int, int]
+
+SETTLEMENT_EXACT_MAX_BALANCES = int(os.getenv("SETTLEMENT_EXACT_MAX_BALANCES", "20"))
+SETTLEMENT_TIME_BUDGET_SECS = float(os.getenv("SETTLEMENT_TIME_BUDGET_MS", "250")) / 1000
+
+
+class SolverTimeout(Exception):
+    pass
+
+
+def greedy_transfers(balances: dict[int, int]) -> list[Transfer]:
+    """Repeatedly matches the largest debtor with the largest creditor; at most n - 1 transfers."""
+    creditors = []
+    debtors = []
+    for user_id, balance in balances.items():
+        if balance > 0:
+            creditors.append([user_id, balance])
+        elif balance < 0:
+            debtors.append([user_id, -balance])
+
+    creditors.sort(key=lambda x: x[1], reverse=True)
+    debtors.sort(key=lambda x: x[1], reverse=True)
+
+    transfers: list[Transfer] = []
+    i = j = 0
+    while i < len(debtors) and j < len(creditors):
+        debtor_id, debt_amount = debtors[i]
+        creditor_id, credit_amount = creditors[j]
+        payment = min(debt_amount, credit_amount)
+        transfers.append((debtor_id, creditor_id, payment))
+        debtors[i][1] -= payment
+        creditors[j][1] -= payment
+        if debtors[i][1] == 0:
+            i += 1
+        if creditors[j][1] == 0:
+            j += 1
+    return transfers
+
+
+def _pair_opposites(balances: dict[int, int]) -> tuple[list[list[int]], dict[int, int]]:
+    """Peels off (x, -x) pairs; some minimum solution always settles such a pair directly."""
+    waiting: dict[int, list[int]] = defaultdict(list)
+    clusters = []
+    for user_id, balance in balances.items():
+        if balance == 0:
+            continue
+        partners = waiting.get(-balance)
+        if partners:
+            clusters.append([partners.pop(), user_id])
+        else:
+            waiting[balance].append(user_id)
+    rest = {user_id: balance for balance, user_ids in waiting.items() for user_id in user_ids}
+    return clusters, rest
+
+
+def _subset_sums(values: list[int]) -> list[int]:
+    """sums[mask] = sum of values[i] for every bit i set in mask."""
+    sums = [0]
+    for value in values:
+        sums += [total + value for total in sums]
+    return sums
+
+
+def _zero_sum_masks(amounts: list[int], deadline: float) -> dict[int, list[int]]:
+    """Every non-empty zero-sum subset as a bitmask, bucketed by its lowest bit (meet in the middle)."""
+    half = len(amounts) // 2
+    low_masks: dict[int, list[int]] = defaultdict(list)
+    for mask, total in enumerate(_subset_sums(amounts[:half])):
+        low_masks[total].append(mask)
+    buckets: dict[int, list[int]] = defaultdict(list)
+    for high_mask, total in enumerate(_subset_sums(amounts[half:])):
+        # many equal amounts make most subsets match, so the enumeration itself can overrun
+        if time.perf_counter() > deadline:
+            raise SolverTimeout
+        for low_mask in low_masks.get(-total, ()):
+            mask = high_mask << half | low_mask
+            if mask:
+                buckets[mask & -mask].append(mask)
+    return buckets
+
+
+def _exact_clusters(balances: dict[int, int], deadline: float) -> list[list[int]]:
+    """
+    Partitions the users into the largest number of zero-sum clusters; each cluster of k users
+    settles in k - 1 transfers, so this minimises the total. Memoised bitmask search over the
+    zero-sum subsets, always extending from the lowest remaining user.
+    """
+    user_ids = list(balances)
+    amounts = [balances[user_id] for user_id in user_ids]
+    n = len(user_ids)
+    if n == 0:
+        return []
+    full = (1 << n) - 1
+    zero_masks = _zero_sum_masks(amounts, deadline)
+    best: dict[int, tuple[int, int]] = {0: (0, 0)}
+
+    def solve(remaining: int) -> int:
+        if remaining in best:
+            return best[remaining][0]
+        if time.perf_counter() > deadline:
+            raise SolverTimeout
+        best_count, best_mask = 1, remaining
+        for mask in zero_masks[remaining & -remaining]:
+            if not mask & ~remaining and mask != remaining:
+                count = 1 + solve(remaining ^ mask)
+                if count > best_count:
+                    best_count, best_mask = count, mask
+        best[remaining] = (best_count, best_mask)
+        return best_count
+
+    solve(full)
+    clusters = []
+    remaining = full
+    while remaining:
+        mask = best[remaining][1]
+        clusters.append([user_ids[i] for i in range(n) if mask >> i & 1])
+        remaining ^= mask
+    return clusters
+
+
+def _heuristic_clusters(balances: dict[int, int], deadline: float) -> list[list[int]]:
+    """Peels off zero-sum triples (a + b = -c) while time allows; the rest forms one cluster."""
+    remaining = dict(balances)
+    clusters = []
+    by_amount: dict[int, list[int]] = defaultdict(list)
+    for user_id, balance in remaining.items():
+        by_amount[balance].append(user_id)
+
+    found = True
+    while found and len(remaining) >= 3 and time.perf_counter() < deadline:
+        found = False
+        user_ids = list(remaining)
+        for index, first in enumerate(user_ids):
+            for second in user_ids[index + 1:]:
+                a, b = remaining[first], remaining[second]
+                if (a > 0) != (b > 0):
+                    continue
+                candidates = [uid for uid in by_amount.get(-(a + b), ()) if uid in remaining]
+                if candidates:
+                    third = candidates[0]
+                    clusters.append([first, second, third])
+                    for uid in (first, second, third):
+                        by_amount[remaining.pop(uid)].remove(uid)
+                    found = True
+                    break
+            if found or time.perf_counter() > deadline:
+                break
+    if remaining:
+        clusters.append(list(remaining))
+    return clusters
+
+
+def _cluster_transfers(balances: dict[int, int], clusters: list[list[int]]) -> list[Transfer]:
+    transfers: list[Transfer] = []
+    for cluster in clusters:
+        transfers.extend(greedy_transfers({user_id: balances[user_id] for user_id in cluster}))
+    return transfers
+
+
+def optimal_transfers(
+    balances: dict[int, int],
+    *,
+    max_exact: int | None = None,
+    time_budget_secs: float | None = None,
+) -> list[Transfer]:
+    """
+    Minimum number of transfers for up to max_exact non-zero balances (after pairing exact
+    opposites); larger groups, or an exact search that overruns the time budget, fall back to a
+    time-boxed heuristic. Never returns more transfers than greedy_transfers.
+    """
+    max_exact = SETTLEMENT_EXACT_MAX_BALANCES if max_exact is None else max_exact
+    budget = SETTLEMENT_TIME_BUDGET_SECS if time_budget_secs is None else time_budget_secs
+    deadline = time.perf_counter() + budget
+
+    pairs, rest = _pair_opposites(balances)
+    clusters = None
+    if len(rest) <= max_exact:
+        try:
+            clusters = _exact_clusters(rest, deadline)
+        except SolverTimeout:
+            clusters = None
+    if clusters is None:
+        clusters = _heuristic_clusters(rest, deadline)
+
+    transfers = _cluster_transfers(balances, pairs + clusters)
+    greedy = greedy_transfers(balances)
+    return transfers if len(transfers) <= len(greedy) else greedy
+
+
+SETTLEMENT_STRATEGIES = {
+    "greedy": greedy_transfers,
+    "optimal": optimal_transfers,
+}
+
+
+def settle(balances: dict[int, int], strategy: str = "greedy") -> list[Transfer]:
+    try:
+        solver = SETTLEMENT_STRATEGIES[strategy]
+    except KeyError:
+        raise ValueError(f"Unknown settlement strategy '{strategy}'")
+    return solver(balances)
@@ -0,0 +1,124 @@
+"""
+Cold-start import profile of the backend (or the rephraser), built from `python -X importtime`.
+
+Imports the module in fresh interpreters: a few plain runs time it, one -X importtime run breaks
+it down by package and by module. Exits 1 when the fastest run is over the module's budget or
+a module in DEFERRED_IMPORTS was loaded at import time.
+
+    python -m backend.startup_profile                         # backend.main
+    python -m backend.startup_profile --module rephraser.app
+    python -m backend.startup_profile --top 40 --runs 5
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+APP_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Fastest plain import of each service, in ms; a process also pays ~150ms of uvicorn before serving.
+# STARTUP_BUDGET_SCALE stretches every budget on slower machines.
+STARTUP_BUDGET_SCALE = float(os.getenv("STARTUP_BUDGET_SCALE", "1.0"))
+IMPORT_BUDGETS_MS = {"backend.main": 1500.0, "rephraser.app": 1000.0}
+
+# Loaded on first use instead of at import: the rephraser HTTP client (httpx), session cookies
+# (itsdangerous), password hashing (bcrypt, and multiprocessing for PASSWORD_EXECUTOR=process)
+# and schema migrations (alembic, which only `python -m backend.migrate` needs). email_validator
+# (EmailStr) and starlette.staticfiles are not listed: fastapi.openapi.models and fastapi.routing
+# import them whatever the app does, so deferring them here would not save anything
+DEFERRED_IMPORTS = {
+    "backend.main": ("httpx", "itsdangerous", "bcrypt", "multiprocessing", "alembic"),
+    "rephraser.app": (),
+}
+
+_TIMED_IMPORT = (
+    "import json, sys, time\n"
+    "started = time.perf_counter()\n"
+    "import {module}\n"
+    "print(json.dumps({{'ms': (time.perf_counter() - started) * 1000, 'modules': sorted(sys.modules)}}))\n"
+)
+
+
+def _run(module: str, *flags: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *flags, "-c", _TIMED_IMPORT.format(module=module)],
+        cwd=APP_DIR, capture_output=True, text=True, check=True,
+    )
+
+
+def time_import(module: str, runs: int = 3) -> dict:
+    """Fastest of `runs` cold imports: {"ms", "runs_ms", "deferred_loaded"}."""
+    results = [json.loads(_run(module).stdout) for _ in range(runs)]
+    loaded = set(results[0]["modules"])
+    return {
+        "ms": min(result["ms"] for result in results),
+        "runs_ms": [result["ms"] for result in results],
+        "deferred_loaded": [name for name in DEFERRED_IMPORTS.get(module, ()) if name in loaded],
+    }
+
+
+def parse_importtime(stderr: str) -> list[tuple[str, int, float, float]]:
+    """-X importtime lines as (module, depth, self_ms, cumulative_ms), in the order they finished."""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        entries.append((name.strip(), depth, int(self_us) / 1000, int(cumulative_us) / 1000))
+    return entries
+
+
+def import_breakdown(module: str) -> list[tuple[str, int, float, float]]:
+    """The modules imported by `import module`, leaving out interpreter startup (site, encodings)."""
+    entries = parse_importtime(_run(module, "-X", "importtime").stderr)
+    end = next(i for i, entry in enumerate(entries) if entry[0] == module and entry[1] == 0)
+    start = end
+    while start > 0 and entries[start - 1][1] > 0:
+        start -= 1
+    return entries[start:end + 1]
+
+
+def package_totals(entries) -> list[tuple[str, float]]:
+    """Self time summed per top-level package, heaviest first."""
+    totals: dict[str, float] = {}
+    for name, _depth, self_ms, _cumulative_ms in entries:
+        package = name.split(".")[0]
+        totals[package] = totals.get(package, 0.0) + self_ms
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="backend.main", help="module to import (default backend.main)")
+    parser.add_argument("--runs", type=int, default=3, help="plain timed imports; the fastest is reported")
+    parser.add_argument("--top", type=int, default=20, help="rows per table")
+    args = parser.parse_args(argv)
+
+    timing = time_import(args.module, args.runs)
+    entries = import_breakdown(args.module)
+    budget = IMPORT_BUDGETS_MS.get(args.module, float("inf")) * STARTUP_BUDGET_SCALE
+
+    print(f"import {args.module}: {timing['ms']:.0f} ms fastest of "
+          f"{', '.join(f'{ms:.0f}' for ms in timing['runs_ms'])} (budget {budget:.0f} ms)")
+    print(f"\nheaviest packages (self time over {len(entries)} modules):")
+    for package, ms in package_totals(entries)[:args.top]:
+        print(f"  {ms:8.1f} ms  {package}")
+    print(f"\nheaviest direct imports of {args.module} (cumulative):")
+    chains = [entry for entry in entries if entry[1] == 1]
+    for name, _depth, _self_ms, cumulative_ms in sorted(chains, key=lambda e: e[3], reverse=True)[:args.top]:
+        print(f"  {cumulative_ms:8.1f} ms  {name}")
+
+    failed = False
+    if timing["ms"] > budget:
+        print(f"\nover budget by {timing['ms'] - budget:.0f} ms")
+        failed = True
+    if timing["deferred_loaded"]:
+        print(f"\nloaded at import, should be deferred: {', '.join(timing['deferred_loaded'])}")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
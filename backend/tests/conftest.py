@@ -5,6 +5,8 @@ from sqlalchemy.orm import sessionmaker
 
 from backend.models.user import Base   
 
+pytest_plugins = ["backend.tests.fixtures"]
+
 
 @pytest.fixture()
 def db():
@@ -0,0 +1,71 @@
+import asyncio
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+from backend.db import Base, async_database_url, build_async_engine, build_engine
+from backend.crud.users import create_user, get_user_by_username_async
+from backend.crud.groups import create_group, get_group_versions_for_user_async, get_group_with_members_async
+from backend.crud.expenses import create_expense, list_expense_rows_for_group_async, list_expenses_page, list_expenses_page_async
+from backend.crud.settlements import create_settlement_record, list_settlement_rows_for_group_async
+from backend.crud.balances import get_group_balances, get_group_balances_async
+
+
+def test_async_database_url():
+    assert async_database_url("sqlite:///./dev.db") == "sqlite+aiosqlite:///./dev.db"
+    assert async_database_url("mysql+pymysql://u:p@db/app") == "mysql+asyncmy://u:p@db/app"
+
+
+def test_async_reads_match_sync(tmp_path):
+    url = f"sqlite:///{tmp_path / 'app.db'}"
+    engine = build_engine(url)
+    Base.metadata.create_all(engine)
+    with sessionmaker(engine, autoflush=False)() as db:
+        alice = create_user(db, "alice", "alice@example.com", "hash1")
+        bob = create_user(db, "bob", "bob@example.com", "hash2")
+        group = create_group(db, name="Trip", owner_id=alice.id, member_ids=[bob.id], currency="GBP")
+        for i in range(5):
+            create_expense(
+                db, group_id=group.id, description=f"e{i}", amount_cents=1000, paid_by_id=alice.id,
+                category_id=None, splits=[{"user_id": alice.id, "amount_cents": 500}, {"user_id": bob.id, "amount_cents": 500}],
+            )
+        create_settlement_record(db, group_id=group.id, payer_id=bob.id, receiver_id=alice.id, amount_cents=500)
+        sync_page, sync_key = list_expenses_page(db, group.id, limit=3, paid_by_id=alice.id)
+        sync_balances = get_group_balances(db, group.id)
+        sync_version = group.version
+        ids = (alice.id, group.id)
+    engine.dispose()
+
+    async def scenario():
+        async_engine = build_async_engine(async_database_url(url))
+        try:
+            async with async_sessionmaker(async_engine)() as db:
+                user = await get_user_by_username_async(db, "alice")
+                versions = await get_group_versions_for_user_async(db, user.id)
+                group = await get_group_with_members_async(db, ids[1])
+                page, key = await list_expenses_page_async(db, ids[1], limit=3, paid_by_id=ids[0])
+                rest, _ = await list_expenses_page_async(db, ids[1], limit=3, after=key)
+                return {
+                    "user_id": user.id,
+                    "versions": versions,
+                    "members": sorted(m.user.username for m in group.members),
+                    "page": [e.id for e in page],
+                    "key": key,
+                    "rest": [e.id for e in rest],
+                    "splits": [len(e.splits) for e in page],
+                    "all": len((await list_expense_rows_for_group_async(db, ids[1]))[0]),
+                    "settlements": [row[1] for row in await list_settlement_rows_for_group_async(db, ids[1])],
+                    "balances": await get_group_balances_async(db, ids[1]),
+                }
+        finally:
+            await async_engine.dispose()
+
+    result = asyncio.run(scenario())
+    assert result["user_id"] == ids[0]
+    assert result["versions"] == [(ids[1], sync_version)]
+    assert result["members"] == ["alice", "bob"]
+    assert result["page"] == [e.id for e in sync_page]
+    assert result["key"] == sync_key
+    assert len(result["rest"]) == 2
+    assert result["splits"] == [2, 2, 2]
+    assert result["all"] == 5
+    assert result["settlements"] == ["bob"]
+    assert result["balances"] == sync_balances
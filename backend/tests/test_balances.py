@@ -0,0 +1,227 @@
+from types import SimpleNamespace
+import pytest
+from hypothesis import given, settings, strategies as st
+from sqlalchemy import create_engine, insert
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+from backend.crud.balances import (
+    SETTLEMENT_APPLIED_STATUSES,
+    _balance_upsert,
+    compute_balances_from_history,
+    get_group_balances,
+    find_balance_drift,
+    rebuild_group_balances,
+)
+from backend.crud.expenses import create_expense, update_expense, delete_expense, list_expenses_for_group
+from backend.crud.settlements import create_settlement_record, confirm_settlement, list_settlements_for_group
+from backend.main import member_balances_from_ledger
+from backend.models.group import Expense, ExpenseSplit, Group, GroupMember, GroupMemberBalance, Settlement
+from backend.models.user import Base, User
+
+
+def calculate_member_balances(group, expenses, applied_settlements) -> dict[int, int]:
+    """The full-history replay the ledger replaced, kept as its oracle."""
+    balances = {member.user_id: 0 for member in group.members if member.user}
+
+    for expense in expenses:
+        if expense.paid_by_id in balances:
+            balances[expense.paid_by_id] += expense.amount
+        for split in expense.splits:
+            if split.user_id in balances:
+                balances[split.user_id] -= split.amount
+
+    for record in applied_settlements:
+        if record.payer_id in balances:
+            balances[record.payer_id] += record.amount
+        if record.receiver_id in balances:
+            balances[record.receiver_id] -= record.amount
+
+    return balances
+
+
+def replay_group(db, group) -> dict[int, int]:
+    applied = [s for s in list_settlements_for_group(db, group.id) if s.status in SETTLEMENT_APPLIED_STATUSES]
+    return calculate_member_balances(group, list_expenses_for_group(db, group.id), applied)
+
+
+def test_ledger_tracks_expense_lifecycle(db, group, users):
+    owner, bob, _ = users
+
+    e = create_expense(
+        db,
+        group_id=group.id,
+        description="Dinner",
+        amount_cents=3000,
+        paid_by_id=owner.id,
+        category_id=None,
+        splits=[
+            {"user_id": owner.id, "amount_cents": 1500},
+            {"user_id": bob.id, "amount_cents": 1500},
+        ],
+    )
+    assert get_group_balances(db, group.id) == {owner.id: 1500, bob.id: -1500}
+
+    update_expense(
+        db,
+        e,
+        description="Dinner",
+        amount_cents=4000,
+        paid_by_id=bob.id,
+        category_id=None,
+        splits=[
+            {"user_id": owner.id, "amount_cents": 3000},
+            {"user_id": bob.id, "amount_cents": 1000},
+        ],
+    )
+    assert get_group_balances(db, group.id) == {owner.id: -3000, bob.id: 3000}
+
+    delete_expense(db, e)
+    assert get_group_balances(db, group.id) == {owner.id: 0, bob.id: 0}
+    assert find_balance_drift(db, group.id) == {}
+
+def test_ledger_applies_settlements_once(db, group, users):
+    owner, bob, _ = users
+    create_expense(
+        db,
+        group_id=group.id,
+        description="Taxi",
+        amount_cents=2000,
+        paid_by_id=owner.id,
+        category_id=None,
+        splits=[{"user_id": bob.id, "amount_cents": 2000}],
+    )
+
+    s = create_settlement_record(db, group_id=group.id, payer_id=bob.id, receiver_id=owner.id, amount_cents=2000)
+    assert get_group_balances(db, group.id) == {owner.id: 0, bob.id: 0}
+
+    confirm_settlement(db, s)
+    assert get_group_balances(db, group.id) == {owner.id: 0, bob.id: 0}
+    assert find_balance_drift(db, group.id) == {}
+
+@pytest.mark.filterwarnings("error::sqlalchemy.exc.SAWarning")
+def test_rebuild_repairs_drift(db, group, users):
+    owner, bob, _ = users
+    create_expense(
+        db,
+        group_id=group.id,
+        description="Lunch",
+        amount_cents=1000,
+        paid_by_id=owner.id,
+        category_id=None,
+        splits=[{"user_id": bob.id, "amount_cents": 1000}],
+    )
+    row = db.query(GroupMemberBalance).filter_by(group_id=group.id, user_id=bob.id).one()
+    row.balance = 0
+    db.commit()
+
+    assert find_balance_drift(db, group.id) == {bob.id: (0, -1000)}
+    rebuild_group_balances(db, group.id)
+    assert find_balance_drift(db, group.id) == {}
+
+
+def test_ledger_matches_a_replay_of_history(db, group, users):
+    owner, bob, cara = users
+    dinner = create_expense(
+        db,
+        group_id=group.id,
+        description="Dinner",
+        amount_cents=900,
+        paid_by_id=owner.id,
+        category_id=None,
+        splits=[{"user_id": uid, "amount_cents": 300} for uid in (owner.id, bob.id, cara.id)],
+    )
+    create_expense(
+        db,
+        group_id=group.id,
+        description="Fuel",
+        amount_cents=1200,
+        paid_by_id=cara.id,
+        category_id=None,
+        splits=[{"user_id": owner.id, "amount_cents": 700}, {"user_id": bob.id, "amount_cents": 500}],
+    )
+    update_expense(
+        db,
+        dinner,
+        description="Dinner",
+        amount_cents=1000,
+        paid_by_id=bob.id,
+        category_id=None,
+        splits=[{"user_id": owner.id, "amount_cents": 400}, {"user_id": cara.id, "amount_cents": 600}],
+    )
+    paid = create_settlement_record(db, group_id=group.id, payer_id=owner.id, receiver_id=bob.id, amount_cents=250)
+    confirm_settlement(db, paid)
+    create_settlement_record(db, group_id=group.id, payer_id=owner.id, receiver_id=cara.id, amount_cents=100)
+    db.expire_all()
+
+    assert member_balances_from_ledger(group, get_group_balances(db, group.id)) == replay_group(db, group)
+
+
+def test_balance_upsert_refuses_unsupported_dialects():
+    rows = [{"group_id": 1, "user_id": 1, "balance": 100}]
+    assert "ON CONFLICT" in str(_balance_upsert("postgresql", rows).compile(dialect=postgresql.dialect()))
+    with pytest.raises(NotImplementedError, match="mssql"):
+        _balance_upsert("mssql", rows)
+
+
+user_ids = st.integers(min_value=1, max_value=8)
+cents = st.integers(min_value=0, max_value=10**9)
+histories = st.fixed_dictionaries({
+    "members": st.sets(user_ids, max_size=6),
+    "expenses": st.lists(
+        st.tuples(st.integers(1, 2), user_ids, cents, st.dictionaries(user_ids, cents, max_size=5)),
+        max_size=20,
+    ),
+    "settlements": st.lists(
+        st.tuples(st.integers(1, 2), user_ids, user_ids, cents, st.sampled_from(["pending", "payer_confirmed", "complete"])),
+        max_size=8,
+    ),
+})
+
+
+def _store_history(db, history):
+    """Writes the history as rows, across groups 1 and 2, without touching the ledger."""
+    db.execute(insert(User), [{"id": uid, "username": f"user{uid}", "password_hash": "x"} for uid in range(1, 9)])
+    db.execute(insert(Group), [{"id": gid, "name": f"G{gid}", "owner_id": 1, "currency": "GBP"} for gid in (1, 2)])
+    if history["members"]:
+        db.execute(insert(GroupMember), [{"group_id": 1, "user_id": uid} for uid in history["members"]])
+    for expense_id, (group_id, payer, amount, splits) in enumerate(history["expenses"], start=1):
+        db.execute(insert(Expense), [{"id": expense_id, "group_id": group_id, "description": "e", "amount": amount,
+                                      "paid_by_id": payer, "split_mode": "custom"}])
+        if splits:
+            db.execute(insert(ExpenseSplit), [{"expense_id": expense_id, "user_id": uid, "amount": share}
+                                              for uid, share in splits.items()])
+    if history["settlements"]:
+        db.execute(insert(Settlement), [
+            {"group_id": group_id, "payer_id": payer, "receiver_id": receiver, "amount": amount, "status": status}
+            for group_id, payer, receiver, amount, status in history["settlements"]
+        ])
+
+
+def _replay_history(history) -> dict[int, int]:
+    group = SimpleNamespace(members=[SimpleNamespace(user_id=uid, user=object()) for uid in history["members"]])
+    expenses = [
+        SimpleNamespace(paid_by_id=payer, amount=amount,
+                        splits=[SimpleNamespace(user_id=uid, amount=share) for uid, share in splits.items()])
+        for group_id, payer, amount, splits in history["expenses"] if group_id == 1
+    ]
+    settlements = [
+        SimpleNamespace(payer_id=payer, receiver_id=receiver, amount=amount)
+        for group_id, payer, receiver, amount, status in history["settlements"]
+        if group_id == 1 and status in SETTLEMENT_APPLIED_STATUSES
+    ]
+    return calculate_member_balances(group, expenses, settlements)
+
+
+@settings(max_examples=150, deadline=None)
+@given(history=histories)
+def test_history_group_by_matches_the_replay(history):
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    try:
+        with Session(engine) as db:
+            _store_history(db, history)
+            group = db.get(Group, 1)
+            totals = compute_balances_from_history(db, 1)
+            assert member_balances_from_ledger(group, totals) == _replay_history(history)
+    finally:
+        engine.dispose()
@@ -0,0 +1,107 @@
+from backend.cache import MemoryCache, ReadModelCache, RedisCache, user_cache
+from backend.crud.users import create_user, update_user
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeRedis:
+    """Minimal stand-in for the subset of the redis client API the cache uses."""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.data = {}
+
+    def get(self, key):
+        item = self.data.get(key)
+        if item is None or item[1] <= self.clock():
+            return None
+        return item[0]
+
+    def set(self, key, value, ex=None):
+        self.data[key] = (value, self.clock() + ex)
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+
+def test_memory_cache_expires_and_evicts_lru():
+    clock = FakeClock()
+    cache = MemoryCache(max_entries=2, ttl_secs=10, clock=clock)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # a is now most recently used
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+    clock.now = 11
+    assert cache.get("a") is None
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"]) == (2, 2, 1)
+
+
+def test_redis_cache_round_trips_json():
+    clock = FakeClock()
+    cache = RedisCache(FakeRedis(clock), prefix="user_cache", ttl_secs=5)
+    cache.set("sam", {"id": 1, "username": "sam", "email": None})
+    assert cache.get("sam") == {"id": 1, "username": "sam", "email": None}
+    clock.now = 6
+    assert cache.get("sam") is None
+    assert cache.stats()["hits"] == 1
+
+
+def test_update_user_invalidates_cached_snapshot(db):
+    u = create_user(db, "kim", "kim@example.com", "hash")
+    user_cache.set("kim", {"id": u.id, "username": "kim", "email": "kim@example.com"})
+    update_user(db, u, email="kim2@example.com")
+    assert user_cache.get("kim") is None
+
+
+def test_read_model_cache_is_keyed_by_version_and_evicts_by_bytes():
+    cache = ReadModelCache(max_bytes=10)
+    cache.set(1, "group", 3, b"abcd")
+    assert cache.get(1, "group", 3) == b"abcd"
+    assert cache.get(1, "group", 4) is None
+    assert cache.get(1, "group", None) is None
+
+    cache.set(2, "group", 0, b"efgh")
+    cache.get(1, "group", 3)  # group 1 is now most recently used
+    cache.set(3, "group", 0, b"ijkl")
+    assert cache.get(2, "group", 0) is None
+    assert cache.get(1, "group", 3) == b"abcd"
+
+    cache.set(4, "group", 0, b"x" * 11)  # larger than the whole budget, never stored
+    assert cache.get(4, "group", 0) is None
+    stats = cache.stats()
+    assert stats["bytes"] == 8 and stats["entries"] == 2 and stats["evictions"] == 1
+
+
+def test_read_model_cache_invalidates_every_resource_of_a_group():
+    cache = ReadModelCache(max_bytes=1024)
+    cache.set(1, "group", 0, b"{}")
+    cache.set(1, "expenses:all", 0, b"[]")
+    cache.set(2, "group", 0, b"{}")
+    cache.invalidate_group(1)
+    assert cache.get(1, "group", 0) is None
+    assert cache.get(1, "expenses:all", 0) is None
+    assert cache.get(2, "group", 0) == b"{}"
+    assert cache.stats()["groups"] == 1
+
+
+def test_metrics_are_hidden_without_the_token(monkeypatch):
+    from fastapi.testclient import TestClient
+    from backend import main
+
+    client = TestClient(main.app)
+    assert client.get("/api/metrics").status_code == 404
+    monkeypatch.setattr(main, "METRICS_TOKEN", "s3cret")
+    assert client.get("/api/metrics").status_code == 404
+    assert client.get("/api/metrics", headers={"X-Metrics-Token": "guess"}).status_code == 404
+    response = client.get("/api/metrics", headers={"X-Metrics-Token": "s3cret"})
+    assert response.status_code == 200 and "user_cache" in response.json()
@@ -0,0 +1,137 @@
+import pytest
+from datetime import date
+from sqlalchemy import func, select, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import sessionmaker
+from backend import main
+from backend.crud.category import create_category
+from backend.crud.expenses import create_expense
+from backend.crud.groups import create_group
+from backend.crud.invites import create_group_invite
+from backend.crud.settlements import create_settlement_record
+from backend.crud.subscriptions import create_subscription
+from backend.crud.users import create_user
+from backend.db import Base, InstrumentedQueuePool, PoolMetrics, build_engine, pool_metrics
+from backend.models import user, group  # noqa: F401
+from backend.models.group import (
+    CategorySplit, Expense, ExpenseSplit, Group, GroupCategory, GroupMemberBalance, Settlement, Subscription,
+    SubscriptionMember,
+)
+
+
+def test_sqlite_connections_get_pragmas(tmp_path):
+    engine = build_engine(f"sqlite:///{tmp_path / 'app.db'}")
+    assert isinstance(engine.pool, InstrumentedQueuePool)
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+        assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 5000
+        assert conn.execute(text("PRAGMA foreign_keys")).scalar() == 1
+    engine.dispose()
+
+
+def test_foreign_keys_are_enforced(tmp_path):
+    engine = build_engine(f"sqlite:///{tmp_path / 'app.db'}")
+    Base.metadata.create_all(engine)
+    with pytest.raises(IntegrityError):
+        with engine.begin() as conn:
+            conn.execute(text("INSERT INTO group_members (group_id, user_id) VALUES (999, 999)"))
+    engine.dispose()
+
+
+@pytest.fixture()
+def fk_db(tmp_path):
+    # the conftest db is a bare in-memory engine; this one has build_engine's pragmas, foreign_keys=ON included
+    engine = build_engine(f"sqlite:///{tmp_path / 'app.db'}")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine, autoflush=False)()
+    assert session.execute(text("PRAGMA foreign_keys")).scalar() == 1
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
+
+
+def seed_group_with_dependents(db):
+    """A settled group whose category is referenced by an expense, a subscription and a category split."""
+    owner = create_user(db, "alice", "alice@example.com", "hash1")
+    bob = create_user(db, "bob", "bob@example.com", "hash2")
+    cara = create_user(db, "cara", "cara@example.com", "hash3")
+    trip = create_group(db, name="Trip", owner_id=owner.id, member_ids=[bob.id], currency="GBP")
+    category = create_category(
+        db, group_id=trip.id, name="Food", description="Meals out", budget=0,
+        splits=[{"username": owner.username, "share": 1}, {"username": bob.username, "share": 1}],
+    )
+    create_expense(
+        db, group_id=trip.id, description="Lunch", amount_cents=1000, paid_by_id=owner.id,
+        category_id=category.id, splits=[{"user_id": bob.id, "amount_cents": 1000}],
+    )
+    # settled up, so the group can be deleted with its ledger rows (now zero) still in place
+    create_settlement_record(db, group_id=trip.id, payer_id=bob.id, receiver_id=owner.id, amount_cents=1000)
+    create_subscription(
+        db, group_id=trip.id, name="Streaming", amount_cents=999, cadence="monthly", next_due=date(2026, 11, 1),
+        notes="", category_id=category.id, created_by_id=owner.id,
+        member_shares=[{"user_id": owner.id, "share": 1}, {"user_id": bob.id, "share": 1}],
+    )
+    create_group_invite(db, group_id=trip.id, inviter_id=owner.id, invitee_id=cara.id)
+    return main.CurrentUser(id=owner.id, username=owner.username, email=owner.email), trip, category
+
+
+def count(db, model) -> int:
+    return db.scalar(select(func.count()).select_from(model))
+
+
+def test_deleting_a_referenced_category_passes_foreign_key_checks(fk_db):
+    as_owner, trip, category = seed_group_with_dependents(fk_db)
+
+    main.delete_category(trip.id, category.id, db=fk_db, current_user=as_owner, background_tasks=None)
+
+    fk_db.expire_all()
+    assert fk_db.get(GroupCategory, category.id) is None
+    assert count(fk_db, CategorySplit) == 0
+    assert fk_db.scalars(select(Expense.category_id)).all() == [None]
+    assert fk_db.scalars(select(Subscription.category_id)).all() == [None]
+
+
+def test_deleting_a_group_removes_its_dependents_in_foreign_key_order(fk_db):
+    as_owner, trip, _ = seed_group_with_dependents(fk_db)
+
+    response = main.delete_group_endpoint(trip.id, current_user=as_owner, db=fk_db)
+
+    assert response.status_code == 204
+    fk_db.expire_all()
+    assert fk_db.get(Group, trip.id) is None
+    models = (
+        Expense, ExpenseSplit, Settlement, GroupCategory, CategorySplit, Subscription, SubscriptionMember,
+        GroupMemberBalance,
+    )
+    for model in models:
+        assert count(fk_db, model) == 0, model.__tablename__
+    assert fk_db.execute(text("PRAGMA foreign_key_check")).all() == []
+
+
+def test_pool_metrics_track_checkouts_and_saturation(tmp_path):
+    engine = build_engine(f"sqlite:///{tmp_path / 'app.db'}")
+    before = pool_metrics.checkouts
+    first = engine.connect()
+    second = engine.connect()
+    stats = pool_metrics.stats(engine.pool)
+    assert pool_metrics.checkouts == before + 2
+    assert stats["checked_out"] == 2
+    assert stats["saturation"] == 2 / (stats["size"] + stats["max_overflow"])
+    first.close()
+    second.close()
+    assert pool_metrics.stats(engine.pool)["checked_out"] == 0
+    engine.dispose()
+
+
+def test_pool_metrics_percentiles():
+    metrics = PoolMetrics()
+    for wait in range(1, 101):
+        metrics.record(float(wait))
+    metrics.record(250.0, timed_out=True)
+    stats = metrics.stats(object())
+    assert stats["timeouts"] == 1
+    assert stats["wait_ms_p50"] == 51.0
+    assert stats["wait_ms_max"] == 250.0
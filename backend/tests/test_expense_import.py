@@ -0,0 +1,101 @@
+import asyncio
+import pytest
+from backend.expense_import import RowError, detect_format, iter_row_batches, parse_splits
+
+
+async def _chunks(data: bytes, size: int):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+def _batches(data: bytes, fmt: str, batch_size: int = 2, chunk_size: int = 7):
+    async def collect():
+        return [batch async for batch in iter_row_batches(_chunks(data, chunk_size), fmt, batch_size)]
+    return asyncio.run(collect())
+
+
+def test_detect_format():
+    assert detect_format("text/csv; charset=utf-8") == "csv"
+    assert detect_format("application/x-ndjson") == "jsonl"
+    assert detect_format("application/json") is None
+    assert detect_format("application/octet-stream", "JSONL") == "jsonl"
+
+
+def test_csv_rows_are_streamed_in_batches():
+    body = (
+        "description,amount,paid_by,splits\r\n"
+        "Café,12.50,alice,alice:6.25;bob:6.25\r\n"
+        "\r\n"
+        '"Taxi, airport",9,bob,bob:9\r\n'
+        "Broken,1\r\n"
+    ).encode("utf-8")
+    batches = _batches(body, "csv")
+    assert [len(batch) for batch in batches] == [2, 1]
+    (line1, first), (line2, second) = batches[0]
+    assert (line1, first["description"], first["split_mode"]) == (2, "Café", "custom")
+    assert first["splits"] == [{"username": "alice", "amount": "6.25"}, {"username": "bob", "amount": "6.25"}]
+    assert (line2, second["description"]) == (4, "Taxi, airport")
+    line3, error = batches[1][0]
+    assert line3 == 5 and isinstance(error, RowError)
+
+
+def test_jsonl_rows_report_bad_lines():
+    body = b'{"description": "A", "amount": 1}\nnot json\n[1]\n'
+    [batch] = _batches(body, "jsonl", batch_size=10)
+    assert batch[0] == (1, {"description": "A", "amount": 1})
+    assert isinstance(batch[1][1], RowError) and isinstance(batch[2][1], RowError)
+
+
+def test_csv_header_must_name_required_columns():
+    with pytest.raises(RowError, match="paid_by"):
+        _batches(b"description,amount\nx,1\n", "csv")
+
+
+def test_parse_splits_rejects_malformed_entries():
+    assert parse_splits("") == []
+    with pytest.raises(RowError):
+        parse_splits("alice")
+
+
+@pytest.mark.parametrize("disconnects", [False, True])
+def test_import_publishes_only_once_it_completes(db, group, users, monkeypatch, disconnects):
+    from fastapi import BackgroundTasks
+    from starlette.requests import ClientDisconnect, Request
+    import backend.main as main
+
+    owner, bob, _ = users
+    monkeypatch.setattr(main, "EXPENSE_IMPORT_BATCH_SIZE", 1)
+
+    async def inline(fn, *args, **kwargs):  # the in-memory test database is per thread
+        return fn(*args, **kwargs)
+
+    monkeypatch.setattr(main, "run_in_threadpool", inline)
+    body = (
+        "description,amount,paid_by,splits\n"
+        f"Lunch,10,{owner.username},{bob.username}:10\n"
+        f"Taxi,4,{owner.username},{bob.username}:4\n"
+    ).encode()
+    messages = [{"type": "http.request", "body": body, "more_body": disconnects}, {"type": "http.disconnect"}]
+
+    async def receive():
+        return messages.pop(0)
+
+    request = Request({"type": "http", "method": "POST", "path": "/", "headers": [], "query_string": b""}, receive)
+    background_tasks = BackgroundTasks()
+    run = lambda: asyncio.run(main.import_group_expenses(
+        group.id, request, format="csv", current_user=owner, db=db, background_tasks=background_tasks,
+    ))
+    if disconnects:
+        with pytest.raises(ClientDisconnect):
+            run()
+    else:
+        assert run().imported == 2
+
+    # both batches committed either way, but only a completed import announces them
+    db.refresh(group)
+    assert group.version == 2
+    if disconnects:
+        assert background_tasks.tasks == []
+        return
+    [task] = background_tasks.tasks
+    assert task.args[1]["data"] == {"group_id": group.id, "version": 2, "op": "imported", "count": 2}
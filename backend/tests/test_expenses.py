@@ -1,4 +1,17 @@
-from backend.crud.expenses import create_expense, list_expenses_for_group, get_expense, update_expense, delete_expense
+from typing import List
+from pydantic import TypeAdapter
+from backend.crud.expenses import create_expense, list_expenses_for_group, list_expenses_page, get_expense, update_expense, delete_expense
+from backend.crud.expenses import list_expense_rows_for_group
+from backend.crud.settlements import create_settlement_record, list_settlement_rows_for_group, list_settlements_for_group
+from backend.fast_json import dumps
+from backend.main import (
+    ExpenseResponse,
+    SettlementRecordResponse,
+    expense_dicts_from_rows,
+    serialize_expense,
+    serialize_settlement_record,
+    settlement_record_dicts_from_rows,
+)
 
 def test_create_list_update_delete_expense(db, group, users):
     owner, bob, _ = users
@@ -42,3 +55,111 @@ def test_create_list_update_delete_expense(db, group, users):
 
     delete_expense(db, updated)
     assert get_expense(db, e.id) is None
+
+def test_list_expenses_page_walks_keyset(db, group, users):
+    owner, bob, _ = users
+    for i in range(5):
+        create_expense(
+            db,
+            group_id=group.id,
+            description=f"Item {i}",
+            amount_cents=100,
+            paid_by_id=owner.id if i % 2 else bob.id,
+            category_id=None,
+            splits=[{"user_id": owner.id, "amount_cents": 100}],
+        )
+
+    seen = []
+    after = None
+    while True:
+        page, after = list_expenses_page(db, group.id, limit=2, after=after)
+        seen.extend(e.description for e in page)
+        if after is None:
+            break
+    assert seen == [f"Item {i}" for i in reversed(range(5))]
+
+    page, after = list_expenses_page(db, group.id, limit=10, paid_by_id=bob.id)
+    assert [e.description for e in page] == ["Item 4", "Item 2", "Item 0"]
+    assert after is None
+
+
+
+def test_list_expenses_page_converts_aware_cursors_to_utc(db, group, users):
+    from datetime import datetime, timedelta, timezone
+    from sqlalchemy import text
+
+    owner, _, _ = users
+    for hour in range(3):
+        expense = create_expense(
+            db,
+            group_id=group.id,
+            description=f"Hour {hour}",
+            amount_cents=100,
+            paid_by_id=owner.id,
+            category_id=None,
+            splits=[{"user_id": owner.id, "amount_cents": 100}],
+        )
+        db.execute(text("UPDATE expenses SET created_at = :t WHERE id = :id"),
+                   {"t": f"2026-03-01 1{hour}:00:00", "id": expense.id})
+    db.commit()
+
+    page, (created_at, expense_id) = list_expenses_page(db, group.id, limit=1)
+    assert [e.description for e in page] == ["Hour 2"]
+    # the same instant written with a +02:00 offset, as a client in another zone would send it
+    aware = created_at.replace(tzinfo=timezone.utc).astimezone(timezone(timedelta(hours=2)))
+    page, _ = list_expenses_page(db, group.id, limit=1, after=(aware, expense_id))
+    assert [e.description for e in page] == ["Hour 1"]
+    page, _ = list_expenses_page(db, group.id, limit=5, created_from=aware)
+    assert [e.description for e in page] == ["Hour 2"]
+
+
+def test_bulk_create_expenses_inserts_splits_and_updates_ledger(db, group, users):
+    from backend.crud.balances import find_balance_drift, get_group_balances
+    from backend.crud.expenses import bulk_create_expenses
+
+    owner, bob, cara = users
+    items = [
+        {
+            "description": f"Row {i}",
+            "amount_cents": 900,
+            "paid_by_id": owner.id if i % 2 else bob.id,
+            "category_id": None,
+            "splits": [
+                {"user_id": owner.id, "amount_cents": 300},
+                {"user_id": bob.id, "amount_cents": 300},
+                {"user_id": cara.id, "amount_cents": 300},
+            ],
+        }
+        for i in range(5)
+    ]
+    assert bulk_create_expenses(db, group_id=group.id, items=items) == 5
+
+    listed = list_expenses_for_group(db, group.id)
+    assert sorted(e.description for e in listed) == [f"Row {i}" for i in range(5)]
+    assert all(len(e.splits) == 3 and e.created_at is not None for e in listed)
+    assert get_group_balances(db, group.id) == {owner.id: 300, bob.id: 1200, cara.id: -1500}
+    assert find_balance_drift(db, group.id) == {}
+
+
+def test_row_serialization_matches_response_models(db, group, users):
+    owner, bob, cara = users
+    for description, amount, splits in (
+        ("Taxi", 1001, [(owner, 334), (bob, 333), (cara, 334)]),
+        ("Café", 7, [(bob, 7)]),
+        ("Nothing split", 250, []),
+    ):
+        create_expense(
+            db, group_id=group.id, description=description, amount_cents=amount, paid_by_id=owner.id,
+            category_id=None, splits=[{"user_id": user.id, "amount_cents": cents} for user, cents in splits],
+        )
+    create_settlement_record(db, group_id=group.id, payer_id=bob.id, receiver_id=owner.id, amount_cents=1999)
+
+    expected = TypeAdapter(List[ExpenseResponse]).dump_json(
+        sorted((serialize_expense(e) for e in list_expenses_for_group(db, group.id)), key=lambda e: -e.id)
+    )
+    assert dumps(expense_dicts_from_rows(*list_expense_rows_for_group(db, group.id))) == expected
+
+    expected = TypeAdapter(List[SettlementRecordResponse]).dump_json(
+        [serialize_settlement_record(s) for s in list_settlements_for_group(db, group.id)]
+    )
+    assert dumps(settlement_record_dicts_from_rows(list_settlement_rows_for_group(db, group.id))) == expected
@@ -1,4 +1,24 @@
-from backend.crud.groups import create_group, get_groups_for_user, is_user_in_group, add_member_to_group
+import pytest
+from fastapi import BackgroundTasks, HTTPException, Request, Response
+from sqlalchemy import delete
+from backend.crud.groups import (
+    create_group,
+    get_groups_for_user,
+    is_user_in_group,
+    add_member_to_group,
+    bump_group_version,
+    bump_group_versions_for_user,
+    get_group_version_for_member,
+)
+from backend.models.group import GroupMember
+from backend.main import (
+    CurrentUser,
+    etag_matches,
+    group_etag,
+    group_not_modified,
+    publish_group_change,
+    require_group_member,
+)
 
 def test_create_group_adds_owner_and_members(db, users):
     owner, bob, cara = users
@@ -19,3 +39,86 @@ def test_get_groups_for_user(db, group, users):
     owner, _, _ = users
     gs = get_groups_for_user(db, owner.id)
     assert any(g.id == group.id for g in gs)
+
+def test_bump_group_version_is_monotonic(db, group):
+    assert group.version == 0
+    assert [bump_group_version(db, group.id) for _ in range(3)] == [1, 2, 3]
+    db.commit()
+    db.refresh(group)
+    assert group.version == 3
+
+def test_bump_group_version_rolls_back_with_the_write(db, group):
+    bump_group_version(db, group.id)
+    db.rollback()
+    db.refresh(group)
+    assert group.version == 0
+
+def test_publish_group_change_sends_delta_to_every_member(db, group, users):
+    background_tasks = BackgroundTasks()
+    version = publish_group_change(
+        background_tasks, group, "categories_changed", version=bump_group_version(db, group.id), op="deleted", category={"id": 9}
+    )
+    [task] = background_tasks.tasks
+    user_ids, message = task.args
+    assert user_ids == {user.id for user in users}
+    assert message == {
+        "type": "categories_changed",
+        "data": {"group_id": group.id, "version": version, "op": "deleted", "category": {"id": 9}},
+    }
+
+def test_group_version_lookup_requires_membership(db, group, users):
+    owner, bob, cara = users
+    other = create_group(db, name="Solo", owner_id=cara.id, member_ids=[], currency="GBP")
+    bump_group_version(db, group.id)
+    assert get_group_version_for_member(db, group.id, bob.id) == 1
+    assert get_group_version_for_member(db, other.id, bob.id) is None
+    assert get_group_version_for_member(db, 999, bob.id) is None
+    bump_group_versions_for_user(db, cara.id)
+    assert get_group_version_for_member(db, group.id, owner.id) == 2
+    assert get_group_version_for_member(db, other.id, cara.id) == 1
+
+def _request(if_none_match=None):
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+def test_group_not_modified_answers_304_for_the_current_version():
+    etag = group_etag(4, 7)
+    assert etag_matches(f'"x", {etag.removeprefix("W/")}', etag)
+    assert not etag_matches(group_etag(4, 6), etag)
+
+    response = Response()
+    assert group_not_modified(_request(), response, 4, 7) is None
+    assert response.headers["etag"] == etag
+
+    not_modified = group_not_modified(_request(etag), Response(), 4, 7)
+    assert not_modified.status_code == 304 and not_modified.headers["etag"] == etag
+    assert group_not_modified(_request(etag), Response(), 4, 8) is None
+    assert group_not_modified(_request(etag), Response(), 4, None) is None
+
+
+def test_require_group_member_tells_missing_groups_from_refusals(db, users):
+    owner, _, cara = users
+    solo = create_group(db, name="Solo", owner_id=owner.id, member_ids=[], currency="GBP")
+    as_user = lambda user: CurrentUser(id=user.id, username=user.username, email=user.email)
+    admitted = require_group_member(solo.id, current_user=as_user(owner), db=db)
+    assert admitted.id == owner.id
+    assert admitted.group_version == get_group_version_for_member(db, solo.id, owner.id)
+    with pytest.raises(HTTPException) as refused:
+        require_group_member(solo.id, current_user=as_user(cara), db=db)
+    assert refused.value.status_code == 403
+    with pytest.raises(HTTPException) as missing:
+        require_group_member(999, current_user=as_user(owner), db=db)
+    assert missing.value.status_code == 404
+
+
+def test_removed_member_is_refused_at_once(db, group, users):
+    owner, bob, _ = users
+    as_bob = CurrentUser(id=bob.id, username=bob.username, email=bob.email)
+    assert require_group_member(group.id, current_user=as_bob, db=db).id == bob.id
+
+    # a removal made through another worker is seen on the very next request
+    db.execute(delete(GroupMember).where(GroupMember.group_id == group.id, GroupMember.user_id == bob.id))
+    db.commit()
+    with pytest.raises(HTTPException) as refused:
+        require_group_member(group.id, current_user=as_bob, db=db)
+    assert refused.value.status_code == 403
@@ -0,0 +1,86 @@
+import pytest
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.runtime.migration import MigrationContext
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.orm import Session
+from backend.crud.balances import compute_balances_from_history, get_group_balances
+from backend.db import SCHEMA_REVISION, Base, SchemaOutOfDate, check_schema_revision, current_schema_revision
+from backend.migrate import alembic_config, head_revision, upgrade_database
+
+
+def test_migrations_build_the_model_schema(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'migrated.db'}")
+    assert upgrade_database(engine) == SCHEMA_REVISION
+    with engine.connect() as conn:
+        assert compare_metadata(MigrationContext.configure(conn), Base.metadata) == []
+    indexes = {index["name"] for index in inspect(engine).get_indexes("group_members")}
+    assert "ix_group_members_user_group" in indexes
+    engine.dispose()
+
+
+def test_schema_revision_matches_the_latest_migration():
+    assert SCHEMA_REVISION == head_revision()
+
+
+def test_startup_check_refuses_unmigrated_databases(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'app.db'}")
+    with pytest.raises(SchemaOutOfDate, match="no revision"):
+        check_schema_revision(engine)
+    upgrade_database(engine)
+    assert check_schema_revision(engine) == SCHEMA_REVISION
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE alembic_version SET version_num = '0001'"))
+    with pytest.raises(SchemaOutOfDate, match="at 0001"):
+        check_schema_revision(engine)
+    engine.dispose()
+
+
+def test_pre_migration_database_is_stamped_and_upgraded(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    # what create_all built before migrations existed: revision 0001, with no alembic_version
+    with engine.begin() as conn:
+        command.upgrade(alembic_config(conn), "0001")
+        conn.execute(text("DROP TABLE alembic_version"))
+        assert "group_member_balances" not in inspect(conn).get_table_names()
+        assert "version" not in {column["name"] for column in inspect(conn).get_columns("groups")}
+        conn.execute(text("INSERT INTO users (id, username, password_hash) VALUES (1, 'alice', 'x'), (2, 'bob', 'x')"))
+        conn.execute(text("INSERT INTO groups (id, name, owner_id, currency) VALUES (1, 'Trip', 1, 'GBP')"))
+        conn.execute(text(
+            "INSERT INTO expenses (id, group_id, description, amount, paid_by_id, split_mode) "
+            "VALUES (1, 1, 'Taxi', 2000, 1, 'equal')"
+        ))
+        conn.execute(text("INSERT INTO expense_splits (expense_id, user_id, amount) VALUES (1, 2, 2000)"))
+    assert current_schema_revision(engine) is None
+
+    assert upgrade_database(engine) == SCHEMA_REVISION
+    with engine.connect() as conn:
+        assert compare_metadata(MigrationContext.configure(conn), Base.metadata) == []
+        assert conn.execute(text("SELECT username FROM users WHERE id = 1")).scalar() == "alice"
+    with Session(engine) as db:
+        assert get_group_balances(db, 1) == {1: 2000, 2: -2000}
+    engine.dispose()
+
+
+def test_ledger_is_backfilled_for_groups_that_predate_it(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'ledgerless.db'}")
+    with engine.begin() as conn:
+        command.upgrade(alembic_config(conn), "0003")
+        conn.execute(text("INSERT INTO users (id, username, password_hash) VALUES (1, 'alice', 'x'), (2, 'bob', 'x')"))
+        conn.execute(text("INSERT INTO groups (id, name, owner_id, currency) VALUES (1, 'Trip', 1, 'GBP')"))
+        conn.execute(text(
+            "INSERT INTO expenses (id, group_id, description, amount, paid_by_id, split_mode) "
+            "VALUES (1, 1, 'Hotel', 3000, 1, 'equal')"
+        ))
+        conn.execute(text("INSERT INTO expense_splits (expense_id, user_id, amount) VALUES (1, 1, 1500), (1, 2, 1500)"))
+        conn.execute(text(
+            "INSERT INTO settlements (group_id, payer_id, receiver_id, amount, status) "
+            "VALUES (1, 2, 1, 500, 'complete'), (1, 2, 1, 700, 'pending')"
+        ))
+
+    upgrade_database(engine)
+    with Session(engine) as db:
+        assert get_group_balances(db, 1) == {1: 1000, 2: -1000}
+        assert get_group_balances(db, 1) == compute_balances_from_history(db, 1)
+        assert db.execute(text("SELECT version FROM groups WHERE id = 1")).scalar() == 1
+    engine.dispose()
@@ -0,0 +1,209 @@
+import asyncio
+import json
+import pytest
+from backend.notifications import (
+    ConnectionManager,
+    RedisBus,
+    WS_IDLE_CLOSE_CODE,
+    WS_LIMIT_CLOSE_CODE,
+    WS_SLOW_CONSUMER_CLOSE_CODE,
+)
+
+
+class FakeSocket:
+    def __init__(self, blocked: bool = False):
+        self.sent: list[str] = []
+        self.closed_with = None
+        self.incoming: asyncio.Queue[str] = asyncio.Queue()
+        self.unblocked = asyncio.Event()
+        if not blocked:
+            self.unblocked.set()
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text: str):
+        await self.unblocked.wait()
+        self.sent.append(text)
+
+    async def receive_text(self) -> str:
+        return await self.incoming.get()
+
+    async def close(self, code: int = 1000):
+        self.closed_with = code
+
+
+class FakeRedisPubSub:
+    """Minimal stand-in for the redis.asyncio pub/sub API the bus uses."""
+
+    def __init__(self, server):
+        self.server = server
+        self.inbox: asyncio.Queue = asyncio.Queue()
+
+    async def subscribe(self, channel):
+        self.server.setdefault(channel, []).append(self.inbox)
+
+    async def get_message(self, ignore_subscribe_messages=True, timeout=1.0):
+        try:
+            return await asyncio.wait_for(self.inbox.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def unsubscribe(self, channel):
+        self.server[channel].remove(self.inbox)
+
+    async def aclose(self):
+        pass
+
+
+class FakeRedis:
+    def __init__(self, server: dict):
+        self.server = server
+
+    def pubsub(self):
+        return FakeRedisPubSub(self.server)
+
+    async def publish(self, channel, data):
+        for inbox in self.server.get(channel, []):
+            inbox.put_nowait({"type": "message", "channel": channel, "data": data.encode()})
+        return len(self.server.get(channel, []))
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_publish_serializes_once_and_reaches_every_socket():
+    async def scenario():
+        manager = ConnectionManager(queue_size=4)
+        first, second, other = FakeSocket(), FakeSocket(), FakeSocket()
+        await manager.connect(1, first)
+        await manager.connect(1, second)
+        await manager.connect(2, other)
+        await manager.publish([1, 2, 3], {"type": "expense_update", "data": {"group_id": 7}})
+        await settle()
+        await manager.close_all()
+        return manager, first, second, other
+
+    manager, first, second, other = asyncio.run(scenario())
+    assert first.sent == second.sent == other.sent
+    assert json.loads(first.sent[0]) == {"type": "expense_update", "data": {"group_id": 7}}
+    assert first.sent[0] is other.sent[0]
+    assert manager.stats()["published"] == 1
+    assert manager.stats()["sent"] == 3
+
+
+def test_slow_consumer_drops_oldest_without_delaying_others():
+    async def scenario():
+        manager = ConnectionManager(queue_size=2, slow_consumer_policy="drop")
+        slow, fast = FakeSocket(blocked=True), FakeSocket()
+        await manager.connect(1, slow)
+        await manager.connect(2, fast)
+        for n in range(5):
+            await manager.publish([1, 2], {"n": n})
+            await settle()
+        stats = manager.stats()
+        slow.unblocked.set()
+        await settle()
+        await manager.close_all()
+        return stats, slow, fast
+
+    stats, slow, fast = asyncio.run(scenario())
+    assert [json.loads(text)["n"] for text in fast.sent] == [0, 1, 2, 3, 4]
+    # the writer holds message 0; the queue kept the newest two
+    assert [json.loads(text)["n"] for text in slow.sent] == [0, 3, 4]
+    assert stats["dropped"] == 2
+    assert stats["queue_depth_max"] == 2
+
+
+def test_slow_consumer_disconnect_policy_closes_the_socket():
+    async def scenario():
+        manager = ConnectionManager(queue_size=1, slow_consumer_policy="disconnect")
+        slow = FakeSocket(blocked=True)
+        await manager.connect(1, slow)
+        for n in range(3):
+            await manager.publish([1], {"n": n})
+            await settle()
+        await manager.close_all()
+        return manager, slow
+
+    manager, slow = asyncio.run(scenario())
+    assert slow.closed_with == WS_SLOW_CONSUMER_CLOSE_CODE
+    assert manager.stats()["slow_disconnects"] == 1
+    assert manager.stats()["connections"] == 0
+
+
+def test_redis_bus_reaches_sockets_on_other_workers():
+    async def scenario():
+        server = {}
+        worker_a = ConnectionManager(bus=RedisBus(FakeRedis(server), channel="test"))
+        worker_b = ConnectionManager(bus=RedisBus(FakeRedis(server), channel="test"))
+        on_a, on_b = FakeSocket(), FakeSocket()
+        await worker_a.connect(1, on_a)
+        await worker_b.connect(2, on_b)
+        await worker_a.publish([2], {"type": "invite", "data": {"id": 3}})
+        await worker_b.publish([1, 2], {"type": "group_update", "data": {"group_id": 5}})
+        for _ in range(20):
+            await asyncio.sleep(0)
+        stats = worker_b.stats()["bus"]
+        await worker_a.close_all()
+        await worker_b.close_all()
+        return on_a, on_b, stats, server
+
+    on_a, on_b, stats, server = asyncio.run(scenario())
+    assert [json.loads(text)["type"] for text in on_a.sent] == ["group_update"]
+    assert [json.loads(text)["type"] for text in on_b.sent] == ["invite", "group_update"]
+    assert stats["published"] == 1 and stats["received"] == 2
+    assert server["test"] == []
+
+
+def test_silent_clients_are_pinged_then_reaped():
+    async def scenario():
+        manager = ConnectionManager(ping_interval_secs=0.01, idle_timeout_secs=0.05)
+        silent, chatty = FakeSocket(), FakeSocket()
+        silent_connection = await manager.connect(1, silent)
+        chatty_connection = await manager.connect(2, chatty)
+
+        async def answer_pings():
+            while True:
+                chatty.incoming.put_nowait('{"type":"pong"}')
+                await asyncio.sleep(0.005)
+
+        chatty_tasks = [asyncio.create_task(manager.serve(chatty_connection)), asyncio.create_task(answer_pings())]
+        await asyncio.wait_for(manager.serve(silent_connection), 1)
+        still_open = manager.stats()["connections"]
+        for task in chatty_tasks:
+            task.cancel()
+        await manager.close_all()
+        return manager, silent, chatty, still_open
+
+    manager, silent, chatty, still_open = asyncio.run(scenario())
+    assert silent.closed_with == WS_IDLE_CLOSE_CODE
+    assert json.loads(silent.sent[0]) == {"type": "ping"}
+    assert chatty.closed_with is None and still_open == 1
+    assert manager.stats()["reaped"] == 1
+
+
+def test_connection_caps_refuse_extra_sockets():
+    async def scenario():
+        manager = ConnectionManager(max_connections=3, max_connections_per_user=2)
+        sockets = [FakeSocket() for _ in range(5)]
+        accepted = [
+            await manager.connect(user_id, socket) is not None
+            for user_id, socket in zip([1, 1, 1, 2, 3], sockets)
+        ]
+        stats = manager.stats()
+        await manager.close_all()
+        return accepted, sockets, stats
+
+    accepted, sockets, stats = asyncio.run(scenario())
+    assert accepted == [True, True, False, True, False]
+    assert sockets[2].closed_with == sockets[4].closed_with == WS_LIMIT_CLOSE_CODE
+    assert stats["connections"] == stats["peak_connections"] == 3
+    assert stats["rejected"] == 2
+
+
+def test_rejects_unknown_policy():
+    with pytest.raises(ValueError):
+        ConnectionManager(slow_consumer_policy="block")
@@ -0,0 +1,27 @@
+import asyncio
+import pytest
+from backend.passwords import PasswordHasher, PasswordPoolBusy, hash_rounds
+
+
+def test_hash_verify_and_rehash_detection():
+    hasher = PasswordHasher(rounds=4, workers=1, max_pending=4)
+    try:
+        hashed = asyncio.run(hasher.hash("correct horse"))
+        assert hash_rounds(hashed) == 4
+        assert asyncio.run(hasher.verify("correct horse", hashed))
+        assert not asyncio.run(hasher.verify("wrong", hashed))
+        assert not asyncio.run(hasher.verify("anything", "not-a-bcrypt-hash"))
+
+        assert not hasher.needs_rehash(hashed)
+        hasher.rounds = 5
+        assert hasher.needs_rehash(hashed)
+        assert hasher.stats()["pending"] == 0
+    finally:
+        hasher.shutdown()
+
+
+def test_rejects_work_beyond_max_pending():
+    hasher = PasswordHasher(rounds=4, workers=1, max_pending=0)
+    with pytest.raises(PasswordPoolBusy):
+        asyncio.run(hasher.hash("correct horse"))
+    assert hasher.stats()["rejected"] == 1
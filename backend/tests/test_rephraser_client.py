@@ -0,0 +1,118 @@
+import asyncio
+import httpx
+from backend.rephraser_client import CircuitBreaker, RephraserClient
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_client(handler, clock, threshold=2, cooldown=30):
+    return RephraserClient(
+        "http://rephraser.test",
+        timeout_secs=1.0,
+        max_connections=2,
+        breaker=CircuitBreaker(failure_threshold=threshold, cooldown_secs=cooldown, clock=clock),
+        transport=httpx.MockTransport(handler),
+    )
+
+
+def test_breaker_trips_and_short_circuits():
+    clock = FakeClock()
+    hits = []
+
+    def failing(request):
+        hits.append(request)
+        return httpx.Response(500)
+
+    client = make_client(failing, clock)
+
+    async def scenario():
+        results = [await client.rephrase({"groups": []}) for _ in range(4)]
+        await client.aclose()
+        return results
+
+    assert asyncio.run(scenario()) == [None] * 4
+    assert len(hits) == 2  # the last two calls never reached the service
+    stats = client.stats()
+    assert stats["breaker"]["state"] == "open"
+    assert stats["short_circuits"] == 2
+    assert stats["fallback_rate"] == 1.0
+
+
+def test_half_open_trial_closes_breaker_on_success():
+    clock = FakeClock()
+    responses = [httpx.Response(503), httpx.Response(503), httpx.Response(200, json={"summary": "All square.", "mode": "template"})]
+    client = make_client(lambda request: responses.pop(0), clock)
+
+    async def scenario():
+        first = [await client.rephrase({}) for _ in range(2)]
+        clock.now = 31
+        recovered = await client.rephrase({})
+        await client.aclose()
+        return first, recovered
+
+    first, recovered = asyncio.run(scenario())
+    assert first == [None, None]
+    assert recovered == ("All square.", "template")
+    assert client.breaker.state == "closed"
+
+
+def test_cancelled_half_open_trial_frees_the_slot():
+    clock = FakeClock()
+    responses = [httpx.Response(503), httpx.Response(503)]
+
+    async def handler(request):
+        if responses:
+            return responses.pop(0)
+        await asyncio.sleep(10)
+
+    client = make_client(handler, clock)
+
+    async def scenario():
+        for _ in range(2):
+            await client.rephrase({})
+        clock.now = 31
+        trial = asyncio.create_task(client.rephrase({}))
+        await asyncio.sleep(0.01)
+        trial.cancel()
+        try:
+            await trial
+        except asyncio.CancelledError:
+            pass
+        allowed = client.breaker.allow()
+        await client.aclose()
+        return allowed
+
+    assert asyncio.run(scenario()) is True
+    assert client.breaker.state == "half_open"
+
+
+def test_pool_stays_on_its_loop_and_other_loops_get_closed_clients():
+    ok = lambda request: httpx.Response(200, json={"summary": "All square.", "mode": "template"})
+    client = make_client(ok, FakeClock())
+    created = []
+    new_client = client._new_client
+    client._new_client = lambda: created.append(new_client()) or created[-1]
+
+    async def app_loop():
+        client.attach_to_running_loop()
+        for _ in range(3):
+            await client.rephrase({})
+        pooled = client._client
+        await client.aclose()
+        return pooled
+
+    pooled = asyncio.run(app_loop())
+    assert created == [pooled] and pooled.is_closed
+
+    async def other_loop():
+        await client.rephrase({})
+        await client.rephrase({})
+
+    asyncio.run(other_loop())
+    assert len(created) == 3 and all(c.is_closed for c in created) and client._client is None
@@ -0,0 +1,74 @@
+import random
+import time
+import pytest
+from backend.settlement_strategies import greedy_transfers, optimal_transfers, settle
+
+
+def _apply(balances, transfers):
+    remaining = dict(balances)
+    for payer, receiver, amount in transfers:
+        assert amount > 0
+        remaining[payer] += amount
+        remaining[receiver] -= amount
+    return remaining
+
+
+def _min_transfers(amounts):
+    """Reference O(2^n * n) DP: n minus the most zero-sum groups the amounts split into."""
+    n = len(amounts)
+    sums = [0] * (1 << n)
+    groups = [0] * (1 << n)
+    for mask in range(1, 1 << n):
+        low = (mask & -mask).bit_length() - 1
+        sums[mask] = sums[mask ^ (1 << low)] + amounts[low]
+        groups[mask] = max(groups[mask ^ (1 << i)] for i in range(n) if mask >> i & 1) + (sums[mask] == 0)
+    return n - groups[-1]
+
+
+def _random_balances(rng, size):
+    values = [rng.choice([5, 10, 15, 20, 30]) * 100 * rng.choice([1, -1]) for _ in range(size - 1)]
+    values.append(-sum(values))
+    return {user_id: value for user_id, value in enumerate(values, start=1) if value}
+
+
+def test_greedy_matches_largest_debtor_with_largest_creditor():
+    assert greedy_transfers({1: 500, 2: -300, 3: -200, 4: 0}) == [(2, 1, 300), (3, 1, 200)]
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_optimal_is_minimal_and_settles_everyone(seed):
+    rng = random.Random(seed)
+    balances = _random_balances(rng, rng.randint(2, 11))
+    transfers = optimal_transfers(balances)
+    assert set(_apply(balances, transfers).values()) <= {0}
+    assert len(transfers) == _min_transfers(list(balances.values()))
+    assert len(transfers) <= len(greedy_transfers(balances))
+
+
+def test_optimal_beats_greedy_on_split_clusters():
+    # {1,2,3} and {4,5,6} settle separately in 2 transfers each; greedy needs 5.
+    balances = {1: 700, 2: -400, 3: -300, 4: 650, 5: -350, 6: -300}
+    assert len(greedy_transfers(balances)) == 5
+    assert len(optimal_transfers(balances)) == 4
+
+
+def test_large_groups_fall_back_to_the_heuristic_and_still_settle():
+    balances = _random_balances(random.Random(7), 60)
+    transfers = optimal_transfers(balances, time_budget_secs=0.05)
+    assert set(_apply(balances, transfers).values()) <= {0}
+    assert len(transfers) <= len(greedy_transfers(balances))
+
+
+def test_unknown_strategy():
+    with pytest.raises(ValueError):
+        settle({1: 100, 2: -100}, "fastest")
+
+
+def test_time_budget_covers_the_zero_sum_enumeration():
+    # equal amounts make nearly every half-subset match, which alone would run for many seconds
+    balances = {user_id: 100 for user_id in range(1, 13)}
+    balances.update({user_id: -50 for user_id in range(13, 37)})
+    started = time.perf_counter()
+    transfers = optimal_transfers(balances, max_exact=40, time_budget_secs=0.05)
+    assert time.perf_counter() - started < 2
+    assert set(_apply(balances, transfers).values()) <= {0}
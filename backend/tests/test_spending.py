@@ -0,0 +1,34 @@
+from backend.crud.expenses import create_expense
+from backend.crud.groups import create_group
+from backend.crud.spending import spending_summary_rows
+
+def test_spending_summary_rows_per_group_and_currency(db, group, users):
+    owner, bob, cara = users
+    usd = create_group(db, name="NYC", owner_id=owner.id, member_ids=[bob.id], currency="USD")
+    create_group(db, name="Other", owner_id=bob.id, member_ids=[cara.id], currency="GBP")
+
+    create_expense(
+        db,
+        group_id=group.id,
+        description="Dinner",
+        amount_cents=3000,
+        paid_by_id=owner.id,
+        category_id=None,
+        splits=[{"user_id": owner.id, "amount_cents": 1000}, {"user_id": bob.id, "amount_cents": 2000}],
+    )
+    create_expense(
+        db,
+        group_id=usd.id,
+        description="Taxi",
+        amount_cents=500,
+        paid_by_id=bob.id,
+        category_id=None,
+        splits=[{"user_id": owner.id, "amount_cents": 500}],
+    )
+
+    groups, currencies = spending_summary_rows(db, owner.id)
+    by_group = {row.group_id: (row.currency, row.paid_cents, row.owed_cents) for row in groups}
+    assert by_group == {group.id: ("GBP", 3000, 1000), usd.id: ("USD", 0, 500)}
+
+    by_currency = {row.currency: (row.paid_cents, row.owed_cents) for row in currencies}
+    assert by_currency == {"GBP": (3000, 1000), "USD": (0, 500)}
@@ -0,0 +1,42 @@
+import os
+import pytest
+from backend.startup_profile import (
+    DEFERRED_IMPORTS, IMPORT_BUDGETS_MS, STARTUP_BUDGET_SCALE, import_breakdown, package_totals, parse_importtime,
+    time_import,
+)
+
+# wall-clock budgets depend on the machine, so they only run when asked for
+budget_run = pytest.mark.skipif(
+    os.getenv("STARTUP_BUDGET_TESTS") != "1", reason="set STARTUP_BUDGET_TESTS=1 to time cold imports"
+)
+
+
+@pytest.mark.parametrize("module", sorted(DEFERRED_IMPORTS))
+def test_deferred_modules_are_not_loaded_at_import(module):
+    assert time_import(module, runs=1)["deferred_loaded"] == []
+
+
+@budget_run
+@pytest.mark.parametrize("module", sorted(IMPORT_BUDGETS_MS))
+def test_cold_import_stays_within_budget(module):
+    timing = time_import(module, runs=3)
+    assert timing["ms"] <= IMPORT_BUDGETS_MS[module] * STARTUP_BUDGET_SCALE, timing["runs_ms"]
+
+
+def test_import_breakdown_covers_only_the_module():
+    entries = import_breakdown("backend.settlement_strategies")
+    assert entries[-1][:2] == ("backend.settlement_strategies", 0)
+    assert all(depth > 0 for _name, depth, _self, _cumulative in entries[:-1])
+    assert "site" not in {name for name, *_ in entries}
+
+
+def test_parse_importtime():
+    stderr = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       500 |        500 |     json.decoder\n"
+        "import time:      1500 |       2000 |   json\n"
+        "import time:      3000 |       5000 | backend.cache\n"
+    )
+    entries = parse_importtime(stderr)
+    assert entries == [("json.decoder", 2, 0.5, 0.5), ("json", 1, 1.5, 2.0), ("backend.cache", 0, 3.0, 5.0)]
+    assert package_totals(entries) == [("backend", 3.0), ("json", 2.0)]
@@ -0,0 +1,52 @@
+import asyncio
+from backend import main
+from backend.cache import rephrase_cache
+from backend.crud.expenses import create_expense
+from backend.main import CurrentUser, rephraser_cache_key, profile_spending_summary_text
+
+
+def test_rephraser_cache_key_is_stable_and_payload_sensitive():
+    facts = {"group_count": 1, "groups": [{"group_name": "Trip", "paid": "£5.00", "owed": "£2.00", "net": "£3.00"}]}
+    reordered = {"groups": [{"net": "£3.00", "owed": "£2.00", "paid": "£5.00", "group_name": "Trip"}], "group_count": 1}
+    assert rephraser_cache_key(facts, 2) == rephraser_cache_key(reordered, 2)
+    assert rephraser_cache_key(facts, 2) != rephraser_cache_key(facts, 1)
+
+
+def test_summary_text_is_keyed_by_facts_and_fallbacks_are_not_cached(db, group, users, monkeypatch):
+    owner, bob, _ = users
+
+    async def inline(fn, *args, **kwargs):
+        return fn(*args, **kwargs)
+
+    calls = []
+    outcome = {"up": False}
+
+    async def rephrase(facts, max_sentences=2):
+        calls.append(facts)
+        return ("You are square.", "rephraser") if outcome["up"] else None
+
+    monkeypatch.setattr(main, "run_in_threadpool", inline)
+    monkeypatch.setattr(main.rephraser_client, "rephrase", rephrase)
+    rephrase_cache.clear()
+    as_owner = CurrentUser(id=owner.id, username=owner.username, email=owner.email)
+    view = lambda: asyncio.run(profile_spending_summary_text(current_user=as_owner, db=db))
+
+    # an outage answers with the fallback and caches nothing, so the next view retries
+    assert view().mode == "fallback"
+    outcome["up"] = True
+    assert view().mode == "rephraser"
+    assert view().mode == "rephraser"
+    assert len(calls) == 2
+
+    # new facts miss the cache on every worker, with no invalidation needed
+    create_expense(
+        db,
+        group_id=group.id,
+        description="Taxi",
+        amount_cents=1000,
+        paid_by_id=owner.id,
+        category_id=None,
+        splits=[{"user_id": bob.id, "amount_cents": 1000}],
+    )
+    assert view().mode == "rephraser"
+    assert len(calls) == 3 and calls[2] != calls[1]
@@ -16,7 +16,7 @@ async function fetchExpenses(groupId) {
   expensesError.value = ""
 
   try {
-    const res = await fetch(`/api/groups/${groupId}/expenses`, { credentials: "include" })
+    const res = await fetch(`/api/groups/${groupId}/expenses?all=true`, { credentials: "include" })
     if (!res.ok) {
       throw new Error("Unable to load expenses")
     }
@@ -174,22 +174,64 @@ async function confirmSettlement(groupId, settlementId) {
   }
 }
 
+function upsertById(items, item) {
+  const idx = items.findIndex((existing) => existing.id === item.id)
+  if (idx < 0) return [item, ...items]
+  const next = [...items]
+  next[idx] = item
+  return next
+}
+
+function applyRecommendations(groupId, recommendations) {
+  const summary = settlementsByGroup.value[groupId]
+  if (summary && Array.isArray(recommendations)) {
+    settlementsByGroup.value[groupId] = { ...summary, recommendations }
+  }
+}
+
+function applyExpenseChange(data) {
+  const groupId = data.group_id
+  const current = expensesByGroup.value[groupId]
+  if (!current) return
+  expensesByGroup.value[groupId] =
+    data.op === "deleted"
+      ? current.filter((expense) => expense.id !== data.expense.id)
+      : upsertById(current, data.expense)
+  applyRecommendations(groupId, data.recommendations)
+}
+
+function applySettlementChange(data) {
+  const groupId = data.group_id
+  const summary = settlementsByGroup.value[groupId]
+  if (!summary) return
+  settlementsByGroup.value[groupId] = {
+    recommendations: data.recommendations || summary.recommendations || [],
+    records: upsertById(summary.records || [], data.settlement)
+  }
+}
+
 function connectToExpenseNotifications() {
   if (typeof window === "undefined") {
     return
   }
   if (!settlementUnsubscribe) {
-    settlementUnsubscribe = subscribeToNotifications("settlement_update", (data) => {
-      if (data?.group_id) {
+    settlementUnsubscribe = subscribeToNotifications("settlement_update", (data, payload) => {
+      if (!data?.group_id || !settlementsByGroup.value[data.group_id]) return
+      if (payload.resync || !data.settlement) {
         fetchSettlements(data.group_id)
+      } else {
+        applySettlementChange(data)
       }
     })
   }
   if (!expenseUnsubscribe) {
-    expenseUnsubscribe = subscribeToNotifications("expenses_changed", (data) => {
-      if (data?.group_id) {
+    expenseUnsubscribe = subscribeToNotifications("expenses_changed", (data, payload) => {
+      if (!data?.group_id || !expensesByGroup.value[data.group_id]) return
+      if (payload.resync || !data.expense) {
         fetchExpenses(data.group_id)
         fetchSettlements(data.group_id)
+      } else {
+        applyExpenseChange(data)
       }
     })
   }
@@ -1,5 +1,5 @@
 import { ref } from "vue"
-import { subscribeToNotifications } from "../services/notifications"
+import { seedGroupVersion, subscribeToNotifications } from "../services/notifications"
 
 const groups = ref([])
 const loadingGroups = ref(false)
@@ -61,6 +61,43 @@ async function fetchGroup(groupId) {
   }
 }
 
+// Group, expenses, categories, settlements and subscriptions in one request.
+// Sets activeGroup and returns the whole payload, or null on failure.
+async function fetchGroupDashboard(groupId) {
+  loadingGroup.value = true
+  groupError.value = ""
+
+  try {
+    const res = await fetch(`/api/groups/${groupId}/dashboard?all=true`, {
+      credentials: "include"
+    })
+
+    if (!res.ok) {
+      if (res.status === 404) {
+        throw new Error("Group not found")
+      }
+      if (res.status === 403) {
+        throw new Error("You do not have access to this group")
+      }
+      throw new Error("Unable to load group")
+    }
+
+    const dashboard = await res.json()
+    if (!seedGroupVersion(groupId, dashboard.version)) {
+      // a change was announced while this read was in flight
+      return fetchGroupDashboard(groupId)
+    }
+    activeGroup.value = dashboard.group
+    return dashboard
+  } catch (err) {
+    groupError.value = err.message || "Failed to load group"
+    activeGroup.value = null
+    return null
+  } finally {
+    loadingGroup.value = false
+  }
+}
+
 async function createGroup(payload) {
   creatingGroup.value = true
   createGroupError.value = ""
@@ -165,6 +202,7 @@ export function useGroups() {
     createGroupError,
     fetchGroups,
     fetchGroup,
+    fetchGroupDashboard,
     createGroup,
     updateGroup,
     deleteGroup,
@@ -1,5 +1,28 @@
 let socket = null
 const listeners = new Map()
+// group id -> last version seen, from a read (seedGroupVersion) or a notification
+const groupVersions = new Map()
+
+// "apply" for the next version of a group, "resync" after a gap or when no read has set a baseline
+// (writes between that read and this event would otherwise be missed), "stale" for one already seen.
+function checkGroupVersion(data) {
+  if (!data?.group_id || typeof data.version !== "number") return "apply"
+  const last = groupVersions.get(data.group_id)
+  if (last !== undefined && data.version <= last) return "stale"
+  groupVersions.set(data.group_id, data.version)
+  return last !== undefined && data.version === last + 1 ? "apply" : "resync"
+}
+
+// Records the version a group read was served at as the baseline for its notifications. Returns
+// false when a newer event was already seen, so the read predates it and should be repeated.
+export function seedGroupVersion(groupId, version) {
+  if (typeof version !== "number") return true
+  const id = Number(groupId)
+  const last = groupVersions.get(id)
+  if (last !== undefined && version < last) return false
+  groupVersions.set(id, version)
+  return true
+}
 
 function getWebSocketUrl() {
   if (typeof window === "undefined") return ""
@@ -17,6 +40,14 @@ function ensureSocket() {
   socket.addEventListener("message", (event) => {
     try {
       const payload = JSON.parse(event.data)
+      if (payload?.type === "ping") {
+        // heartbeat: the server closes sockets that stay silent
+        socket?.send(JSON.stringify({ type: "pong" }))
+        return
+      }
+      const step = checkGroupVersion(payload?.data)
+      if (step === "stale") return
+      payload.resync = step === "resync"
       if (payload?.type && listeners.has(payload.type)) {
         const handlers = listeners.get(payload.type)
         handlers.forEach((handler) => {
@@ -34,6 +65,8 @@ function ensureSocket() {
 
   socket.addEventListener("close", () => {
     socket = null
+    // events may be missed while disconnected
+    groupVersions.clear()
     if (listeners.size > 0) {
       setTimeout(ensureSocket, 1000)
     }
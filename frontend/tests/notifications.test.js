@@ -0,0 +1,53 @@
+import { describe, it, expect, vi, beforeEach } from "vitest"
+
+class FakeSocket {
+  static last = null
+
+  constructor() {
+    this.handlers = {}
+    FakeSocket.last = this
+  }
+
+  addEventListener(type, handler) {
+    this.handlers[type] = handler
+  }
+
+  send() {}
+
+  emit(type, data) {
+    this.handlers.message({ data: JSON.stringify({ type, data }) })
+  }
+}
+
+describe("notifications", () => {
+  beforeEach(() => {
+    vi.resetModules()
+    global.WebSocket = FakeSocket
+  })
+
+  it("resyncs on the first event when no read seeded the group's version", async () => {
+    const { subscribeToNotifications } = await import("../src/services/notifications")
+    const seen = []
+    subscribeToNotifications("expenses_changed", (data, payload) => seen.push([data.version, payload.resync]))
+
+    FakeSocket.last.emit("expenses_changed", { group_id: 1, version: 4 })
+    FakeSocket.last.emit("expenses_changed", { group_id: 1, version: 5 })
+
+    expect(seen).toEqual([[4, true], [5, false]])
+  })
+
+  it("applies events that follow the seeded version and resyncs after a gap", async () => {
+    const { seedGroupVersion, subscribeToNotifications } = await import("../src/services/notifications")
+    const seen = []
+    subscribeToNotifications("expenses_changed", (data, payload) => seen.push([data.version, payload.resync]))
+
+    expect(seedGroupVersion("1", 3)).toBe(true)
+    FakeSocket.last.emit("expenses_changed", { group_id: 1, version: 3 })
+    FakeSocket.last.emit("expenses_changed", { group_id: 1, version: 4 })
+    FakeSocket.last.emit("expenses_changed", { group_id: 1, version: 6 })
+
+    expect(seen).toEqual([[4, false], [6, true]])
+    // a read served before version 6 is older than what was already announced
+    expect(seedGroupVersion(1, 5)).toBe(false)
+  })
+})
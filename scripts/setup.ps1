@@ -18,6 +18,7 @@ if (-not (Test-Path "backend\.venv")) {
 
 .\backend\.venv\Scripts\python -m pip install --upgrade pip
 .\backend\.venv\Scripts\python -m pip install -r backend\requirements.txt
+.\backend\.venv\Scripts\python -m backend.migrate
 
 npm install
 npm --prefix frontend install
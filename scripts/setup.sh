@@ -20,6 +20,7 @@ fi
 
 backend/.venv/bin/python -m pip install --upgrade pip
 backend/.venv/bin/python -m pip install -r backend/requirements.txt
+backend/.venv/bin/python -m backend.migrate
 
 npm install
 npm --prefix frontend install